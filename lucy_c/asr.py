@@ -3,7 +3,8 @@ from __future__ import annotations
 import logging
 import os
 import threading
-from typing import Tuple
+import time
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 from faster_whisper import WhisperModel
@@ -11,6 +12,9 @@ from faster_whisper import WhisperModel
 from lucy_c.config import ASRConfig
 from lucy_c.interfaces.audio import ASRProvider, ASRResult
 
+# faster-whisper siempre trabaja a 16 kHz.
+WHISPER_SAMPLE_RATE = 16000
+
 
 class FasterWhisperASR(ASRProvider):
     def __init__(self, cfg: ASRConfig):
@@ -20,14 +24,31 @@ class FasterWhisperASR(ASRProvider):
         # Lazy-load: NO cargar el modelo en __init__.
         self._lock = threading.Lock()
         self.model: WhisperModel | None = None
+        # Modelo chico de la cascada (sólo si cfg.cascade está activo).
+        self.draft_model: WhisperModel | None = None
+        # Para el ResourceManager (descarga por inactividad).
+        self.last_used = 0.0
+        self._weights_bytes: Dict[str, int] = {}
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"turns": 0, "draft_accepted": 0, "escalated_low_confidence": 0, "long_clip": 0}
+
+    def _ensure_model(self) -> WhisperModel:
+        return self._ensure("model", self.cfg.model)
+
+    def _ensure_draft_model(self) -> WhisperModel:
+        return self._ensure("draft_model", self.cfg.cascade_draft_model)
 
-    def _ensure_model(self) -> None:
-        if self.model is not None:
-            return
+    def _ensure(self, attr: str, model_name: str) -> WhisperModel:
+        self.last_used = time.time()
+        model = getattr(self, attr)
+        if model is not None:
+            return model
 
         with self._lock:
-            if self.model is not None:
-                return
+            model = getattr(self, attr)
+            if model is not None:
+                return model
 
             # En modo local-only, forzamos offline para evitar requests a HuggingFace.
             if os.environ.get("LUCY_LOCAL_ONLY", "").strip() == "1":
@@ -36,13 +57,13 @@ class FasterWhisperASR(ASRProvider):
 
             self.log.info(
                 "Loading Whisper model %r (device=%s compute=%s) [lazy]",
-                self.cfg.model,
+                model_name,
                 self.cfg.device,
                 self.cfg.compute_type,
             )
 
             try:
-                self.model = WhisperModel(self.cfg.model, device=self.cfg.device, compute_type=self.cfg.compute_type)
+                model = WhisperModel(model_name, device=self.cfg.device, compute_type=self.cfg.compute_type)
             except Exception as e:
                 # Common on fresh Linux installs: CUDA runtime libs (e.g. libcublas) not present.
                 # Fall back to CPU so the app remains usable.
@@ -55,27 +76,54 @@ class FasterWhisperASR(ASRProvider):
                     self.cfg.device = "cpu"
                     # int8 is the typical fast/compatible CPU compute type
                     self.cfg.compute_type = "int8"
-                    self.model = WhisperModel(self.cfg.model, device="cpu", compute_type="int8")
+                    model = WhisperModel(model_name, device="cpu", compute_type="int8")
                 else:
                     raise
 
-    def transcribe(self, audio_f32: np.ndarray) -> ASRResult:
-        self._ensure_model()
+            setattr(self, attr, model)
+            self._weights_bytes[attr] = self._estimate_weights_bytes(model_name)
+            return model
 
-        audio_f32 = np.asarray(audio_f32, dtype=np.float32)
+    @staticmethod
+    def _estimate_weights_bytes(model_name: str) -> int:
+        """CTranslate2 weights on disk, used as the resident-size estimate."""
+        from lucy_c.services.resource_manager import path_bytes
+        try:
+            from faster_whisper.utils import download_model
+            return path_bytes(download_model(model_name, local_files_only=True))
+        except Exception:
+            return path_bytes(model_name)
+
+    def is_loaded(self) -> bool:
+        return self.model is not None or self.draft_model is not None
+
+    def unload(self) -> None:
+        """Drop both cascade models; the next transcribe reloads them lazily."""
+        with self._lock:
+            self.model = None
+            self.draft_model = None
+            self._weights_bytes.clear()
+
+    def resident_bytes(self) -> int:
+        return sum(self._weights_bytes.values())
+
+    def _run(self, attr: str, model_name: str, audio_f32: np.ndarray, beam_size: int) -> Tuple[List[Any], Any]:
+        """Transcribe with one of the loaded models and materialize the segments."""
+        model = self._ensure(attr, model_name)
         language = self.cfg.language if self.cfg.force_language else None
         task = self.cfg.task or "transcribe"
 
         try:
-            segments, info = self.model.transcribe(
+            segments, info = model.transcribe(
                 audio_f32,
-                beam_size=4,  # Increased for accuracy
+                beam_size=beam_size,
                 best_of=5,
                 vad_filter=True,
                 language=language,
                 task=task,
                 initial_prompt=self.cfg.initial_prompt if hasattr(self.cfg, "initial_prompt") else None,
             )
+            return list(segments), info
         except RuntimeError as e:
             # Some CUDA lib problems only show up at first encode.
             msg = str(e)
@@ -86,8 +134,13 @@ class FasterWhisperASR(ASRProvider):
                 )
                 self.cfg.device = "cpu"
                 self.cfg.compute_type = "int8"
-                self.model = WhisperModel(self.cfg.model, device="cpu", compute_type="int8")
-                segments, info = self.model.transcribe(
+                # Both cascade models were built for CUDA; the other one reloads lazily on CPU.
+                self.model = None
+                self.draft_model = None
+                model = WhisperModel(model_name, device="cpu", compute_type="int8")
+                setattr(self, attr, model)
+                self._weights_bytes = {attr: self._estimate_weights_bytes(model_name)}
+                segments, info = model.transcribe(
                     audio_f32,
                     beam_size=2,
                     best_of=5,
@@ -95,10 +148,79 @@ class FasterWhisperASR(ASRProvider):
                     language=language,
                     task=task,
                 )
-            else:
-                raise
+                return list(segments), info
+            raise
 
+    def warmup(self) -> None:
+        """Load every model this provider will use so the first turn doesn't pay for it."""
+        self._ensure_model()
+        if self.cfg.cascade and self.cfg.cascade_draft_model:
+            self._ensure_draft_model()
+
+    def _needs_escalation(self, segments: List[Any]) -> bool:
+        """Decide whether the draft transcription is too uncertain to keep."""
+        if not segments:
+            # VAD already judged the clip as silence; the big model would agree.
+            return False
+
+        # Duration-weighted so a short noisy tail doesn't dominate the score.
+        durations = [max(float(seg.end) - float(seg.start), 0.0) for seg in segments]
+        total = sum(durations)
+        if total > 0:
+            avg_logprob = sum(float(seg.avg_logprob) * d for seg, d in zip(segments, durations)) / total
+        else:
+            avg_logprob = sum(float(seg.avg_logprob) for seg in segments) / len(segments)
+        no_speech_prob = max(float(seg.no_speech_prob) for seg in segments)
+
+        return (
+            avg_logprob < self.cfg.cascade_min_avg_logprob
+            or no_speech_prob > self.cfg.cascade_max_no_speech_prob
+        )
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats["turns"] += 1
+            self._stats[key] += 1
+
+    def transcribe(self, audio_f32: np.ndarray) -> ASRResult:
+        audio_f32 = np.asarray(audio_f32, dtype=np.float32)
+
+        if not (self.cfg.cascade and self.cfg.cascade_draft_model):
+            segments, info = self._run("model", self.cfg.model, audio_f32, beam_size=4)  # Increased for accuracy
+            return self._to_result(segments, info)
+
+        duration_s = len(audio_f32) / WHISPER_SAMPLE_RATE
+        if duration_s > self.cfg.cascade_max_draft_seconds:
+            # Dictado: el modelo chico no va a alcanzar, vamos directo al grande.
+            self._count("long_clip")
+            segments, info = self._run("model", self.cfg.model, audio_f32, beam_size=4)
+            return self._to_result(segments, info)
+
+        segments, info = self._run("draft_model", self.cfg.cascade_draft_model, audio_f32, beam_size=1)
+        if not self._needs_escalation(segments):
+            self._count("draft_accepted")
+            return self._to_result(segments, info)
+
+        self.log.info("ASR cascade: low confidence on draft (%.1fs clip), escalating to %s",
+                      duration_s, self.cfg.model)
+        self._count("escalated_low_confidence")
+        segments, info = self._run("model", self.cfg.model, audio_f32, beam_size=4)
+        return self._to_result(segments, info)
+
+    @staticmethod
+    def _to_result(segments: List[Any], info: Any) -> ASRResult:
         chunks = [seg.text.strip() for seg in segments if seg.text and seg.text.strip()]
         text = " ".join(chunks).strip()
         lang = (info.language or "unknown")
         return ASRResult(text=text, language=lang)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cascade counters: how often the draft transcription was good enough."""
+        with self._stats_lock:
+            out: Dict[str, Any] = dict(self._stats)
+        escalated = out["escalated_low_confidence"] + out["long_clip"]
+        out["cascade"] = bool(self.cfg.cascade)
+        out["escalation_rate"] = round(escalated / out["turns"], 3) if out["turns"] else 0.0
+        out["draft_loaded"] = self.draft_model is not None
+        out["model_loaded"] = self.model is not None
+        return out
@@ -0,0 +1,23 @@
+"""
+Load-test harness for the web app, with local stand-ins for every backend.
+
+Real models make load tests slow, flaky and unsafe to run on a shared box,
+and the tests/integration/verify_*.py scripts need live services. The bench
+runs `create_app()` in-process against:
+
+- FakeOllama: an HTTP server speaking the Ollama API used by Lucy (/api/chat
+  with and without streaming, /api/generate, /api/tags, /api/ps). It has a
+  configurable time to first token, token rate, model load time and error
+  rate.
+- StubN8n: webhook endpoints with a fixed latency.
+- FakeASR / FakeTTS: providers with controllable delays. They block a worker
+  thread the way Whisper and mimic3 do.
+
+The driver opens N Socket.IO sessions that send text and voice turns at the
+same time. It reports throughput, error rates, end-to-end latency and the
+p50/p95/p99 of every pipeline stage. Replies, tool calls and transcripts
+are a pure function of the prompt, so two runs with the same seed do the
+same work.
+
+    python -m lucy_c.bench --sessions 16 --turns 5 --voice-ratio 0.5
+"""
@@ -0,0 +1,38 @@
+"""python -m lucy_c.bench [--sessions N] [--turns N] [--voice-ratio R] ... [--json PATH]"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import fields
+from pathlib import Path
+
+# First: the app module applies eventlet's monkey patching, which has to
+# happen before the stand-in servers import socketserver and threading
+import lucy_c.web.app  # noqa: F401
+from lucy_c.bench.driver import BenchConfig, run_bench
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lucy_c.bench",
+                                     description="Load-test Lucy-C against local stand-ins for its backends.")
+    defaults = BenchConfig()
+    for f in fields(BenchConfig):
+        default = getattr(defaults, f.name)
+        parser.add_argument(f"--{f.name.replace('_', '-')}", dest=f.name, type=type(default), default=default,
+                            help=f"(default: {default})")
+    parser.add_argument("--json", type=Path, help="Also write the full report as JSON to this path")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the app's logs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    bench = BenchConfig(**{f.name: getattr(args, f.name) for f in fields(BenchConfig)})
+    report = run_bench(bench)
+    print(report.format())
+    if args.json:
+        args.json.write_text(report.to_json(), encoding="utf-8")
+    return 0 if report.completed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
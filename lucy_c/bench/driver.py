@@ -0,0 +1,230 @@
+"""
+Concurrent simulated sessions against `create_app()`.
+
+Every session is a Socket.IO test client with its own session id. It sends
+`chat_message` or `voice_input` turns one after the other, as the browser
+does, and times each turn until the reply text arrives and until the final
+"Ready" status. Sessions run concurrently: on eventlet green threads under
+the app's monkey patching, or on OS threads otherwise.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import random
+import tempfile
+import threading
+import time
+import wave
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from lucy_c.bench.fakes import FakeASR, FakeTTS
+from lucy_c.bench.report import OUTCOMES, BenchReport, StageRecorder, summarize
+from lucy_c.bench.servers import FakeOllama, StubN8n
+
+log = logging.getLogger("LucyC.Bench")
+
+UTTERANCES = [
+    "¿Qué hora es?",  # intent fast path
+    "Contame un chiste corto",
+    "¿Qué me recomendás para cenar hoy?",
+    "Explicame qué es un webhook",
+    "Resumime las novedades del proyecto",
+    "¿Cómo configuro el puerto del servidor?",
+    "Disparame el flujo de facturas",
+    "Dame ideas para el fin de semana",
+]
+
+
+@dataclass
+class BenchConfig:
+    sessions: int = 8
+    turns: int = 5  # per session
+    voice_ratio: float = 0.5
+    silence_ratio: float = 0.0  # voice turns with an empty clip ("No escuché nada.")
+    think_time_s: float = 0.0  # pause between a reply and the session's next turn
+    turn_timeout_s: float = 60.0
+    seed: int = 7
+    # FakeOllama
+    model: str = "llama3.2:3b"
+    first_token_s: float = 0.15
+    tokens_per_s: float = 40.0
+    reply_tokens: int = 30
+    load_s: float = 0.0
+    llm_error_rate: float = 0.0
+    tool_rate: float = 0.2
+    # StubN8n
+    n8n_latency_s: float = 0.05
+    # FakeASR / FakeTTS
+    asr_delay_s: float = 0.2
+    tts_delay_s: float = 0.05
+    tts_per_char_s: float = 0.002
+
+
+def wav_bytes(audio: np.ndarray, sample_rate: int) -> bytes:
+    """16-bit PCM WAV, what a browser upload decodes to."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with io.BytesIO() as bio:
+        with wave.open(bio, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(sample_rate)
+            w.writeframes(pcm.tobytes())
+        return bio.getvalue()
+
+
+class _Session:
+    def __init__(self, index: int, app, socketio, bench: BenchConfig, sample_rate: int):
+        self.user = f"bench:{index}"
+        self.rnd = random.Random(f"{bench.seed}:{index}")
+        self.bench = bench
+        self.sample_rate = sample_rate
+        self.client = socketio.test_client(app, auth={"session_user": self.user})
+        self.client.get_received()
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self) -> None:
+        try:
+            for _ in range(self.bench.turns):
+                self.results.append(self._turn())
+                if self.bench.think_time_s:
+                    time.sleep(self.bench.think_time_s)
+        finally:
+            self.client.disconnect()
+
+    def _turn(self) -> Dict[str, Any]:
+        index = self.rnd.randrange(len(UTTERANCES))
+        voice = self.rnd.random() < self.bench.voice_ratio
+        silent = voice and self.rnd.random() < self.bench.silence_ratio
+        result = {"kind": "voice" if voice else "text", "outcome": "timeout", "reply_s": None, "done_s": None}
+        try:
+            return self._exchange(index, voice, silent, result)
+        except Exception as e:
+            # A handler that raises (e.g. voice decoding without ffmpeg) fails this turn, not the session
+            log.warning("Bench %s: %s turn failed: %s", self.user, result["kind"], e)
+            result.update(outcome="error", error=f"{type(e).__name__}: {e}")
+            return result
+
+    def _exchange(self, index: int, voice: bool, silent: bool, result: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.monotonic()
+        if voice:
+            clip = FakeASR.clip(None if silent else index, sample_rate=self.sample_rate)
+            self.client.emit("voice_input", {"audio": wav_bytes(clip, self.sample_rate), "session_user": self.user})
+        else:
+            self.client.emit("chat_message", {"message": UTTERANCES[index], "session_user": self.user})
+
+        deadline = start + self.bench.turn_timeout_s
+        while time.monotonic() < deadline:
+            for event in self.client.get_received():
+                name, args = event["name"], event.get("args") or {}
+                data = args[0] if isinstance(args, list) else args
+                now = time.monotonic() - start
+                if name == "busy":
+                    result.update(outcome="busy", done_s=now)
+                    return result
+                if name == "message" and data.get("type") == "assistant":
+                    result["reply_s"] = now
+                    llm_failed = (data.get("content") or "").startswith("Tuve un error cognitivo")
+                    result["outcome"] = "llm_error" if llm_failed else "ok"
+                if name == "status" and data.get("message") == "Ready":
+                    result["done_s"] = now
+                    if result["reply_s"] is None:
+                        result["outcome"] = "error"
+                    return result
+            time.sleep(0.005)
+        if result["reply_s"] is not None:
+            result["outcome"] = "timeout"
+        return result
+
+
+def run_bench(bench: BenchConfig | None = None) -> BenchReport:
+    """Start the stand-ins, build the app against them, drive the sessions and collect the report.
+
+    Import `lucy_c.web.app` before this module (as `python -m lucy_c.bench`
+    does): its monkey patching must precede the stand-ins' socketserver import.
+    """
+    bench = bench or BenchConfig()
+    from lucy_c.web.app import create_app
+    from lucy_c.config import LucyConfig
+    from lucy_c.facts_store import FactsStore
+    from lucy_c.history_store import HistoryStore
+
+    ollama = FakeOllama(models=[bench.model], first_token_s=bench.first_token_s, tokens_per_s=bench.tokens_per_s,
+                        reply_tokens=bench.reply_tokens, load_s=bench.load_s, error_rate=bench.llm_error_rate,
+                        tool_rate=bench.tool_rate).start()
+    n8n = StubN8n(latency_s=bench.n8n_latency_s).start()
+    tmp = tempfile.TemporaryDirectory(prefix="lucy-bench-")
+    try:
+        cfg = LucyConfig()
+        cfg.llm.provider = "ollama"
+        cfg.ollama.host = ollama.url
+        cfg.ollama.model = bench.model
+        cfg.n8n.base_url = n8n.url
+        asr = FakeASR(UTTERANCES, delay_s=bench.asr_delay_s, sample_rate=cfg.audio.sample_rate)
+        tts = FakeTTS(delay_s=bench.tts_delay_s, per_char_s=bench.tts_per_char_s)
+        app, socketio, orchestrator = create_app(cfg, asr=asr, tts=tts,
+                                                 history=HistoryStore(Path(tmp.name) / "history"),
+                                                 facts=FactsStore(Path(tmp.name) / "facts"),
+                                                 memory_enabled=False)
+        recorder = StageRecorder()
+        orchestrator.turns.end_listeners.append(recorder.on_turn)
+        http = app.test_client()
+        _wait_ready(http, timeout_s=30.0)
+
+        sessions = [_Session(i, app, socketio, bench, cfg.audio.sample_rate) for i in range(bench.sessions)]
+        threads = [threading.Thread(target=s.run, name=f"bench-session-{i}", daemon=True)
+                   for i, s in enumerate(sessions)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(bench.turn_timeout_s * bench.turns + 30)
+        wall_s = time.monotonic() - start
+
+        stats = http.get("/api/stats").get_json() or {}
+        return _report(bench, sessions, recorder, wall_s, stats,
+                       {"ollama": ollama.report(), "n8n": n8n.report(), "asr": asr.stats(),
+                        "tts": {"syntheses": len(tts.syntheses), "chars": sum(tts.syntheses),
+                                "cache": tts.cache.stats()}})
+    finally:
+        ollama.stop()
+        n8n.stop()
+        tmp.cleanup()
+
+
+def _wait_ready(http, timeout_s: float) -> None:
+    """Hold the load until warm-up is done, like a load balancer would (/api/health?deep=1)."""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if http.get("/api/health?deep=1").status_code == 200:
+            return
+        time.sleep(0.1)
+    log.warning("Bench: app not ready after %.0fs; starting anyway", timeout_s)
+
+
+def _report(bench: BenchConfig, sessions: List[_Session], recorder: StageRecorder, wall_s: float,
+            stats: Dict[str, Any], services: Dict[str, Any]) -> BenchReport:
+    turns: Dict[str, Dict[str, int]] = {}
+    latency: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for session in sessions:
+        for r in session.results:
+            counts = turns.setdefault(r["kind"], {o: 0 for o in OUTCOMES})
+            counts[r["outcome"]] += 1
+            if r.get("error"):
+                errors[r["error"]] = errors.get(r["error"], 0) + 1
+            if r["outcome"] != "ok":
+                continue
+            latency.setdefault(f"{r['kind']}_reply", []).append(r["reply_s"])
+            if r["done_s"] is not None:
+                latency.setdefault(f"{r['kind']}_done", []).append(r["done_s"])
+    server = {key: stats.get(key) for key in ("scheduler", "admission", "workers", "cancellation", "phrase_bank",
+                                              "generation", "intents")}
+    return BenchReport(wall_s=round(wall_s, 3), settings=asdict(bench), turns=turns,
+                       latency={k: summarize(v) for k, v in sorted(latency.items())},
+                       stages=recorder.summary(), services=services, server=server, errors=errors)
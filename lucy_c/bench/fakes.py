@@ -0,0 +1,124 @@
+"""
+Stand-in ASR and TTS providers with controllable delays.
+
+Their delays block a real OS thread (time.sleep from before eventlet's
+monkey patching), the way Whisper and mimic3 hold a worker. So the bench
+measures the same worker-pool and admission queueing as production.
+
+FakeASR reads the utterance out of the clip itself. The driver encodes
+utterance i as a constant level of (i + 1) / 64 (see `FakeASR.clip`), which
+survives the ffmpeg round trip. A silent clip transcribes to "".
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from lucy_c.interfaces.audio import ASRProvider, ASRResult, TTSProvider, TTSResult
+from lucy_c.tts_cache import TTSCache
+
+try:
+    from eventlet import patcher as _patcher
+    _block = _patcher.original("time").sleep
+except ImportError:
+    _block = time.sleep
+
+_LEVELS = 64
+
+
+class _FakeModel:
+    """Loaded/unloaded bookkeeping so the ResourceManager and warm-up treat fakes like real models."""
+
+    resident_mb = 100
+
+    def __init__(self):
+        self.last_used = 0.0
+        self._loaded = False
+
+    def warmup(self) -> None:
+        self._loaded = True
+
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def unload(self) -> None:
+        self._loaded = False
+
+    def resident_bytes(self) -> int:
+        return self.resident_mb * 1024 * 1024 if self._loaded else 0
+
+    def _use(self, seconds: float) -> None:
+        self._loaded = True
+        self.last_used = time.time()
+        if seconds > 0:
+            _block(seconds)
+
+
+class FakeASR(_FakeModel, ASRProvider):
+    """Transcribes the clips built by `FakeASR.clip` after `delay_s + rtf * clip seconds`."""
+
+    def __init__(self, utterances: Sequence[str], delay_s: float = 0.2, rtf: float = 0.05, sample_rate: int = 16000):
+        super().__init__()
+        self.utterances = list(utterances)
+        self.delay_s = delay_s
+        self.rtf = rtf
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._stats = {"turns": 0, "audio_s": 0.0, "busy_s": 0.0}
+
+    @staticmethod
+    def clip(index: int | None, seconds: float = 1.5, sample_rate: int = 16000) -> np.ndarray:
+        """Audio that transcribes to utterance `index` (None = silence)."""
+        level = 0.0 if index is None else ((index % (_LEVELS - 1)) + 1) / _LEVELS
+        return np.full(int(seconds * sample_rate), level, dtype=np.float32)
+
+    def transcribe(self, audio_f32: np.ndarray) -> ASRResult:
+        audio = np.asarray(audio_f32, dtype=np.float32).reshape(-1)
+        seconds = len(audio) / self.sample_rate
+        busy = self.delay_s + self.rtf * seconds
+        self._use(busy)
+        with self._lock:
+            self._stats["turns"] += 1
+            self._stats["audio_s"] += seconds
+            self._stats["busy_s"] += busy
+        level = int(round(float(np.median(np.abs(audio))) * _LEVELS)) if len(audio) else 0
+        if level <= 0 or not self.utterances:
+            return ASRResult(text="", language="es")
+        return ASRResult(text=self.utterances[(level - 1) % len(self.utterances)], language="es")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "model_loaded": self._loaded}
+
+
+class FakeTTS(_FakeModel, TTSProvider):
+    """Returns silence after `delay_s + per_char_s * len(text)`; cached (and pinnable) like Mimic3TTS."""
+
+    def __init__(self, delay_s: float = 0.05, per_char_s: float = 0.002, sample_rate: int = 22050,
+                 seconds_per_char: float = 0.06):
+        super().__init__()
+        self.delay_s = delay_s
+        self.per_char_s = per_char_s
+        self.sample_rate = sample_rate
+        self.seconds_per_char = seconds_per_char
+        self.cache = TTSCache(max_items=100)
+        self.syntheses: List[int] = []  # chars per synthesis actually run
+
+    def synthesize(self, text: str) -> TTSResult:
+        cached = self.cache.get(text)
+        if cached is not None:
+            return cached
+        self._use(self.delay_s + self.per_char_s * len(text))
+        self.syntheses.append(len(text))
+        samples = max(1, int(len(text) * self.seconds_per_char * self.sample_rate))
+        result = TTSResult(audio_f32=np.zeros(samples, dtype=np.float32), sample_rate=self.sample_rate)
+        self.cache.put(text, result)
+        return result
+
+    def pin(self, text: str) -> bool:
+        self.synthesize(text)
+        return self.cache.pin(text)
@@ -0,0 +1,105 @@
+"""Latency percentiles and the bench's printable report."""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Sequence
+
+from lucy_c.services.cancellation import TURN_STAGES
+
+OUTCOMES = ("ok", "busy", "llm_error", "timeout", "error")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile (numpy's default method) of `samples`."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = pct / 100.0 * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """n, mean, p50/p95/p99 and max in milliseconds."""
+    if not samples:
+        return {"n": 0}
+    ms = [s * 1000.0 for s in samples]
+    return {"n": len(ms), "mean_ms": round(sum(ms) / len(ms), 1),
+            **{f"p{p}_ms": round(percentile(ms, p), 1) for p in (50, 95, 99)}, "max_ms": round(max(ms), 1)}
+
+
+class StageRecorder:
+    """Per-stage durations of every turn, fed by TurnTracker.end_listeners."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in TURN_STAGES}
+        self.cancelled = 0
+
+    def on_turn(self, session_user: str, token) -> None:
+        with self._lock:
+            self.cancelled += token.cancelled
+            for stage, seconds in token.timings.items():
+                self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: summarize(samples) for stage, samples in self.samples.items() if samples}
+
+
+@dataclass
+class BenchReport:
+    wall_s: float
+    settings: Dict[str, Any]
+    turns: Dict[str, Dict[str, int]]  # kind -> outcome -> count
+    latency: Dict[str, Dict[str, float]]  # "text_reply", "voice_reply", "*_done" -> summary
+    stages: Dict[str, Dict[str, float]]
+    services: Dict[str, Any] = field(default_factory=dict)  # fake backends' counters
+    server: Dict[str, Any] = field(default_factory=dict)  # /api/stats excerpts
+    errors: Dict[str, int] = field(default_factory=dict)  # failed turns' exceptions -> count
+
+    @property
+    def completed(self) -> int:
+        return sum(c.get("ok", 0) for c in self.turns.values())
+
+    @property
+    def throughput(self) -> float:
+        """Successful turns per second."""
+        return self.completed / self.wall_s if self.wall_s else 0.0
+
+    def error_rates(self) -> Dict[str, float]:
+        rates = {}
+        for kind, counts in self.turns.items():
+            total = sum(counts.values())
+            rates[kind] = round((total - counts.get("ok", 0)) / total, 4) if total else 0.0
+        return rates
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "completed": self.completed, "throughput_tps": round(self.throughput, 3),
+                "error_rates": self.error_rates()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def format(self) -> str:
+        lines = [f"Lucy-C bench: {self.settings.get('sessions')} sessions x {self.settings.get('turns')} turns "
+                 f"in {self.wall_s:.1f}s -> {self.throughput:.2f} turns/s"]
+        rates = self.error_rates()
+        for kind, counts in self.turns.items():
+            detail = ", ".join(f"{o}={counts[o]}" for o in OUTCOMES if counts.get(o))
+            lines.append(f"  {kind:<6} {sum(counts.values()):>5} turns  error rate {rates[kind]:.1%}  ({detail})")
+        for error, count in sorted(self.errors.items(), key=lambda kv: -kv[1])[:5]:
+            lines.append(f"    {count:>5}x {error}")
+        lines.append("")
+        lines.append(f"  {'latency':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for title, table in (("end to end", self.latency), ("stage", self.stages)):
+            lines.append(f"  [{title}]")
+            for name, s in table.items():
+                if s.get("n"):
+                    lines.append(f"  {name:<14}{s['n']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                                 f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+        return "\n".join(lines)
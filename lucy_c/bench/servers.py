@@ -0,0 +1,280 @@
+"""
+Local HTTP stand-ins for Ollama and n8n.
+
+Both bind 127.0.0.1 on a free port and serve from a background thread.
+Response content is derived from a hash of the request, so a given prompt
+always gets the same reply, tool call or failure.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger("LucyC.Bench")
+
+WORDS = ("che dale bueno mirá la verdad que eso depende igual te cuento después lo vemos "
+         "tranqui perfecto listo claro obvio capaz sería mejor probarlo ahora mismo").split()
+
+# The orchestrator's reflection prompt; reflections never call tools
+_REFLECT_MARKER = "ACTUALIZACIÓN:"
+
+
+def fraction(*parts: Any) -> float:
+    """Stable value in [0, 1) for the given request parts (same input, same draw)."""
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+
+class _BackgroundServer:
+    """ThreadingHTTPServer on 127.0.0.1:<free port>, served from a daemon thread."""
+
+    handler_name = "server"
+
+    def __init__(self):
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_BackgroundServer":
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner._dispatch(self, "GET")
+
+            def do_POST(self):
+                owner._dispatch(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"bench-{self.handler_name}",
+                                        daemon=True)
+        self._thread.start()
+        log.info("Bench %s listening on %s", self.handler_name, self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _dispatch(self, req: BaseHTTPRequestHandler, method: str) -> None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _read_json(req: BaseHTTPRequestHandler) -> Dict[str, Any]:
+        length = int(req.headers.get("Content-Length") or 0)
+        raw = req.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    @staticmethod
+    def _send_json(req: BaseHTTPRequestHandler, data: Any, status: int = 200) -> None:
+        body = json.dumps(data).encode("utf-8")
+        req.send_response(status)
+        req.send_header("Content-Type", "application/json")
+        req.send_header("Content-Length", str(len(body)))
+        req.end_headers()
+        req.wfile.write(body)
+
+
+class FakeOllama(_BackgroundServer):
+    """The parts of the Ollama API that Lucy calls, with tunable timing.
+
+    Args:
+        models: Models listed by /api/tags (the first is the default)
+        first_token_s: Prompt evaluation time before the first token
+        tokens_per_s: Generation speed
+        reply_tokens: Tokens per reply (capped by options.num_predict)
+        load_s: Extra latency when a model that isn't resident is requested
+        max_loaded: Models resident at once (older ones are evicted)
+        error_rate: Share of prompts answered with HTTP 500
+        tool_rate: Share of prompts answered with a [[trigger_workflow(...)]] call
+    """
+
+    handler_name = "ollama"
+
+    def __init__(self, models: List[str] | None = None, first_token_s: float = 0.15, tokens_per_s: float = 40.0,
+                 reply_tokens: int = 30, load_s: float = 0.0, max_loaded: int = 1, error_rate: float = 0.0,
+                 tool_rate: float = 0.0):
+        super().__init__()
+        self.models = models or ["llama3.2:3b"]
+        self.first_token_s = first_token_s
+        self.tokens_per_s = tokens_per_s
+        self.reply_tokens = reply_tokens
+        self.load_s = load_s
+        self.max_loaded = max(1, max_loaded)
+        self.error_rate = error_rate
+        self.tool_rate = tool_rate
+        self._resident: List[str] = []
+        self.stats = {"chat": 0, "generate": 0, "streamed": 0, "errors": 0, "loads": 0, "tool_calls": 0,
+                      "tokens": 0, "aborted": 0, "tokens_not_generated": 0}
+
+    def _dispatch(self, req: BaseHTTPRequestHandler, method: str) -> None:
+        path = req.path.split("?")[0]
+        if method == "GET" and path == "/api/tags":
+            self._send_json(req, {"models": [{"name": m, "size": 2_000_000_000, "details": {"family": "bench"}}
+                                             for m in self.models]})
+        elif method == "GET" and path == "/api/ps":
+            with self._lock:
+                resident = list(self._resident)
+            self._send_json(req, {"models": [{"name": m, "size": 2_000_000_000, "size_vram": 2_000_000_000,
+                                              "expires_at": ""} for m in resident]})
+        elif method == "POST" and path in ("/api/chat", "/api/generate"):
+            self._generate(req, self._read_json(req), chat=path == "/api/chat")
+        else:
+            self._send_json(req, {"error": f"not found: {path}"}, 404)
+
+    def _load(self, model: str) -> float:
+        """Seconds to wait for `model`; makes it resident."""
+        with self._lock:
+            if model in self._resident:
+                self._resident.remove(model)
+                self._resident.append(model)
+                return 0.0
+            self._resident.append(model)
+            del self._resident[:-self.max_loaded]
+            self.stats["loads"] += 1
+        return self.load_s
+
+    def reply_for(self, prompt: str, n_tokens: int, turn: int = 0) -> List[str]:
+        """The reply tokens for `prompt`: a tool call when the draw says so, prose otherwise.
+
+        `turn` (the conversation's length) varies the draws when a session repeats a prompt.
+        """
+        tokens = [WORDS[int(fraction(prompt, turn, i) * len(WORDS))] + " " for i in range(n_tokens)]
+        if not prompt.startswith(_REFLECT_MARKER) and fraction(prompt, turn, "tool") < self.tool_rate:
+            tokens = tokens[:3] + [f'[[trigger_workflow("bench-{int(fraction(prompt, turn, "wf") * 4)}")]]']
+        return tokens
+
+    def _generate(self, req: BaseHTTPRequestHandler, payload: Dict[str, Any], chat: bool) -> None:
+        model = payload.get("model") or self.models[0]
+        if chat:
+            messages = payload.get("messages") or [{}]
+            prompt = messages[-1].get("content") or ""
+            prompt_chars = sum(len(m.get("content") or "") for m in messages)
+            turn = len(messages)
+        else:
+            prompt = payload.get("prompt") or ""
+            prompt_chars = len(prompt)
+            turn = 0
+        options = payload.get("options") or {}
+        n_tokens = min(self.reply_tokens, int(options.get("num_predict") or self.reply_tokens))
+        stream = bool(payload.get("stream", True))
+        with self._lock:
+            self.stats["chat" if chat else "generate"] += 1
+            self.stats["streamed"] += stream
+
+        time.sleep(self._load(model) + self.first_token_s)
+        if fraction(prompt, turn, "error") < self.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            self._send_json(req, {"error": "bench: simulated failure"}, 500)
+            return
+
+        tokens = self.reply_for(prompt, n_tokens, turn) if chat else ["ok"][:n_tokens]
+        if any(t.startswith("[[") for t in tokens):
+            with self._lock:
+                self.stats["tool_calls"] += 1
+        start = time.monotonic()
+        final = {"model": model, "done": True, "done_reason": "length" if n_tokens < self.reply_tokens else "stop",
+                 "prompt_eval_count": prompt_chars // 4, "eval_count": len(tokens)}
+        if not stream:
+            time.sleep(len(tokens) / self.tokens_per_s)
+            self._count_tokens(len(tokens))
+            final["eval_duration"] = int((time.monotonic() - start) * 1e9)
+            if chat:
+                final["message"] = {"role": "assistant", "content": "".join(tokens).strip()}
+            else:
+                final["response"] = "".join(tokens)
+            self._send_json(req, final)
+            return
+
+        req.send_response(200)
+        req.send_header("Content-Type", "application/x-ndjson")
+        req.end_headers()
+        sent = 0
+        try:
+            for token in tokens:
+                time.sleep(1.0 / self.tokens_per_s)
+                chunk = {"model": model, "done": False}
+                chunk["message" if chat else "response"] = {"role": "assistant", "content": token} if chat else token
+                req.wfile.write((json.dumps(chunk) + "\n").encode("utf-8"))
+                req.wfile.flush()
+                sent += 1
+            final["eval_duration"] = int((time.monotonic() - start) * 1e9)
+            if chat:
+                final["message"] = {"role": "assistant", "content": ""}
+            req.wfile.write((json.dumps(final) + "\n").encode("utf-8"))
+            req.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client dropped the stream (cancelled turn): Ollama stops generating here
+            with self._lock:
+                self.stats["aborted"] += 1
+                self.stats["tokens_not_generated"] += len(tokens) - sent
+        self._count_tokens(sent)
+
+    def _count_tokens(self, n: int) -> None:
+        with self._lock:
+            self.stats["tokens"] += n
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "resident": list(self._resident)}
+
+
+class StubN8n(_BackgroundServer):
+    """Answers every POST /webhook/<name> after `latency_s`; `error_rate` of the workflows fail with 500."""
+
+    handler_name = "n8n"
+
+    def __init__(self, latency_s: float = 0.05, error_rate: float = 0.0):
+        super().__init__()
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.calls: Dict[str, int] = {}
+        self.errors = 0
+
+    def _dispatch(self, req: BaseHTTPRequestHandler, method: str) -> None:
+        path = req.path.split("?")[0]
+        if method != "POST" or not path.startswith("/webhook/"):
+            self._send_json(req, {"error": f"not found: {path}"}, 404)
+            return
+        workflow = path[len("/webhook/"):]
+        payload = self._read_json(req)
+        with self._lock:
+            self.calls[workflow] = self.calls.get(workflow, 0) + 1
+        time.sleep(self.latency_s)
+        if fraction(workflow, "error") < self.error_rate:
+            with self._lock:
+                self.errors += 1
+            self._send_json(req, {"error": "bench: simulated workflow failure"}, 500)
+            return
+        self._send_json(req, {"ok": True, "workflow": workflow, "received": payload})
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": sum(self.calls.values()), "by_workflow": dict(self.calls), "errors": self.errors}
@@ -0,0 +1,129 @@
+"""On-disk BM25 inverted index for Lucy's semantic memory.
+
+Dense embeddings are bad at exact identifiers (file names, config keys, code
+symbols). This keyword index lives next to the Chroma collection, is updated
+at ingest time with the same chunk IDs, and is fused with the dense ranking
+in `MemoryEngine.query(mode="hybrid")`.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lucy_c.text_normalizer import fold
+
+log = logging.getLogger("LucyC.BM25")
+
+# Words plus dotted/dashed/slashed identifiers: rag_engine.py, lucy-c, api/chat
+_TOKEN_RE = re.compile(r"\w[\w.\-/]*\w|\w")
+_PART_RE = re.compile(r"[._\-/]+|(?<=[a-z0-9])(?=[A-Z])")
+
+
+def tokenize(text: str) -> List[str]:
+    """Terms for BM25: each word/identifier, plus the parts of compound identifiers."""
+    terms = []
+    for tok in _TOKEN_RE.findall(text or ""):
+        terms.append(fold(tok))
+        parts = [p for p in _PART_RE.split(tok) if p]
+        if len(parts) > 1:
+            terms.extend(fold(p) for p in parts)
+    return terms
+
+
+class BM25Index:
+    """SQLite-backed inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, path: str | Path, k1: float = 1.2, b: float = 0.75):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, length INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            """
+        )
+        self._db.commit()
+        self._corpus: Optional[Tuple[int, float]] = None  # (N, avgdl), invalidated on write
+
+    def add(self, docs: Iterable[Tuple[str, str]]) -> None:
+        """Index (id, text) pairs, replacing any previous version of the same id."""
+        rows_docs = []
+        rows_postings = []
+        for doc_id, text in docs:
+            terms = tokenize(text)
+            rows_docs.append((doc_id, len(terms)))
+            rows_postings.extend((term, doc_id, tf) for term, tf in Counter(terms).items())
+        if not rows_docs:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM postings WHERE doc_id = ?", [(d,) for d, _ in rows_docs])
+            self._db.executemany("INSERT OR REPLACE INTO docs (id, length) VALUES (?, ?)", rows_docs)
+            self._db.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", rows_postings)
+            self._db.commit()
+            self._corpus = None
+
+    def delete(self, ids: Sequence[str]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM postings WHERE doc_id = ?", [(i,) for i in ids])
+            self._db.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in ids])
+            self._db.commit()
+            self._corpus = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM postings")
+            self._db.execute("DELETE FROM docs")
+            self._db.commit()
+            self._corpus = None
+
+    def count(self) -> int:
+        return self._corpus_stats()[0]
+
+    def _corpus_stats(self) -> Tuple[int, float]:
+        with self._lock:
+            if self._corpus is None:
+                n, avgdl = self._db.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+                self._corpus = (int(n or 0), float(avgdl or 0.0))
+            return self._corpus
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k (doc_id, score) for the query, best first."""
+        terms = set(tokenize(query))
+        n_docs, avgdl = self._corpus_stats()
+        if not terms or n_docs == 0:
+            return []
+
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for term in terms:
+                rows = self._db.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id "
+                    "WHERE p.term = ?",
+                    (term,),
+                ).fetchall()
+                if not rows:
+                    continue
+                df = len(rows)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf, length in rows:
+                    norm = self.k1 * (1.0 - self.b + self.b * (length / avgdl if avgdl else 1.0))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
@@ -44,7 +44,7 @@ class ClawdbotLLM(LLMProvider):
 
         self.log.info("Clawdbot CLI Execution: %s", " ".join(cmd))
         try:
-            res = subprocess.run(cmd, capture_output=True, text=True, timeout=130)
+            res = self._run_cli(cmd, kwargs.get("cancel"))
             if res.returncode != 0:
                 self.log.error("Clawdbot CLI failed (exit %d): %s", res.returncode, res.stderr)
                 return LLMResponse(text=f"Error (Clawdbot CLI): {res.stderr.strip() or 'Unknown error'}")
@@ -82,6 +82,24 @@ class ClawdbotLLM(LLMProvider):
             self.log.exception("Clawdbot CLI exception")
             return LLMResponse(text=f"Error inesperado al llamar a Clawdbot: {e}")
 
+    @staticmethod
+    def _run_cli(cmd: List[str], cancel=None) -> subprocess.CompletedProcess:
+        """Run the CLI; a cancelled turn (`cancel`, a CancelToken) kills it and raises Cancelled."""
+        if cancel is None:
+            return subprocess.run(cmd, capture_output=True, text=True, timeout=130)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        unregister = cancel.on_cancel(proc.kill)
+        try:
+            stdout, stderr = proc.communicate(timeout=130)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            unregister()
+        cancel.check()
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
     def chat(self, messages: List[dict], **kwargs) -> LLMResponse:
         """Chat wrapper with history compression. 
         We pass the messages in a structured way that works best with the CLI.
@@ -16,6 +16,13 @@ class ASRConfig:
     task: str = "transcribe"
     force_language: bool = True
     initial_prompt: str = "Che, viste, boludo, tenés, querés, decís."
+    # Cascada: un modelo chico transcribe primero y sólo se re-transcribe con
+    # `model` si la confianza es baja o el clip es largo (dictado).
+    cascade: bool = False
+    cascade_draft_model: str = "Systran/faster-whisper-tiny"
+    cascade_min_avg_logprob: float = -0.7
+    cascade_max_no_speech_prob: float = 0.5
+    cascade_max_draft_seconds: float = 8.0
 
 
 @dataclass
@@ -28,6 +35,27 @@ class LLMConfig:
 class OllamaConfig:
     host: str = "http://127.0.0.1:11434"
     model: str = "gpt-oss:20b"
+    # Cuánto tiempo Ollama mantiene cada modelo cargado tras usarlo ("-1" = siempre)
+    keep_alive: str = "30m"
+    # keep_alive por modelo, ej. {"phi3:mini": "-1"}; el resto usa keep_alive
+    keep_alive_models: dict = field(default_factory=dict)
+    # Modelos que Ollama puede tener cargados a la vez (OLLAMA_MAX_LOADED_MODELS);
+    # más sesiones activas con modelos distintos que esto = recargas constantes
+    max_loaded_models: int = 2
+    # Una llamada cuyo load_duration supera esto cuenta como (re)carga del modelo
+    reload_threshold_ms: float = 1500.0
+    # Cascada: un modelo chico para reflexión, resúmenes y turnos cortos ("" = desactivada).
+    # Para que ambos queden residentes, Ollama necesita OLLAMA_MAX_LOADED_MODELS>=2.
+    draft_model: str = ""
+    draft_for: list = field(default_factory=lambda: ["reflect", "summarize", "short"])
+    # Un turno es "corto" con hasta N palabras y sin palabras que pidan razonamiento
+    draft_max_words: int = 12
+    # Entradas más largas (salida de herramientas, texto a resumir) van al modelo grande
+    draft_max_input_chars: int = 6000
+    escalate_keywords: list = field(default_factory=lambda: [
+        "por qué", "explic", "analiz", "compar", "razon", "código", "codigo",
+        "program", "escrib", "diseñ", "plan", "calcul", "debug",
+    ])
 
 
 @dataclass
@@ -50,6 +78,16 @@ class TTSConfig:
     use_gpu: bool = True
     language: str = "es"
 
+    # /api/chat devuelve el texto enseguida y el audio se pide a /api/audio/<id>
+    http_prefetch: bool = True  # sintetizar en segundo plano apenas sale la respuesta
+    audio_ttl_s: float = 600.0
+    audio_max_items: int = 256
+
+    # Frases fijas ("Decime algo.", errores de conexión, confirmaciones) sintetizadas al arrancar
+    # y fijadas en la caché de TTS; `phrases` suma frases propias a las que registran los módulos
+    phrase_bank: bool = True
+    phrases: list = field(default_factory=list)
+
 
 @dataclass
 class AudioConfig:
@@ -63,6 +101,134 @@ class N8nConfig:
     timeout: float = 30.0
 
 
+@dataclass
+class MemoryConfig:
+    persist_directory: str = "data/chroma_db"
+    # Cache de embeddings de consultas (LRU en RAM + opcional en disco)
+    query_cache_size: int = 1024
+    query_cache_disk: bool = False
+    # Backend de embeddings: "sentence-transformers" (PyTorch) u "onnx" (int8, sin torch)
+    embedding_backend: str = "sentence-transformers"
+    embedding_model: str = "all-MiniLM-L6-v2"
+    onnx_model_dir: str = "data/models/all-MiniLM-L6-v2-onnx"
+    onnx_threads: int = 0
+    # Re-embeber la colección al arrancar si fue creada con otro espacio vectorial
+    auto_reembed: bool = True
+    # Ingesta en streaming: bloques de lectura, lotes de embeddings y pool para memorize_dir
+    ingest_block_bytes: int = 1 << 20
+    ingest_batch_size: int = 64
+    ingest_workers: int = 2
+    pool_max_file_mb: int = 16
+    # Carpetas vigiladas: se re-indexan solas al cambiar (inotify o sondeo)
+    watch_dirs: list = field(default_factory=list)
+    watch_debounce_s: float = 2.0
+    watch_poll_interval_s: float = 10.0
+    watch_pause_s: float = 0.5
+    # Micro-batching de encodes concurrentes
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 2.0
+    # Recuperación: "dense" (solo vectores) o "hybrid" (BM25 + vectores fusionados con RRF)
+    retrieval_mode: str = "hybrid"
+    rrf_k: int = 60
+    hybrid_candidates: int = 20
+    # Almacén de vectores: "chroma" o "hnsw" (índice ANN local mmap + metadatos en SQLite)
+    vector_store: str = "chroma"
+    ann_engine: str = "auto"  # auto | faiss | hnswlib | exact
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    # Solo lectura: abre el índice mapeado en memoria para compartirlo entre procesos
+    read_only: bool = False
+    # Recuerdo automático: consulta la memoria en paralelo al armado del contexto y, si los
+    # fragmentos superan la similitud mínima (coseno), los inyecta en el primer prompt
+    auto_recall: bool = True
+    auto_recall_min_similarity: float = 0.5
+    auto_recall_results: int = 3
+    auto_recall_timeout_ms: float = 300.0
+
+
+@dataclass
+class GenerationConfig:
+    # Ventana de contexto común: si cambia entre llamadas, Ollama recarga el modelo
+    num_ctx: int = 8192
+    # Presupuesto por tipo de llamada (num_predict, temperature, stop; num_ctx opcional).
+    # Un override parcial en config.yaml conserva el resto de los valores por defecto.
+    think: dict = field(default_factory=lambda: {"num_predict": 768, "temperature": 0.7})
+    reflect: dict = field(default_factory=lambda: {"num_predict": 256, "temperature": 0.4})
+    summarize: dict = field(default_factory=lambda: {"num_predict": 320, "temperature": 0.2})
+    # Salidas de herramientas más largas que esto (read_url, search_web) se resumen antes
+    # de la reflexión, con el presupuesto "summarize" (0 = nunca)
+    summarize_over_chars: int = 3000
+    # Turnos de voz: se leen en voz alta, respuestas cortas
+    voice: dict = field(default_factory=lambda: {"num_predict": 200, "temperature": 0.6})
+
+
+@dataclass
+class IntentsConfig:
+    # Atajo sin LLM para pedidos triviales (hora, fecha, abrir calculadora/URL)
+    enabled: bool = True
+    disabled: list = field(default_factory=list)  # nombres de intents a ignorar
+    # Clasificador por embeddings sobre frases de ejemplo (además de las regex)
+    embedding_classifier: bool = False
+    min_similarity: float = 0.85
+    max_chars: int = 80
+
+
+@dataclass
+class SchedulerConfig:
+    # Agrupa los turnos por modelo: el modelo cargado vacía su cola antes de cambiar
+    enabled: bool = True
+    # Turnos simultáneos (acorde a OLLAMA_NUM_PARALLEL)
+    max_concurrent: int = 4
+    # Turnos seguidos de un mismo modelo mientras otros modelos esperan
+    max_batch: int = 4
+    # Un turno que esperó esto pasa primero, sea cual sea su modelo
+    max_wait_s: float = 20.0
+
+
+@dataclass
+class AdmissionConfig:
+    # Turnos simultáneos por etapa; el resto espera en una cola acotada o recibe 429 / "busy"
+    enabled: bool = True
+    # Turnos en la etapa LLM (incluye los que el scheduler está ordenando por modelo)
+    llm: int = 8
+    asr: int = 2
+    tts: int = 2
+    max_queue: int = 16
+    # Más espera que esto en una etapa = rechazo (muy por debajo del timeout de 120 s de Ollama)
+    queue_timeout_s: float = 30.0
+
+
+@dataclass
+class WorkersConfig:
+    # Hilos nativos para trabajo bloqueante (Whisper, TTS, OCR, subprocesos) fuera del hub de eventlet
+    asr: int = 2
+    tts: int = 2
+    tools: int = 4
+
+
+@dataclass
+class CancellationConfig:
+    # Un mensaje nuevo de la misma sesión cancela el turno anterior (LLM, herramientas, reflexión y TTS)
+    supersede: bool = True
+    # El navegador avisa cuando el usuario empieza a hablar encima de Lucy
+    barge_in: bool = True
+
+
+@dataclass
+class WarmupConfig:
+    enabled: bool = True
+    # Componentes que no bloquean el readiness si fallan (ej. sin voz igual hay chat)
+    optional: list = field(default_factory=lambda: ["tts"])
+
+
+@dataclass
+class ResourcesConfig:
+    # Descargar Whisper/embeddings/XTTS tras N segundos sin uso (0 = nunca)
+    idle_unload_s: float = 0.0
+    check_interval_s: float = 30.0
+
+
 @dataclass
 class LucyConfig:
     asr: ASRConfig = field(default_factory=ASRConfig)
@@ -72,6 +238,15 @@ class LucyConfig:
     tts: TTSConfig = field(default_factory=TTSConfig)
     audio: AudioConfig = field(default_factory=AudioConfig)
     n8n: N8nConfig = field(default_factory=N8nConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    intents: IntentsConfig = field(default_factory=IntentsConfig)
+    generation: GenerationConfig = field(default_factory=GenerationConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    workers: WorkersConfig = field(default_factory=WorkersConfig)
+    cancellation: CancellationConfig = field(default_factory=CancellationConfig)
+    warmup: WarmupConfig = field(default_factory=WarmupConfig)
+    resources: ResourcesConfig = field(default_factory=ResourcesConfig)
     safe_mode: bool = True
 
     @staticmethod
@@ -93,6 +268,15 @@ class LucyConfig:
         tts = data.get("tts", {}) or {}
         audio = data.get("audio", {}) or {}
         n8n = data.get("n8n", {}) or {}
+        memory = data.get("memory", {}) or {}
+        intents = data.get("intents", {}) or {}
+        generation = data.get("generation", {}) or {}
+        scheduler = data.get("scheduler", {}) or {}
+        admission = data.get("admission", {}) or {}
+        workers = data.get("workers", {}) or {}
+        cancellation = data.get("cancellation", {}) or {}
+        warmup = data.get("warmup", {}) or {}
+        resources = data.get("resources", {}) or {}
 
         # Merge with defaults
         return LucyConfig(
@@ -103,4 +287,13 @@ class LucyConfig:
             tts=TTSConfig(**{**TTSConfig().__dict__, **tts}),
             audio=AudioConfig(**{**AudioConfig().__dict__, **audio}),
             n8n=N8nConfig(**{**N8nConfig().__dict__, **n8n}),
+            memory=MemoryConfig(**{**MemoryConfig().__dict__, **memory}),
+            intents=IntentsConfig(**{**IntentsConfig().__dict__, **intents}),
+            generation=GenerationConfig(**{**GenerationConfig().__dict__, **generation}),
+            scheduler=SchedulerConfig(**{**SchedulerConfig().__dict__, **scheduler}),
+            admission=AdmissionConfig(**{**AdmissionConfig().__dict__, **admission}),
+            workers=WorkersConfig(**{**WorkersConfig().__dict__, **workers}),
+            cancellation=CancellationConfig(**{**CancellationConfig().__dict__, **cancellation}),
+            warmup=WarmupConfig(**{**WarmupConfig().__dict__, **warmup}),
+            resources=ResourcesConfig(**{**ResourcesConfig().__dict__, **resources}),
         )
@@ -3,7 +3,7 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
-from lucy_c.tool_router import ToolRouter, ToolResult
+from lucy_c.tool_router import ToolRouter, ToolResult, ToolRun
 from lucy_c.interfaces.llm import LLMProvider
 from lucy_c.config import LucyConfig
 
@@ -12,10 +12,11 @@ class ActionController:
     Manages the execution of tools and actions (The 'Body' acting on the world).
     Owns the Hands (Automation), Eyes (Vision), and the ToolRouter.
     """
-    def __init__(self, cfg: LucyConfig, tool_router: ToolRouter, llm_provider: LLMProvider):
+    def __init__(self, cfg: LucyConfig, tool_router: ToolRouter, llm_provider: LLMProvider, memory=None):
         self.cfg = cfg
         self.tool_router = tool_router
         self.llm_provider = llm_provider
+        self.memory = memory
         self.log = logging.getLogger("LucyC.Actions")
         
         self._check_safe_mode()
@@ -57,6 +58,13 @@ class ActionController:
         Parses and executes tools found in the text.
         Returns the original text with tool results appended.
         """
+        return self.run(text_with_tools, context, status_callback=status_callback).text
+
+    def run(self, text_with_tools: str, context: Dict[str, Any] | None = None, status_callback: Optional[Callable[[str, str], None]] = None) -> ToolRun:
+        """Like execute, but keeps the structured ToolResults (for reflection bypass).
+
+        A cancelled turn (context["cancel"]) stops before its next tool; Cancelled propagates.
+        """
         import re
         tool_pattern = re.compile(r'\[\[\s*([\w.]+)\s*\((.*?)\)\s*\]\]', re.DOTALL)
         matches = tool_pattern.findall(text_with_tools)
@@ -64,14 +72,14 @@ class ActionController:
         if matches:
             self.log.info("ActionController detected tools: %s", matches)
         else:
-            return text_with_tools
+            return ToolRun(text_with_tools)
 
         try:
-            result_text = self.tool_router.parse_and_execute(text_with_tools, context or {}, status_callback=status_callback)
-            return result_text
+            return self.tool_router.run(text_with_tools, context or {}, status_callback=status_callback)
         except Exception as e:
             self.log.error("Action execution failed: %s", e, exc_info=True)
-            return text_with_tools + f"\n\n[⚠️ ERROR MOTOR]: Fallo al ejecutar acción: {e}"
+            return ToolRun(text_with_tools + f"\n\n[⚠️ ERROR MOTOR]: Fallo al ejecutar acción: {e}",
+                           [ToolResult(False, str(e), "⚠️ ERROR MOTOR")])
 
     def register_default_tools(self):
         """Register all available tools with the router."""
@@ -151,7 +159,7 @@ class ActionController:
                 return ToolResult(False, "Faltan args: remember(key, value)", "⚠️")
             
             facts.set_fact(session_user, args[0], args[1])
-            return ToolResult(True, f"Recordado: {args[0]}", "🧠")
+            return ToolResult.done(f"Recordado: {args[0]}", "🧠", hint="Listo, me lo anoto.")
 
         def tool_forget(args, ctx):
             facts = ctx.get("facts_store")
@@ -159,25 +167,26 @@ class ActionController:
             if not facts or not session_user: return ToolResult(False, "Error memoria", "⚠️")
             if not args: return ToolResult(False, "Falta arg", "⚠️")
             facts.remove_fact(session_user, args[0])
-            return ToolResult(True, f"Olvidado: {args[0]}", "🧠")
+            return ToolResult.done(f"Olvidado: {args[0]}", "🧠", hint="Listo, ya me lo olvidé.")
             
         def tool_get_info(args, ctx):
             import datetime
             import platform
             tipo = args[0].lower() if args else "time"
             if tipo == "time":
-                now = datetime.datetime.now().strftime("%H:%M:%S")
-                return ToolResult(True, f"Hora: {now}", "⚙️")
+                now = datetime.datetime.now()
+                return ToolResult.done(f"Hora: {now.strftime('%H:%M:%S')}", "⚙️", hint=f"Son las {now.strftime('%H:%M')}.")
             elif tipo == "date":
                 today = datetime.datetime.now().strftime("%d/%m/%Y")
-                return ToolResult(True, f"Fecha: {today}", "⚙️")
+                return ToolResult.done(f"Fecha: {today}", "⚙️", hint=f"Hoy es {today}.")
             elif tipo == "os":
                 return ToolResult(True, f"Sistema: {platform.system()} {platform.release()}", "⚙️")
             return ToolResult(False, "Tipo desconocido", "⚠️")
 
-        # Registering
+        # Registering (blocking=True: OCR, screenshots, subprocesses, HTML parsing and
+        # embeddings run on the worker pool instead of the eventlet hub)
         tr = self.tool_router
-        tr.register_tool("screenshot", tool_screenshot)
+        tr.register_tool("screenshot", tool_screenshot, blocking=True)
         tr.register_tool("click", tool_click)
         tr.register_tool("type", tool_type)
         tr.register_tool("press", tool_press)
@@ -186,8 +195,8 @@ class ActionController:
         tr.register_tool("move", tool_move)
         tr.register_tool("scroll", tool_scroll)
         
-        tr.register_tool("remember", tool_remember)
-        tr.register_tool("forget", tool_forget)
+        tr.register_tool("remember", tool_remember, phrases=("Listo, me lo anoto.",))
+        tr.register_tool("forget", tool_forget, phrases=("Listo, ya me lo olvidé.",))
         tr.register_tool("get_info", tool_get_info)
         
         tr.register_tool("read_file", tool_read_file)
@@ -197,23 +206,23 @@ class ActionController:
         tr.register_tool("process_payment", tool_process_payment)
         tr.register_tool("generate_budget_pdf", tool_generate_budget_pdf)
         
-        tr.register_tool("search_web", tool_web_search)
-        tr.register_tool("web_search", tool_web_search)
-        tr.register_tool("google_search", tool_web_search) # Alias
+        tr.register_tool("search_web", tool_web_search, blocking=True)
+        tr.register_tool("web_search", tool_web_search, blocking=True)
+        tr.register_tool("google_search", tool_web_search, blocking=True) # Alias
         tr.register_tool("open_url", tool_open_url)
-        tr.register_tool("read_url", tool_read_url)
+        tr.register_tool("read_url", tool_read_url, blocking=True)
         
         # SECURE OS RUN
-        tr.register_tool("os_run", tool_os_run_secure)
-        tr.register_tool("browser.run", tool_os_run_secure)
+        tr.register_tool("os_run", tool_os_run_secure, blocking=True)
+        tr.register_tool("browser.run", tool_os_run_secure, blocking=True)
         
         tr.register_tool("window_manager", tool_window_manager)
         tr.register_tool("windows", tool_window_manager)
         
-        tr.register_tool("scan_ui", tool_scan_ui)
-        tr.register_tool("click_text", tool_click_text)
-        tr.register_tool("peek", tool_peek_desktop)
-        tr.register_tool("peek_desktop", tool_peek_desktop)
+        tr.register_tool("scan_ui", tool_scan_ui, blocking=True)
+        tr.register_tool("click_text", tool_click_text, blocking=True)
+        tr.register_tool("peek", tool_peek_desktop, blocking=True)
+        tr.register_tool("peek_desktop", tool_peek_desktop, blocking=True)
         
         if self.cfg.n8n and self.cfg.n8n.base_url:
              n8n_tools = create_n8n_tools(self.cfg.n8n)
@@ -221,3 +230,13 @@ class ActionController:
              
              cog_tools = create_cognitive_tools(n8n_tools)
              tr.register_tool("ask_sota", cog_tools["ask_sota"])
+
+        # Knowledge/Memory tools (require RAG memory engine)
+        if self.memory:
+            from lucy_c.tools.knowledge_tools import create_knowledge_tools
+            knowledge_tools = create_knowledge_tools(self.memory)
+            tr.register_tool("memorize_file", knowledge_tools["memorize_file"], blocking=True)
+            # Embedding runs on the calling thread; memorize_dir's progress is relayed to the hub
+            tr.register_tool("memorize_dir", knowledge_tools["memorize_dir"], blocking=True)
+            tr.register_tool("recall", knowledge_tools["recall"], blocking=True)
+            tr.register_tool("memory_stats", knowledge_tools["memory_stats"])
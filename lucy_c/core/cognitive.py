@@ -11,6 +11,8 @@ from lucy_c.interfaces.llm import LLMProvider, LLMResponse
 from lucy_c.history_store import HistoryStore
 from lucy_c.facts_store import FactsStore
 from lucy_c.prompts import SYSTEM_PROMPT
+from lucy_c.core.model_router import ModelRouter
+from lucy_c.core.generation import GenerationPolicy
 
 
 class CognitiveEngine:
@@ -20,31 +22,69 @@ class CognitiveEngine:
     Does NOT handle audio, tools, or side effects directly.
     """
     
-    def __init__(self, llm: LLMProvider, history: HistoryStore, facts: FactsStore, log: logging.Logger | None = None):
+    def __init__(self, llm: LLMProvider, history: HistoryStore, facts: FactsStore, log: logging.Logger | None = None,
+                 router: ModelRouter | None = None, policy: GenerationPolicy | None = None):
         self.llm = llm
         self.history = history
         self.facts = facts
         self.log = log or logging.getLogger("LucyC.Cognitive")
         self.max_context_chars = 16000
+        # Optional small/large model cascade (None = every call uses the configured model)
+        self.router = router
+        # Per-call-type num_ctx / num_predict / temperature / stop
+        self.policy = policy or GenerationPolicy()
 
-    def think(self, user_text: str, session_user: str, model_name: str | None = None) -> LLMResponse:
+    def _chat(self, kind: str, messages: List[dict], model_name: str | None, session_user: str | None,
+              user_text: str = "", input_chars: int = 0, enable_tools: bool = False,
+              budget: str | None = None, cancel=None) -> LLMResponse:
+        """Chat on the draft model when the router allows it, escalating to the main model if it fails.
+
+        `budget` picks the generation policy (defaults to `kind`; voice turns pass "voice").
+        `cancel` (the turn's CancelToken) aborts the request; Cancelled is never escalated.
+        """
+        budget = budget or kind
+        options = self.policy.for_call(budget).to_options()
+        draft = None
+        if model_name is None and self.router is not None:
+            draft = self.router.pick(kind, user_text=user_text, input_chars=input_chars)
+        if draft:
+            try:
+                # Small models rarely support native tool calling; they use the [[tool()]] syntax of the prompt
+                response = self.llm.chat(messages, model=draft, user=session_user, options=options, cancel=cancel)
+                if response.text.strip():
+                    self.policy.record(budget, draft, response)
+                    return response
+                self.router.escalated(kind, "empty reply")
+            except Exception as e:
+                self.router.escalated(kind, str(e))
+        response = self.llm.chat(messages, model=model_name, enable_tools=enable_tools, user=session_user,
+                                 options=options, cancel=cancel)
+        self.policy.record(budget, model_name, response)
+        return response
+
+    def think(self, user_text: str, session_user: str, model_name: str | None = None,
+              messages: List[dict] | None = None, voice: bool = False, cancel=None) -> LLMResponse:
         """
         Process user input and generate a response/thought.
-        Constructs the full prompt with system instructions, facts, and history.
+        Constructs the full prompt with system instructions, facts, and history
+        (unless the caller already built it, e.g. with recalled memory added).
         """
-        messages = self.build_context(user_text, session_user)
+        if messages is None:
+            messages = self.build_context(user_text, session_user)
         
         self.log.info("CognitiveEngine thinking with model: %s for user: %s", model_name, session_user)
         
         # Retry logic could also live here or be injected via policy
         try:
-             response = self.llm.chat(messages, model=model_name, enable_tools=True, user=session_user)
+             response = self._chat("think", messages, model_name, session_user, user_text=user_text, enable_tools=True,
+                                   budget="voice" if voice else None, cancel=cancel)
              return response
         except Exception as e:
             self.log.error("CognitiveEngine thinking failed: %s", e)
             raise
 
-    def reflect(self, tool_output: str, original_context: List[dict], model_name: str | None = None, session_user: str | None = None) -> LLMResponse:
+    def reflect(self, tool_output: str, original_context: List[dict], model_name: str | None = None, session_user: str | None = None,
+                voice: bool = False, cancel=None) -> LLMResponse:
         """
         Reflect on tool outputs to generate the final response.
         """
@@ -62,9 +102,38 @@ class CognitiveEngine:
             )}
         ]
         
-        response = self.llm.chat(reflection_messages, model=model_name, user=session_user)
+        response = self._chat("reflect", reflection_messages, model_name, session_user, input_chars=len(tool_output),
+                              budget="voice" if voice else None, cancel=cancel)
         return response
 
+    def summarize(self, text: str, session_user: str | None = None, model_name: str | None = None,
+                  max_sentences: int = 3, cancel=None) -> LLMResponse:
+        """Short Spanish summary of a long text (the orchestrator condenses long tool output before reflecting)."""
+        messages = [
+            {"role": "system", "content": (
+                f"Resumí el texto del usuario en español, en {max_sentences} oraciones como máximo. "
+                "Sé precisa con los datos y no agregues información que no esté en el texto."
+            )},
+            {"role": "user", "content": text},
+        ]
+        return self._chat("summarize", messages, model_name, session_user, input_chars=len(text), cancel=cancel)
+
+    @staticmethod
+    def add_memory_context(messages: List[dict], hits: List[Dict[str, Any]], max_chars: int = 400) -> List[dict]:
+        """Append recalled memory fragments to the system prompt (in place) so no [[recall]] is needed."""
+        if not hits or not messages or messages[0].get("role") != "system":
+            return messages
+        lines = ["\n\n[MEMORIA RELEVANTE]",
+                 "Fragmentos de tu memoria relacionados con el mensaje. Si responden la pregunta, "
+                 "usalos directamente sin llamar a [[recall]]."]
+        for hit in hits:
+            meta = hit.get("metadata") or {}
+            source = meta.get("file_name", meta.get("source", "memoria"))
+            text = hit.get("text") or ""
+            lines.append(f"- ({source}) {text[:max_chars] + '...' if len(text) > max_chars else text}")
+        messages[0]["content"] += "\n".join(lines)
+        return messages
+
     def build_context(self, user_text: str, session_user: str) -> List[dict]:
         """Constructs the list of messages including dynamic system prompt & history."""
         # 1. System Prompt & Dynamic Info
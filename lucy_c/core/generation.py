@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from lucy_c.config import GenerationConfig
+from lucy_c.interfaces.llm import LLMResponse
+
+
+@dataclass
+class GenerationParams:
+    """Ollama `options` for one call. None leaves the model's default."""
+    num_ctx: Optional[int] = None
+    num_predict: Optional[int] = None
+    temperature: Optional[float] = None
+    stop: List[str] = field(default_factory=list)
+
+    def to_options(self) -> Dict[str, Any]:
+        options = {k: v for k, v in (("num_ctx", self.num_ctx), ("num_predict", self.num_predict),
+                                     ("temperature", self.temperature)) if v is not None}
+        if self.stop:
+            options["stop"] = list(self.stop)
+        return options
+
+
+class GenerationPolicy:
+    """
+    Generation budget per call type: think, reflect, summarize and voice (turns
+    that will be spoken, so they should be short).
+
+    Also records what each call actually cost (prompt/eval token counts from
+    Ollama) so the budgets can be tuned against tail latency: a high
+    `truncated` count means num_predict is too tight.
+    """
+
+    KINDS = ("think", "reflect", "summarize", "voice")
+
+    def __init__(self, cfg: GenerationConfig | None = None):
+        self.cfg = cfg or GenerationConfig()
+        self.log = logging.getLogger("LucyC.Generation")
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def for_call(self, kind: str) -> GenerationParams:
+        defaults = GenerationConfig().__dict__.get(kind) or {}
+        # A partial override in config.yaml (reflect: {num_predict: 300}) keeps the other defaults
+        per_kind = {**defaults, **(getattr(self.cfg, kind, None) or {})}
+        return GenerationParams(
+            num_ctx=per_kind.get("num_ctx", self.cfg.num_ctx),
+            num_predict=per_kind.get("num_predict"),
+            temperature=per_kind.get("temperature"),
+            stop=list(per_kind.get("stop") or []),
+        )
+
+    def record(self, kind: str, model: str | None, response: LLMResponse) -> None:
+        """Log and aggregate the eval counts reported for a call (no-op for providers without usage)."""
+        usage = response.usage or {}
+        if not usage:
+            return
+        prompt_tokens = int(usage.get("prompt_eval_count") or 0)
+        eval_tokens = int(usage.get("eval_count") or 0)
+        eval_ms = float(usage.get("eval_duration_ms") or 0.0)
+        truncated = usage.get("done_reason") == "length"
+        self.log.info("%s on %s: prompt=%d tok, eval=%d tok in %.0f ms (%.1f tok/s)%s", kind,
+                      model or "default", prompt_tokens, eval_tokens, eval_ms,
+                      eval_tokens / (eval_ms / 1000.0) if eval_ms else 0.0,
+                      ", hit num_predict" if truncated else "")
+        with self._lock:
+            s = self.stats.setdefault(kind, {"calls": 0, "prompt_tokens": 0, "eval_tokens": 0,
+                                             "eval_ms": 0.0, "max_eval_tokens": 0, "truncated": 0})
+            s["calls"] += 1
+            s["prompt_tokens"] += prompt_tokens
+            s["eval_tokens"] += eval_tokens
+            s["eval_ms"] += eval_ms
+            s["max_eval_tokens"] = max(s["max_eval_tokens"], eval_tokens)
+            s["truncated"] += truncated
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {}
+            for kind, s in self.stats.items():
+                calls = s["calls"] or 1
+                out[kind] = {
+                    "calls": s["calls"],
+                    "avg_prompt_tokens": round(s["prompt_tokens"] / calls, 1),
+                    "avg_eval_tokens": round(s["eval_tokens"] / calls, 1),
+                    "max_eval_tokens": s["max_eval_tokens"],
+                    "avg_eval_ms": round(s["eval_ms"] / calls, 1),
+                    "truncated": s["truncated"],
+                }
+        return {"budgets": {k: self.for_call(k).to_options() for k in self.KINDS}, "calls": out}
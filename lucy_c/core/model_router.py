@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Dict, List
+
+from lucy_c.config import OllamaConfig
+
+
+class ModelRouter:
+    """
+    Two-tier cascade: picks the small draft model for cheap calls and keeps the
+    main model for open-ended reasoning.
+
+    Call kinds: "reflect" (rephrase tool output), "summarize", and "think"
+    (which only goes to the draft model when the utterance is short and has no
+    escalation keyword). The CognitiveEngine escalates to the main model when a
+    draft call fails or comes back empty.
+    """
+
+    def __init__(self, cfg: OllamaConfig):
+        self.cfg = cfg
+        self.log = logging.getLogger("LucyC.ModelRouter")
+        self._keywords = [re.compile(rf"\b{re.escape(k)}", re.IGNORECASE) for k in cfg.escalate_keywords or []]
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cfg.draft_model)
+
+    def _count(self, kind: str, key: str) -> None:
+        with self._lock:
+            bucket = self.counts.setdefault(kind, {"draft": 0, "main": 0, "escalated": 0})
+            bucket[key] += 1
+
+    def _is_short(self, user_text: str) -> bool:
+        if len(user_text.split()) > self.cfg.draft_max_words:
+            return False
+        return not any(k.search(user_text) for k in self._keywords)
+
+    def pick(self, kind: str, user_text: str = "", input_chars: int = 0) -> str | None:
+        """Draft model name for this call, or None to use the main model."""
+        use_draft = (
+            self.enabled
+            and input_chars <= self.cfg.draft_max_input_chars
+            and (kind in (self.cfg.draft_for or [])
+                 or (kind == "think" and "short" in (self.cfg.draft_for or []) and self._is_short(user_text)))
+        )
+        self._count(kind, "draft" if use_draft else "main")
+        return self.cfg.draft_model if use_draft else None
+
+    def escalated(self, kind: str, reason: str) -> None:
+        self.log.info("Escalating %s from %s to the main model: %s", kind, self.cfg.draft_model, reason)
+        self._count(kind, "escalated")
+
+    def models(self) -> List[str]:
+        """Models that should stay resident."""
+        return [self.cfg.model] + ([self.cfg.draft_model] if self.enabled else [])
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            counts = {k: dict(v) for k, v in self.counts.items()}
+        return {"draft_model": self.cfg.draft_model or None, "main_model": self.cfg.model, "calls": counts}
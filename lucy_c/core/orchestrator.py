@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import logging
+import re
+import threading
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Callable, Optional
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
 
 from lucy_c.config import LucyConfig
 from lucy_c.interfaces.llm import LLMProvider
@@ -13,17 +16,54 @@ from lucy_c.interfaces.audio import TTSProvider, ASRProvider
 from lucy_c.core.cognitive import CognitiveEngine
 from lucy_c.core.senses import SensorySystem
 from lucy_c.core.actions import ActionController
+from lucy_c.services.auto_recall import AutoRecall
+from lucy_c.services.model_scheduler import ModelScheduler
+from lucy_c.services.admission import AdmissionController, Busy
+from lucy_c.services.phrase_bank import register_phrases
+from lucy_c.services.cancellation import CancelToken, Cancelled, TurnTracker
+from lucy_c.intent_router import IntentRouter
 
-from lucy_c.tool_router import ToolRouter
+from lucy_c.tool_router import ToolRouter, ToolRun
 from lucy_c.history_store import HistoryStore, default_history_dir
 from lucy_c.facts_store import FactsStore, default_facts_dir
 
+_RECALL_CALL = re.compile(r"\[\[\s*recall\s*\(")
+_TOOL_CALL = re.compile(r"\[\[\s*[\w.]+\s*\(.*?\)\s*\]\]", re.DOTALL)
+
+EMPTY_TEXT_REPLY = "Decime algo."
+EMPTY_AUDIO_REPLY = "No escuché nada."
+register_phrases(EMPTY_TEXT_REPLY, EMPTY_AUDIO_REPLY)
+
+
 @dataclass
 class TurnResult:
     transcript: str
     reply: str
     reply_wav: bytes
     reply_sr: int
+    cancelled: bool = False  # superseded by a newer turn of the session or barged in on; nothing to deliver
+
+
+@dataclass
+class TurnContext:
+    """Per-turn state, threaded through the pipeline instead of living in shared config."""
+    session_user: str
+    model: Optional[str] = None  # None = cfg.ollama.model (and the draft cascade)
+    voice: bool = False  # the reply will be spoken
+    speak: bool = True  # synthesize the reply within the turn (False: the caller defers TTS)
+    room: Optional[str] = None  # Socket.IO room of the session; its status events go only there
+    status_callback: Optional[Callable[[str, str], None]] = field(default=None, repr=False)
+    cancel: Optional[CancelToken] = field(default=None, repr=False)
+
+    def status(self, message: str, type: str = "info") -> None:
+        if self.status_callback:
+            self.status_callback(message, type)
+
+    def tool_context(self) -> Dict[str, Any]:
+        # status_callback: long tools (memorize_dir) report progress to the session
+        return {"session_user": self.session_user, "room": self.room, "cancel": self.cancel,
+                "status_callback": self.status_callback}
+
 
 class LucyOrchestrator:
     """
@@ -36,97 +76,288 @@ class LucyOrchestrator:
                  brain: CognitiveEngine,
                  senses: SensorySystem,
                  body: ActionController,
-                 status_callback: Callable[[str, str], None] | None = None):
+                 status_callback: Callable[..., None] | None = None,
+                 recall: AutoRecall | None = None,
+                 intents: IntentRouter | None = None,
+                 scheduler: ModelScheduler | None = None,
+                 admission: AdmissionController | None = None,
+                 turns: TurnTracker | None = None):
         
         self.cfg = cfg
         self.brain = brain
         self.senses = senses
         self.body = body
+        # status_callback(message, type) or, for turns tied to a session room, (message, type, room=room)
         self.status_callback = status_callback
+        # Speculative memory lookup injected into the first prompt (None = off)
+        self.recall = recall
+        # Deterministic fast path for trivial requests (None = always use the LLM)
+        self.intents = intents
+        # Groups turns by model so Ollama doesn't swap weights every turn (None = no queueing)
+        self.scheduler = scheduler
+        # Per-stage concurrency limits; raises Busy when a stage's queue is full (None = unlimited)
+        self.admission = admission
+        # Running turn per session: a newer turn (or a barge-in) cancels the one nobody will hear
+        self.turns = turns or TurnTracker()
         self.log = logging.getLogger("LucyC.Orchestrator")
         
         self._init_time = time.time()
+        # Turns in flight; background work (memory watcher) yields while > 0
+        self._active_turns = 0
+        self._turns_lock = threading.Lock()
+        # Turns where tools ran, how many of those skipped the reflection call, and
+        # how many long tool outputs were summarized before reflecting
+        self._reflection = {"tool_turns": 0, "skipped": 0, "summarized": 0}
         self.log.info("LUCY ORCHESTRATOR ACTIVE.")
 
-    def process_text_input(self, text: str, session_user: str | None = None) -> TurnResult:
-        """Run a full turn starting from text."""
+    @contextmanager
+    def _turn(self):
+        with self._turns_lock:
+            self._active_turns += 1
+        try:
+            yield
+        finally:
+            with self._turns_lock:
+                self._active_turns -= 1
+
+    @contextmanager
+    def _cancellable(self, ctx: TurnContext):
+        """Give the turn a token (superseding the session's previous turn) and close it in the tracker."""
+        ctx.cancel = self.turns.begin(ctx.session_user)
+        try:
+            yield
+        finally:
+            self.turns.end(ctx.session_user, ctx.cancel)
+
+    def _cancelled(self, ctx: TurnContext, transcript: str, e: Cancelled) -> TurnResult:
+        self.log.info("Turn of %s cancelled (%s) at %s", ctx.session_user, e.reason, e.stage)
+        return TurnResult(transcript, "", b"", 0, cancelled=True)
+
+    def cancel_turn(self, session_user: str, reason: str = "barge_in") -> bool:
+        """Cancel the session's running turn, e.g. when the user starts talking over Lucy."""
+        return self.turns.cancel(session_user, reason)
+
+    def _stage(self, name: str):
+        return self.admission.stage(name) if self.admission else nullcontext()
+
+    def speak(self, text: str, cancel: CancelToken | None = None) -> tuple[bytes, int]:
+        """TTS within its admission limit; when the voice is saturated the reply goes out as text only.
+
+        Also used for deferred audio (/api/audio/<id>), outside any turn. Raises Cancelled
+        if the turn behind `cancel` is cancelled before its synthesis starts.
+        """
+        try:
+            with self._stage("tts"):
+                return self.senses.speak(text, cancel=cancel)
+        except Busy as e:
+            self.log.warning("Skipping speech for this turn: %s", e)
+            return b"", 0
+
+    def is_busy(self) -> bool:
+        """True while any turn is being processed."""
+        return self._active_turns > 0
+
+    def reflection_report(self) -> dict:
+        with self._turns_lock:
+            stats = dict(self._reflection)
+        stats["skip_rate"] = round(stats["skipped"] / stats["tool_turns"], 3) if stats["tool_turns"] else None
+        return stats
+
+    @staticmethod
+    def _reply_from_tools(thought_text: str, run: ToolRun) -> str:
+        """Final reply for a turn whose tool results describe themselves: the model's prose plus the hints."""
+        prose = _TOOL_CALL.sub("", thought_text).strip()
+        return " ".join(part for part in (prose, run.reply_from_hints()) if part)
+
+    def _condense_tool_output(self, processed_text: str, run: ToolRun, ctx: TurnContext) -> str:
+        """Replace tool outputs over `generation.summarize_over_chars` (web pages, search dumps) with a summary.
+
+        Reflection then works on a short prompt, and the summary can run on the
+        draft model. A failed summary keeps the original output.
+        """
+        limit = int(self.cfg.generation.summarize_over_chars or 0)
+        if limit <= 0:
+            return processed_text
+        for result in run.results:
+            if not result.success or len(result.output) <= limit:
+                continue
+            try:
+                summary = self.brain.summarize(result.output, session_user=ctx.session_user, model_name=ctx.model,
+                                               cancel=ctx.cancel).text.strip()
+            except Exception as e:
+                self.log.warning("Tool output summary failed, reflecting on the full text: %s", e)
+                continue
+            if summary:
+                processed_text = processed_text.replace(result.output, summary)
+                with self._turns_lock:
+                    self._reflection["summarized"] += 1
+        return processed_text
+
+    def session_model(self, session_user: str | None) -> str | None:
+        """The model this session picked (FactsStore "selected_model"), or None for the configured one."""
+        facts = getattr(self.brain, "facts", None)
+        if not facts or not session_user:
+            return None
+        try:
+            chosen = facts.get_facts(session_user)
+        except Exception as e:
+            self.log.debug("Could not read brain choice for %s: %s", session_user, e)
+            return None
+        model = chosen.get("selected_model")
+        if not model or chosen.get("selected_provider", "ollama") != "ollama" or model == self.cfg.ollama.model:
+            return None
+        return model
+
+    def process_text_input(self, text: str, session_user: str | None = None, model: str | None = None,
+                           room: str | None = None, speak: bool = True) -> TurnResult:
+        """Run a full turn starting from text (`model` defaults to the session's choice).
+
+        Status events go to `room` when given; `speak=False` returns the reply without audio
+        (the caller synthesizes it later with speak()). Raises Busy when admission control
+        turns the turn away. A newer turn of the same session cancels this one: the result
+        then has `cancelled=True` and nothing to deliver.
+        """
+        with self._turn():
+            ctx = self._context(session_user, model, room=room)
+            ctx.speak = speak
+            with self._cancellable(ctx):
+                try:
+                    return self._process_text(text, ctx)
+                except Cancelled as e:
+                    return self._cancelled(ctx, (text or "").strip(), e)
+
+    def _context(self, session_user: str | None, model: str | None, voice: bool = False,
+                 room: str | None = None) -> TurnContext:
+        session_user = session_user or "lucy-c:anonymous"
+        status = self.status_callback
+        if status and room:
+            status = lambda message, type="info": self.status_callback(message, type, room=room)
+        return TurnContext(session_user=session_user, model=model or self.session_model(session_user), voice=voice,
+                           room=room, status_callback=status)
+
+    def _process_text(self, text: str, ctx: TurnContext) -> TurnResult:
         transcript = (text or "").strip()
         if not transcript:
-            return TurnResult("", "Decime algo.", b"", 0)
-            
-        session_user = session_user or "lucy-c:anonymous"
+            # Pinned by the phrase bank, so answering out loud is free
+            wav, sr = self.speak(EMPTY_TEXT_REPLY, cancel=ctx.cancel) if ctx.speak else (b"", 0)
+            return TurnResult("", EMPTY_TEXT_REPLY, wav, sr)
         
+        # 0. FAST PATH: fixed answers ("¿qué hora es?") skip think + reflect entirely
+        if self.intents:
+            reply = self.intents.handle(transcript, context=ctx.tool_context())
+            if reply is not None:
+                wav, sr = self.speak(reply, cancel=ctx.cancel) if ctx.speak else (b"", 0)
+                return TurnResult(transcript=transcript, reply=reply, reply_wav=wav, reply_sr=sr)
+        
+        # 1-3. Think, act and reflect, queued with the other turns for the same model
+        model = ctx.model or self.cfg.ollama.model
+        slot = self.scheduler.slot(model, ctx.session_user) if self.scheduler else nullcontext()
+        with self._stage("llm"), slot:
+            final_text = self._cognition(transcript, ctx)
+
+        # 4. EXPRESSION (Speak)
+        wav, sr = b"", 0
+        if ctx.speak:
+            with self.turns.stage(ctx.cancel, "tts"):
+                ctx.status("Sintetizando voz...", "info")
+                wav, sr = self.speak(final_text, cancel=ctx.cancel)
+
+        return TurnResult(
+            transcript=transcript,
+            reply=final_text,
+            reply_wav=wav,
+            reply_sr=sr
+        )
+
+    def _cognition(self, transcript: str, ctx: TurnContext) -> str:
+        session_user = ctx.session_user
+
         # 1. COGNITION (Think)
-        if self.status_callback:
-            self.status_callback("Pensando...", "info")
+        ctx.status("Pensando...", "info")
             
+        # Memory is queried while the context is built; close hits skip the [[recall]] round trip
+        pending_recall = self.recall.start(transcript) if self.recall else None
+        context = None
+        recalled = []
         try:
-            llm_response = self.brain.think(transcript, session_user=session_user)
+            with self.turns.stage(ctx.cancel, "think"):
+                context = self.brain.build_context(transcript, session_user)
+                if self.recall:
+                    recalled = self.recall.result(pending_recall)
+                    self.brain.add_memory_context(context, recalled)
+                llm_response = self.brain.think(transcript, session_user=session_user, model_name=ctx.model,
+                                                messages=context, voice=ctx.voice, cancel=ctx.cancel)
             thought_text = llm_response.text
         except Exception as e:
             self.log.error("Cognitive failure: %s", e)
             thought_text = f"Tuve un error cognitivo: {e}"
+        if self.recall:
+            self.recall.note_turn(bool(recalled), bool(_RECALL_CALL.search(thought_text)))
 
         # 2. ACTION (Do)
         # Check for tools and execute
         final_text = thought_text
         try:
             # We check if execution changes the text (meaning tools ran and appended output)
-            processed_text = self.body.execute(
-                thought_text, 
-                context={"session_user": session_user},
-                status_callback=self.status_callback
-            )
+            with self.turns.stage(ctx.cancel, "tools"):
+                run = self.body.run(
+                    thought_text, 
+                    context=ctx.tool_context(),
+                    status_callback=ctx.status_callback
+                )
+            processed_text = run.text
             
             if processed_text != thought_text:
-                # Tools ran. We need to reflect.
-                # Reconstruct context for reflection
-                # NOTE: This is slightly redundant with how CognitiveEngine builds context, 
-                # but we need the raw messages list for reflection inside brain.
-                # To fix this cleanly, `think` should probably return the context used.
-                # For now, we re-build context in `reflect` or pass it.
-                # Let's rely on `brain.reflect` to handle the chat logic if we pass the context.
-                # But `brain.think` didn't return context. 
-                # Optimization: `brain` tracks context or we reconstruct it.
-                
-                # Re-building the message list for reflection:
-                original_context = self.brain.build_context(transcript, session_user)
+                skip = not run.needs_reflection
+                with self._turns_lock:
+                    self._reflection["tool_turns"] += 1
+                    self._reflection["skipped"] += skip
                 
-                # 3. REFLECTION (Reflect)
-                if self.status_callback:
-                    self.status_callback("Reflexionando sobre acciones...", "info")
+                if skip:
+                    # 3a. Only self-describing results ("Ventana 'x' cerrada."): they are the answer
+                    final_text = self._reply_from_tools(thought_text, run)
+                else:
+                    # Tools ran. We need to reflect, on the same context the thought came from.
+                    original_context = context or self.brain.build_context(transcript, session_user)
                     
-                reflect_resp = self.brain.reflect(processed_text, original_context, session_user=session_user)
-                final_text = reflect_resp.text
+                    # 3. REFLECTION (Reflect)
+                    with self.turns.stage(ctx.cancel, "reflect"):
+                        ctx.status("Reflexionando sobre acciones...", "info")
+                        processed_text = self._condense_tool_output(processed_text, run, ctx)
+                            
+                        reflect_resp = self.brain.reflect(processed_text, original_context, model_name=ctx.model,
+                                                          session_user=session_user, voice=ctx.voice,
+                                                          cancel=ctx.cancel)
+                    final_text = reflect_resp.text
                 
         except Exception as e:
             self.log.error("Action/Reflection failure: %s", e)
             # Fallback to original thought if action failed catastrophically
             final_text = thought_text + f"\n[Error en acción: {e}]"
+        return final_text
 
-        # 4. EXPRESSION (Speak)
-        if self.status_callback:
-            self.status_callback("Sintetizando voz...", "info")
-            
-        wav, sr = self.senses.speak(final_text)
-
-        return TurnResult(
-            transcript=transcript,
-            reply=final_text,
-            reply_wav=wav,
-            reply_sr=sr
-        )
-
-    def process_audio_input(self, audio_f32, session_user: str | None = None) -> TurnResult:
+    def process_audio_input(self, audio_f32, session_user: str | None = None, model: str | None = None,
+                            room: str | None = None) -> TurnResult:
         """Run a full turn starting from audio."""
-        if self.status_callback:
-            self.status_callback("Escuchando...", "info")
-            
-        transcript = self.senses.listen(audio_f32)
-        if not transcript:
-             return TurnResult("", "No escuché nada.", b"", 0)
-             
-        return self.process_text_input(transcript, session_user=session_user)
+        with self._turn():
+            ctx = self._context(session_user, model, voice=True, room=room)
+            ctx.status("Escuchando...", "info")
+                
+            if self.admission:
+                # Don't transcribe a turn the LLM stage would turn away anyway
+                self.admission.check("llm")
+            with self._cancellable(ctx):
+                transcript = ""
+                try:
+                    with self._stage("asr"), self.turns.stage(ctx.cancel, "asr"):
+                        transcript = self.senses.listen(audio_f32, cancel=ctx.cancel)
+                    if not transcript:
+                        wav, sr = self.speak(EMPTY_AUDIO_REPLY, cancel=ctx.cancel)
+                        return TurnResult("", EMPTY_AUDIO_REPLY, wav, sr)
+
+                    return self._process_text(transcript, ctx)
+                except Cancelled as e:
+                    return self._cancelled(ctx, transcript, e)
 
     # --- Legacy/Helper Accessors for App compatibility ---
     # These effectively expose the internal components so app.py doesn't break immediately
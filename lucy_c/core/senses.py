@@ -5,30 +5,57 @@ from typing import Optional
 
 from lucy_c.interfaces.audio import ASRProvider, TTSProvider
 from lucy_c.audio_codec import encode_wav_bytes
+from lucy_c.services.offload import WorkerPools
+from lucy_c.services.cancellation import CancelToken, Cancelled
 
 class SensorySystem:
     """
     Abstractions for Lucy's senses (Hearing and Speaking).
     Manages ASR and TTS interactions.
+
+    With `pools`, transcription and synthesis run on the "asr"/"tts" worker
+    pools so they don't block the eventlet hub.
+
+    Phrases pinned by the phrase bank are kept encoded: speaking one skips
+    both synthesis and the TTS pool.
+
+    With a `cancel` token, work that was still queued for a worker when the
+    turn got cancelled is dropped instead of run.
     """
-    def __init__(self, asr: ASRProvider, tts: TTSProvider):
+    def __init__(self, asr: ASRProvider, tts: TTSProvider, pools: WorkerPools | None = None):
         self.asr = asr
         self.tts = tts
+        self.pools = pools
+        self._pinned: dict[str, tuple[bytes, int]] = {}  # normalized text -> (wav, sr)
         self.log = logging.getLogger("LucyC.Senses")
 
-    def listen(self, audio_input: np.ndarray) -> str:
+    def _run(self, pool: str, func, *args):
+        return self.pools.run(pool, func, *args) if self.pools else func(*args)
+
+    def _run_unless_cancelled(self, pool: str, cancel: CancelToken | None, func, *args):
+        if cancel is None:
+            return self._run(pool, func, *args)
+        cancel.check(pool)
+        # Checked again on the worker, once the job got a slot; Cancelled itself must not cross tpool
+        result = self._run(pool, lambda: None if cancel.cancelled else (func(*args),))
+        cancel.check(pool)
+        return result[0]
+
+    def listen(self, audio_input: np.ndarray, cancel: CancelToken | None = None) -> str:
         """Process audio input to text."""
         try:
-            result = self.asr.transcribe(audio_f32=audio_input)
+            result = self._run_unless_cancelled("asr", cancel, lambda: self.asr.transcribe(audio_f32=audio_input))
             text = result.text.strip()
             if text:
                 self.log.info("Heard: %s (Lang: %s)", text, result.language)
             return text
+        except Cancelled:
+            raise
         except Exception as e:
             self.log.error("Hearing failure: %s", e)
             return ""
 
-    def speak(self, text: str) -> tuple[bytes, int]:
+    def speak(self, text: str, cancel: CancelToken | None = None) -> tuple[bytes, int]:
         """Process text output to audio bytes."""
         try:
             # We assume text is already normalized or the provider handles it
@@ -43,12 +70,26 @@ class SensorySystem:
             # Putting it here seems 'sensory'.
             from lucy_c.text_normalizer import normalize_for_tts
             clean_text = normalize_for_tts(text)
+            pinned = self._pinned.get(clean_text)
+            if pinned is not None:
+                return pinned
             
-            res = self.tts.synthesize(clean_text)
-            
-            # Encode to WAV bytes for transport
-            wav_bytes = encode_wav_bytes(res.audio_f32, res.sample_rate)
-            return wav_bytes, res.sample_rate
+            # Synthesis and WAV encoding are CPU-bound: both go to the TTS pool
+            return self._run_unless_cancelled("tts", cancel, self._synthesize, clean_text)
         except Exception as e:
             self.log.error("Speaking failure: %s", e)
             return b"", 0
+
+    def _synthesize(self, text: str) -> tuple[bytes, int]:
+        res = self.tts.synthesize(text)
+        # Encode to WAV bytes for transport
+        return encode_wav_bytes(res.audio_f32, res.sample_rate), res.sample_rate
+
+    def pin(self, text: str) -> bool:
+        """Synthesize `text` once and keep it (phrase bank). False if the provider can't pin it."""
+        from lucy_c.text_normalizer import normalize_for_tts
+        clean_text = normalize_for_tts(text)
+        if not self._run("tts", self.tts.pin, clean_text):
+            return False
+        self._pinned[clean_text] = self._run("tts", self._synthesize, clean_text)  # cache hit
+        return True
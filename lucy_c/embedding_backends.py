@@ -0,0 +1,166 @@
+"""Embedding backends for Lucy's semantic memory.
+
+- `sentence-transformers`: the original PyTorch path (imports torch, ~1 GB RSS)
+- `onnx`: the same all-MiniLM-L6-v2 exported to ONNX and int8-quantized, run
+  with onnxruntime + a Rust tokenizer. No torch import, faster cold start and
+  CPU throughput. Mean pooling + L2 norm mirror the sentence-transformers
+  pipeline, so both backends share a vector space and the existing collection
+  stays valid (see scripts/bench_embeddings.py for the parity check).
+
+Create the ONNX model with scripts/export_onnx_embeddings.py.
+"""
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from lucy_c.config import MemoryConfig
+from lucy_c.interfaces.embeddings import EmbeddingBackend
+
+log = logging.getLogger("LucyC.Embeddings")
+
+ONNX_MODEL_FILE = "model_int8.onnx"
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """PyTorch sentence-transformers model, loaded on first use (and again after unload())."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        if importlib.util.find_spec("sentence_transformers") is None:
+            log.error("Failed to import RAG dependencies: sentence_transformers")
+            raise RuntimeError("ChromaDB or sentence-transformers not installed. Run: pip install chromadb sentence-transformers")
+        self.model_name = model_name
+        self.name = f"st:{model_name}"
+        self.space = model_name
+        self._lock = threading.Lock()
+        self._model = None
+
+    @property
+    def model(self):
+        self.last_used = time.time()
+        if self._model is not None:
+            return self._model
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+
+                log.info("Loading embedding model (%s)...", self.model_name)
+                self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts: Sequence[str], show_progress_bar: bool = False) -> np.ndarray:
+        return np.asarray(self.model.encode(list(texts), show_progress_bar=show_progress_bar), dtype=np.float32)
+
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def unload(self) -> None:
+        with self._lock:
+            self._model = None
+
+    def resident_bytes(self) -> int:
+        from lucy_c.services.resource_manager import torch_module_bytes
+        model = self._model
+        return torch_module_bytes(model) if model is not None else 0
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """int8 ONNX export of a sentence-transformers model, run with onnxruntime.
+
+    Args:
+        model_dir: Directory with model_int8.onnx and tokenizer.json
+        model_name: Model the export came from (defines the vector space)
+        threads: intra-op threads for onnxruntime (0 = its default)
+        max_length: Token truncation; 256 matches all-MiniLM-L6-v2's max_seq_length
+        batch_size: Texts per inference call (bounds padding memory)
+    """
+
+    def __init__(self, model_dir: str | Path, model_name: str = "all-MiniLM-L6-v2", threads: int = 0,
+                 max_length: int = 256, batch_size: int = 32):
+        missing = [m for m in ("onnxruntime", "tokenizers") if importlib.util.find_spec(m) is None]
+        if missing:
+            raise RuntimeError(f"ONNX embedding backend needs {', '.join(missing)}. Run: pip install onnxruntime tokenizers")
+        self.model_dir = Path(model_dir)
+        if not (self.model_dir / ONNX_MODEL_FILE).exists() or not (self.model_dir / "tokenizer.json").exists():
+            raise RuntimeError(f"ONNX embedding model not found in {self.model_dir}. "
+                               "Run: python scripts/export_onnx_embeddings.py")
+        self.model_name = model_name
+        self.name = f"onnx-int8:{model_name}"
+        self.space = model_name
+        self.threads = int(threads)
+        self.max_length = int(max_length)
+        self.batch_size = max(1, int(batch_size))
+        self._lock = threading.Lock()
+        self._session = None
+        self._tokenizer = None
+
+    def _ensure(self):
+        self.last_used = time.time()
+        if self._session is not None:
+            return self._session, self._tokenizer
+        with self._lock:
+            if self._session is None:
+                import onnxruntime as ort
+                from tokenizers import Tokenizer
+
+                log.info("Loading ONNX embedding model (%s)...", self.model_dir)
+                opts = ort.SessionOptions()
+                if self.threads > 0:
+                    opts.intra_op_num_threads = self.threads
+                tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+                tokenizer.enable_truncation(max_length=self.max_length)
+                tokenizer.enable_padding()
+                self._tokenizer = tokenizer
+                self._session = ort.InferenceSession(str(self.model_dir / ONNX_MODEL_FILE), opts,
+                                                     providers=["CPUExecutionProvider"])
+        return self._session, self._tokenizer
+
+    def encode(self, texts: Sequence[str], show_progress_bar: bool = False) -> np.ndarray:
+        session, tokenizer = self._ensure()
+        texts = list(texts)
+        input_names = {i.name for i in session.get_inputs()}
+        out = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = tokenizer.encode_batch(texts[start:start + self.batch_size])
+            ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            feeds = {"input_ids": ids, "attention_mask": mask}
+            if "token_type_ids" in input_names:
+                feeds["token_type_ids"] = np.array([e.type_ids for e in encoded], dtype=np.int64)
+            hidden = session.run(None, feeds)[0]  # (batch, tokens, dim)
+
+            # Mean pooling over real tokens, then L2 norm (sentence-transformers' Pooling + Normalize)
+            m = mask[..., None].astype(np.float32)
+            pooled = (hidden * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out.append(pooled.astype(np.float32))
+        if not out:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(out, axis=0)
+
+    def is_loaded(self) -> bool:
+        return self._session is not None
+
+    def unload(self) -> None:
+        with self._lock:
+            self._session = None
+            self._tokenizer = None
+
+    def resident_bytes(self) -> int:
+        from lucy_c.services.resource_manager import path_bytes
+        return path_bytes(self.model_dir / ONNX_MODEL_FILE) if self._session is not None else 0
+
+
+def create_embedding_backend(cfg: MemoryConfig) -> EmbeddingBackend:
+    """Backend selected by memory.embedding_backend."""
+    if cfg.embedding_backend == "onnx":
+        return OnnxEmbeddingBackend(cfg.onnx_model_dir, model_name=cfg.embedding_model, threads=cfg.onnx_threads)
+    if cfg.embedding_backend == "sentence-transformers":
+        return SentenceTransformerBackend(cfg.embedding_model)
+    raise ValueError(f"Unknown embedding backend: {cfg.embedding_backend}")
@@ -0,0 +1,208 @@
+"""Cached, micro-batched front-end for Lucy's embedding model.
+
+Recall probes repeat a lot (same questions, auto-recall on similar turns), so
+query embeddings are kept in a bounded LRU keyed by normalized text, with an
+optional SQLite tier that survives restarts. Concurrent query encodes are
+coalesced into a single `encode()` call.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+log = logging.getLogger("LucyC.Embeddings")
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a query: case-folded, whitespace-collapsed."""
+    return " ".join((text or "").split()).casefold()
+
+
+class EmbeddingCache:
+    """Bounded LRU of vectors with an optional on-disk (SQLite) second tier.
+
+    `namespace` should identify the embedding model so vectors from a different
+    backend are never served for the same text.
+    """
+
+    def __init__(self, max_items: int = 1024, disk_path: str | Path | None = None, namespace: str = "default"):
+        self.max_items = max(0, int(max_items))
+        self.namespace = namespace
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path:
+            p = Path(disk_path)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(p), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "namespace TEXT, key TEXT, dim INTEGER, vec BLOB, PRIMARY KEY (namespace, key))"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._mem.get(key)
+            if vec is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return vec
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vec FROM query_embeddings WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                if row is not None:
+                    vec = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+                    return vec
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vec: np.ndarray) -> None:
+        vec = np.array(vec, dtype=np.float32).reshape(-1)
+        vec.setflags(write=False)  # shared between callers
+        with self._lock:
+            self._remember(key, vec)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (namespace, key, dim, vec) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, int(vec.shape[0]), vec.tobytes()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        if self.max_items == 0:
+            return
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._mem.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._mem),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / total, 3) if total else 0.0,
+                "disk": self._db is not None,
+            }
+
+
+class EmbeddingService:
+    """Wraps a model's `encode()` with the query cache and micro-batching.
+
+    Args:
+        model_getter: Returns the model to call (so lazy-loading/unloading keeps working)
+        cache: Query cache, or None to disable caching
+        max_batch: Upper bound of queries encoded in one call
+        max_wait_ms: How long the first caller waits for others to join its batch
+    """
+
+    def __init__(self, model_getter: Callable[[], Any], cache: EmbeddingCache | None = None,
+                 max_batch: int = 32, max_wait_ms: float = 2.0):
+        self._model_getter = model_getter
+        self.cache = cache
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[str, str, Future]] = []  # (cache key, text, future)
+        self._leader_active = False
+        self.batches = 0
+        self.batched_queries = 0
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Direct batch encode (ingestion path); no caching."""
+        return np.asarray(self._model_getter().encode(list(texts), show_progress_bar=False))
+
+    def encode_query(self, text: str) -> np.ndarray:
+        """Embedding for one query, served from cache or a shared micro-batch."""
+        key = normalize_query(text)
+        if self.cache is not None:
+            vec = self.cache.get(key)
+            if vec is not None:
+                return vec
+
+        # The normalized form only keys the cache; the model sees the query as typed
+        vec = self._encode_batched(key, text)
+        if self.cache is not None:
+            self.cache.put(key, vec)
+        return vec
+
+    def _encode_batched(self, key: str, text: str) -> np.ndarray:
+        fut: Future = Future()
+        with self._cond:
+            self._pending.append((key, text, fut))
+            leader = not self._leader_active
+            if leader:
+                self._leader_active = True
+
+        if leader:
+            self._drain()
+        return fut.result()
+
+    def _drain(self) -> None:
+        """Leader loop: encode pending queries in batches until the queue is empty."""
+        if self.max_wait_s:
+            time.sleep(self.max_wait_s)  # let concurrent callers join this batch
+
+        while True:
+            with self._cond:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                if not batch:
+                    self._leader_active = False
+                    return
+
+            # Queries sharing a cache key are encoded once (the first spelling wins, as in the cache)
+            unique: Dict[str, str] = {}
+            for k, text, _ in batch:
+                unique.setdefault(k, text)
+            try:
+                vectors = self.encode(list(unique.values()))
+            except Exception as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            by_key = {k: np.asarray(v, dtype=np.float32) for k, v in zip(unique, vectors)}
+            for k, _, fut in batch:
+                fut.set_result(by_key[k])
+
+            with self._cond:
+                self.batches += 1
+                self.batched_queries += len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "batches": self.batches,
+            "avg_batch": round(self.batched_queries / self.batches, 2) if self.batches else 0.0,
+        }
+        if self.cache is not None:
+            out["cache"] = self.cache.stats()
+        return out
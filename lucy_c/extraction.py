@@ -0,0 +1,293 @@
+"""Document text extraction shared by Lucy's memory and the upstream reader library.
+
+Dispatches by format (plain text, PDF, DOCX, HTML, EPUB), extracts big PDFs
+page-parallel across worker processes and caches the extracted text by file
+content hash, so the same book is never parsed twice (even after a rename or
+a touch). DOCX/HTML/EPUB only need the stdlib; PDF needs pypdf.
+
+Errors are reported, not raised: `ExtractionResult.error` carries a short code
+(`pdf_extractor_unavailable`, `pdf_no_text`, `epub_extract_failed:...`).
+"""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import logging
+import multiprocessing
+import os
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+log = logging.getLogger("LucyC.Extraction")
+
+# Bump when an extractor changes its output so cached text is re-extracted
+EXTRACTOR_VERSION = 1
+
+TEXT_SUFFIXES = {".txt", ".md", ".rst", ".csv", ".json", ".yaml", ".yml", ".toml", ".ini", ".log",
+                 ".py", ".js", ".ts", ".sh", ".c", ".h", ".cpp", ".java", ".go", ".rs", ".sql", ".xml"}
+_FORMATS = {".pdf": "pdf", ".docx": "docx", ".epub": "epub", ".html": "html", ".htm": "html", ".xhtml": "html"}
+
+# Below this many pages a process pool costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 24
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    format: str
+    error: str = ""
+    pages: int = 0
+    cached: bool = False
+
+
+def looks_binary(path: Path) -> bool:
+    with path.open("rb") as f:
+        return b"\0" in f.read(8192)
+
+
+def detect_format(path: str | Path) -> str:
+    """text | pdf | docx | html | epub | unknown (unknown suffixes are sniffed for binary content)."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in _FORMATS:
+        return _FORMATS[suffix]
+    if suffix in TEXT_SUFFIXES:
+        return "text"
+    try:
+        return "unknown" if looks_binary(path) else "text"
+    except OSError:
+        return "unknown"
+
+
+def _detect_encoding(path: Path, sniff_bytes: int = 64 * 1024) -> str:
+    """utf-8 unless the head of the file isn't valid utf-8 (then latin-1)."""
+    with path.open("rb") as f:
+        head = f.read(sniff_bytes)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def iter_text_blocks(path: str | Path, block_bytes: int = 1 << 20) -> Iterator[str]:
+    """Decode a text file in fixed-size blocks (never the whole file in memory)."""
+    path = Path(path)
+    encoding = _detect_encoding(path)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    with path.open("rb") as f:
+        while True:
+            raw = f.read(block_bytes)
+            if not raw:
+                break
+            text = decoder.decode(raw)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def file_hash(path: str | Path, block_bytes: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(block_bytes), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# --- HTML / EPUB -----------------------------------------------------------
+
+_BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+               "section", "article", "blockquote", "pre", "title", "td", "th"}
+_SKIP_TAGS = {"script", "style", "head", "noscript", "template", "svg"}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(markup: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(markup)
+    parser.close()
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _extract_html(path: Path, workers: int) -> Tuple[str, int]:
+    return html_to_text("".join(iter_text_blocks(path))), 0
+
+
+def _extract_epub(path: Path, workers: int) -> Tuple[str, int]:
+    """Spine-ordered XHTML documents of the EPUB container."""
+    with zipfile.ZipFile(path) as zf:
+        container = ElementTree.fromstring(zf.read("META-INF/container.xml"))
+        rootfile = next(el.get("full-path") for el in container.iter() if el.tag.endswith("rootfile"))
+        opf = ElementTree.fromstring(zf.read(rootfile))
+        base = posixpath.dirname(rootfile)
+
+        manifest = {el.get("id"): el.get("href") for el in opf.iter() if el.tag.endswith("}item") or el.tag == "item"}
+        spine = [el.get("idref") for el in opf.iter() if el.tag.endswith("itemref") or el.tag == "itemref"]
+
+        parts = []
+        for idref in spine:
+            href = manifest.get(idref)
+            if not href:
+                continue
+            name = posixpath.normpath(posixpath.join(base, href.split("#", 1)[0]))
+            try:
+                markup = zf.read(name).decode("utf-8", errors="replace")
+            except KeyError:
+                continue
+            text = html_to_text(markup)
+            if text:
+                parts.append(text)
+    return "\n\n".join(parts), len(parts)
+
+
+# --- DOCX ------------------------------------------------------------------
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _extract_docx(path: Path, workers: int) -> Tuple[str, int]:
+    """Paragraph text of word/document.xml (tabs and breaks kept as whitespace)."""
+    with zipfile.ZipFile(path) as zf:
+        root = ElementTree.fromstring(zf.read("word/document.xml"))
+    paragraphs = []
+    for p in root.iter(f"{_W}p"):
+        parts = []
+        for el in p.iter():
+            if el.tag == f"{_W}t" and el.text:
+                parts.append(el.text)
+            elif el.tag == f"{_W}tab":
+                parts.append("\t")
+            elif el.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        text = "".join(parts).strip()
+        if text:
+            paragraphs.append(text)
+    return "\n".join(paragraphs), 0
+
+
+# --- PDF -------------------------------------------------------------------
+
+def _pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Worker: text of pages [start, stop). Opens its own reader (readers don't pickle)."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    out = []
+    for i in range(start, stop):
+        try:
+            out.append(reader.pages[i].extract_text() or "")
+        except Exception as e:
+            log.warning("PDF page %d of %s failed: %s", i, path, e)
+            out.append("")
+    return out
+
+
+def _extract_pdf(path: Path, workers: int) -> Tuple[str, int]:
+    from pypdf import PdfReader
+
+    n_pages = len(PdfReader(str(path)).pages)
+    if workers <= 1 or n_pages < PDF_PARALLEL_MIN_PAGES:
+        pages = _pdf_pages(str(path), 0, n_pages)
+    else:
+        # A few ranges per worker so one slow (scanned/complex) range doesn't dominate
+        step = max(1, -(-n_pages // (workers * 4)))
+        ranges = [(i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_pdf_pages, str(path), a, b) for a, b in ranges]
+            pages = [text for fut in futures for text in fut.result()]
+    return "\n\n".join(p.strip() for p in pages if p and p.strip()), n_pages
+
+
+def _extract_plain(path: Path, workers: int) -> Tuple[str, int]:
+    return "".join(iter_text_blocks(path)), 0
+
+
+_EXTRACTORS: Dict[str, Callable[[Path, int], Tuple[str, int]]] = {
+    "text": _extract_plain,
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "html": _extract_html,
+    "epub": _extract_epub,
+}
+
+
+def default_workers() -> int:
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def extract_text(path: str | Path, cache_dir: str | Path | None = None, workers: int | None = None,
+                 fmt: str | None = None) -> ExtractionResult:
+    """Extract the text of a document, reusing a cached extraction of identical content.
+
+    Args:
+        path: Document to extract
+        cache_dir: Where extracted text is cached by content hash (None = no cache)
+        workers: Processes for page-parallel PDF extraction (None = cpu count - 1, 1 = serial)
+        fmt: Force a format instead of detecting it from the file
+    """
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    extractor = _EXTRACTORS.get(fmt)
+    if extractor is None:
+        return ExtractionResult("", fmt, error="unsupported_format")
+
+    cache_path: Optional[Path] = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"{file_hash(path)}.v{EXTRACTOR_VERSION}.txt"
+        if cache_path.exists():
+            return ExtractionResult(cache_path.read_text(encoding="utf-8"), fmt, cached=True)
+
+    if fmt == "pdf":
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return ExtractionResult("", fmt, error="pdf_extractor_unavailable")
+
+    try:
+        text, pages = extractor(path, default_workers() if workers is None else workers)
+    except Exception as e:
+        log.warning("Extraction of %s (%s) failed: %s", path, fmt, e)
+        return ExtractionResult("", fmt, error=f"{fmt}_extract_failed:{e}")
+
+    text = text.strip()
+    if not text:
+        return ExtractionResult("", fmt, error=f"{fmt}_no_text", pages=pages)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(cache_path)
+    return ExtractionResult(text, fmt, pages=pages)
@@ -0,0 +1,206 @@
+"""
+Deterministic fast path for trivial requests.
+
+"¿Qué hora es?" or "abrí la calculadora" used to cost two LLM generations
+(think → [[get_info("time")]] → reflect) for a fixed answer. The IntentRouter
+sits in front of the orchestrator's LLM path: high-confidence intents (a
+compiled regex over the accent-folded utterance, or optionally an embedding
+classifier over example phrases) go straight to a ToolRouter tool and a
+templated reply. Anything else, or a tool that fails, falls through to the
+LLM untouched.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from lucy_c.services.phrase_bank import register_phrases
+from lucy_c.text_normalizer import fold
+from lucy_c.tool_router import ToolResult, ToolRouter
+
+log = logging.getLogger("LucyC.IntentRouter")
+
+# Dots stay (domains); only a trailing one is dropped
+_PUNCT_RE = re.compile(r"[¿?¡!,;\"']+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Accent-folded, lower-cased, punctuation-free utterance ("¿Qué hora es?" -> "que hora es")."""
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", fold(text or ""))).strip().rstrip(".").strip()
+
+
+@dataclass
+class Intent:
+    """A request the router answers without the LLM.
+
+    `patterns` must match the whole normalized utterance; their named groups
+    are available to `args` and `reply`. `verbatim` maps a group to a regex
+    searched in the original utterance instead, for values that normalizing
+    would mangle (a URL's case, its query string). `reply` is a format string
+    over those groups plus `output` (the tool's text) and `value` (the text
+    after the tool's "Label: " prefix). `examples` feed the optional embedding
+    classifier, which is only used for intents whose args don't depend on
+    regex groups.
+    """
+    name: str
+    tool: str
+    patterns: List[str]
+    reply: str
+    args: List[str] = field(default_factory=list)
+    examples: List[str] = field(default_factory=list)
+    verbatim: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._compiled = [re.compile(p) for p in self.patterns]
+        self._verbatim = {group: re.compile(p) for group, p in self.verbatim.items()}
+
+    def match(self, normalized: str, original: str = "") -> Optional[Dict[str, str]]:
+        for rx in self._compiled:
+            m = rx.fullmatch(normalized)
+            if m:
+                groups = {k: v for k, v in m.groupdict().items() if v is not None}
+                for group, vrx in self._verbatim.items():
+                    found = vrx.search(original)
+                    if group in groups and found:
+                        groups[group] = found.group(0)
+                return groups
+        return None
+
+    @property
+    def static_args(self) -> bool:
+        return not any("{" in a for a in self.args)
+
+
+_OPEN = r"(?:abri|abrime|abre|abrir|lanza|ejecuta|inicia)"
+_PLEASE = r"(?: (?:por favor|porfa))?"
+# A domain plus optional path/query, as typed; trailing sentence punctuation isn't part of it
+_URL = r"[\w-]+(?:\.[\w-]+)*\.[^\W\d_]{2,}(?:/[^\s\"']*[^\s\"'.,;!?¡¿])?"
+
+DEFAULT_INTENTS: List[Intent] = [
+    Intent("time", "get_info", [rf"(?:me decis )?que hora (?:es|son)(?: ahora)?{_PLEASE}",
+                                rf"(?:decime|dame) la hora{_PLEASE}"],
+           reply="Son las {value:.5}.", args=["time"],
+           examples=["qué hora es", "decime la hora", "hora actual"]),
+    Intent("date", "get_info", [rf"que (?:fecha|dia) es(?: hoy)?{_PLEASE}",
+                                rf"(?:decime|dame) la fecha(?: de hoy)?{_PLEASE}"],
+           reply="Hoy es {value}.", args=["date"],
+           examples=["qué fecha es hoy", "qué día es hoy", "fecha de hoy"]),
+    Intent("os", "get_info", [r"que sistema(?: operativo)? (?:uso|tengo|es este|estoy usando)"],
+           reply="Estás en {value}.", args=["os"],
+           examples=["qué sistema operativo uso"]),
+    Intent("open_calculator", "os_run", [rf"{_OPEN} (?:la )?calculadora{_PLEASE}"],
+           reply="Listo, abrí la calculadora.", args=["gnome-calculator"],
+           examples=["abrí la calculadora", "abrime la calculadora"]),
+    # Normalizing turns a query string's "?" into a space; the URL itself is taken verbatim
+    Intent("open_url", "open_url", [rf"{_OPEN} (?:la pagina |el sitio |la web )?(?P<url>[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{{2,}}(?:/\S*(?: \S+=\S*)?)?){_PLEASE}"],
+           reply="Abriendo {url} en el navegador.", args=["{url}"], verbatim={"url": _URL}),
+]
+
+# Untemplated replies are always the same audio
+register_phrases(*(i.reply for i in DEFAULT_INTENTS if "{" not in i.reply), source="intents")
+
+
+class IntentRouter:
+    """Answers high-confidence trivial intents through the ToolRouter, without an LLM call.
+
+    Args:
+        tool_router: Where intent tools are registered (the same router the LLM uses)
+        intents: Intent table (defaults to DEFAULT_INTENTS)
+        enabled: Kill switch; when False every utterance goes to the LLM
+        disabled: Intent names to ignore
+        encode: Optional `encode(texts) -> normalized vectors`; enables the embedding classifier
+        min_similarity: Cosine an utterance needs against an intent example to count as a match
+        max_chars: Longer utterances are never fast-pathed (they're rarely trivial)
+    """
+
+    def __init__(self, tool_router: ToolRouter, intents: List[Intent] | None = None, enabled: bool = True,
+                 disabled: List[str] | None = None, encode: Callable[[List[str]], Any] | None = None,
+                 min_similarity: float = 0.85, max_chars: int = 80):
+        self.tool_router = tool_router
+        self.enabled = enabled
+        disabled = set(disabled or [])
+        self.intents = [i for i in (intents if intents is not None else DEFAULT_INTENTS) if i.name not in disabled]
+        self.encode = encode
+        self.min_similarity = float(min_similarity)
+        self.max_chars = int(max_chars)
+        self._lock = threading.Lock()
+        self._example_vecs: Optional[np.ndarray] = None
+        self._example_owner: List[Intent] = []
+        self.hits: Dict[str, int] = {i.name: 0 for i in self.intents}
+        self.fallthrough = {"no_match": 0, "tool_failed": 0}
+
+    def _classify(self, text: str) -> Optional[Intent]:
+        if self._example_vecs is None:
+            owners = [i for i in self.intents if i.static_args for _ in i.examples]
+            if not owners:
+                self.encode = None
+                return None
+            examples = [e for i in self.intents if i.static_args for e in i.examples]
+            self._example_vecs = np.asarray(self.encode(examples), dtype=np.float32)
+            self._example_owner = owners
+        q = np.asarray(self.encode([text]), dtype=np.float32)[0]
+        sims = self._example_vecs @ q
+        best = int(np.argmax(sims))
+        return self._example_owner[best] if sims[best] >= self.min_similarity else None
+
+    def match(self, text: str) -> Optional[tuple[Intent, Dict[str, str], str]]:
+        """(intent, regex groups, "regex" | "embedding") for a high-confidence match, else None."""
+        if not self.enabled or not text or len(text) > self.max_chars:
+            return None
+        normalized = normalize(text)
+        for intent in self.intents:
+            groups = intent.match(normalized, text)
+            if groups is not None:
+                return intent, groups, "regex"
+        if self.encode is not None:
+            try:
+                intent = self._classify(text)
+            except Exception as e:
+                log.warning("Intent classifier failed, disabling it: %s", e)
+                self.encode = None
+                intent = None
+            if intent is not None:
+                return intent, {}, "embedding"
+        return None
+
+    def handle(self, text: str, context: Dict[str, Any] | None = None) -> Optional[str]:
+        """The templated reply for a fast-pathed utterance, or None to go through the LLM."""
+        found = self.match(text)
+        if found is None:
+            if self.enabled:
+                with self._lock:
+                    self.fallthrough["no_match"] += 1
+            return None
+        intent, groups, via = found
+        if intent.tool not in self.tool_router.tools:
+            return None
+        args = [a.format(**groups) for a in intent.args]
+        try:
+            result: ToolResult = self.tool_router.call(intent.tool, args, context or {})
+        except Exception as e:
+            log.warning("Fast-path tool %s failed: %s", intent.tool, e)
+            result = ToolResult(False, str(e))
+        if not result.success:
+            with self._lock:
+                self.fallthrough["tool_failed"] += 1
+            return None
+        value = result.output.split(": ", 1)[1] if ": " in result.output else result.output
+        with self._lock:
+            self.hits[intent.name] += 1
+        log.info("Fast path: %s via %s (%s)", intent.name, via, intent.tool)
+        return intent.reply.format(output=result.output, value=value, **groups)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "classifier": self.encode is not None,
+                "hits": dict(self.hits),
+                "fallthrough": dict(self.fallthrough),
+            }
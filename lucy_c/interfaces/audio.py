@@ -20,6 +20,14 @@ class TTSProvider(ABC):
         """Convert text to audio."""
         pass
 
+    def pin(self, text: str) -> bool:
+        """Synthesize `text` and keep it cached against eviction (phrase bank).
+
+        Providers without a cache just synthesize it and return False.
+        """
+        self.synthesize(text)
+        return False
+
 class ASRProvider(ABC):
     """Abstract contract for Automatic Speech Recognition providers."""
     
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+
+class EmbeddingBackend(ABC):
+    """Abstract contract for sentence-embedding backends.
+
+    `space` names the vector space: backends sharing a space (same model and
+    pooling, e.g. PyTorch and ONNX runtimes of all-MiniLM-L6-v2) can read each
+    other's stored vectors; a different space means the collection must be
+    re-embedded.
+    """
+
+    name: str = "unknown"
+    space: str = "unknown"
+    last_used: float = 0.0
+
+    @abstractmethod
+    def encode(self, texts: Sequence[str], show_progress_bar: bool = False) -> np.ndarray:
+        """L2-normalized float32 embeddings, one row per text."""
+        pass
+
+    def is_loaded(self) -> bool:
+        return True
+
+    def unload(self) -> None:
+        pass
+
+    def resident_bytes(self) -> int:
+        return 0
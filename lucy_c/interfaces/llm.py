@@ -18,7 +18,10 @@ class LLMProvider(ABC):
 
     @abstractmethod
     def chat(self, messages: List, **kwargs) -> LLMResponse:
-        """Chat-based generation."""
+        """Chat-based generation.
+
+        Providers that can abort a request honor `cancel` (a CancelToken) and raise Cancelled.
+        """
         pass
     
     @abstractmethod
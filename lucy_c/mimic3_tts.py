@@ -9,15 +9,15 @@ import soundfile as sf
 
 from lucy_c.config import TTSConfig
 from lucy_c.interfaces.audio import TTSProvider, TTSResult
+from lucy_c.tts_cache import TTSCache
 
 
 class Mimic3TTS(TTSProvider):
     def __init__(self, cfg: TTSConfig):
         self.cfg = cfg
         self.log = logging.getLogger("LucyC.Mimic3")
-        self._cache: dict[str, tuple[TTSResult, float]] = {}  # key -> (result, last_access_time)
-        self._cache_hits = 0
-        self._cache_misses = 0
+        # Avoids re-running mimic3 for identical text; the phrase bank pins its entries
+        self.cache = TTSCache(max_items=100, log=self.log)
         self._enabled = self._check_executable()
 
     def _check_executable(self) -> bool:
@@ -39,25 +39,19 @@ class Mimic3TTS(TTSProvider):
         self.log.warning("mimic3 executable not found in PATH or .venv. Voice output will be disabled.")
         return False
 
+    def warmup(self) -> None:
+        """Run mimic3 once so the voice files are in the page cache before the first reply."""
+        if self._enabled:
+            self.synthesize("Hola.")
+
     def synthesize(self, text: str) -> TTSResult:
         if not self._enabled:
             raise RuntimeError("mimic3 not found")
-        import time
-        
-        # Simple cache to avoid re-running mimic3 for identical text
-        cache_key = f"{self.cfg.voice}:{text}"
-        current_time = time.time()
-        
-        if cache_key in self._cache:
-            result, _ = self._cache[cache_key]
-            self._cache[cache_key] = (result, current_time)  # Update access time
-            self._cache_hits += 1
-            hit_rate = self._cache_hits / (self._cache_hits + self._cache_misses) * 100
-            self.log.debug("TTS Cache HIT (%.1f%% hit rate): %s", hit_rate, text[:30])
-            return result
+        cache_key = self._cache_key(text)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        self._cache_misses += 1
-        
         cmd = [self._exe_path, "--voice", self.cfg.voice, "--stdout"]
         
         # Add speed/length_scale if present
@@ -81,16 +75,13 @@ class Mimic3TTS(TTSProvider):
         
         res = TTSResult(audio_f32=np.asarray(data, dtype=np.float32).reshape(-1), sample_rate=sr)
         
-        # LRU eviction: Keep cache under limit
-        MAX_CACHE_SIZE = 100
-        if len(self._cache) >= MAX_CACHE_SIZE:
-            # Evict oldest 30% by access time
-            items = sorted(self._cache.items(), key=lambda x: x[1][1])
-            evict_count = int(MAX_CACHE_SIZE * 0.3)
-            for key, _ in items[:evict_count]:
-                del self._cache[key]
-            self.log.info("TTS cache evicted %d items (LRU)", evict_count)
-        
-        self._cache[cache_key] = (res, current_time)
-        
+        self.cache.put(cache_key, res)
         return res
+
+    def _cache_key(self, text: str) -> str:
+        return f"{self.cfg.voice}:{text}"
+
+    def pin(self, text: str) -> bool:
+        """Synthesize `text` (if needed) and keep it in the cache for good."""
+        self.synthesize(text)
+        return self.cache.pin(self._cache_key(text))
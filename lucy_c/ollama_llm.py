@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import List, Optional, Any
+from typing import Callable, List, Optional, Any
 
 import requests
 
@@ -20,6 +21,25 @@ class OllamaLLM(LLMProvider):
     def __init__(self, cfg: OllamaConfig):
         self.cfg = cfg
         self.log = logging.getLogger("LucyC.Ollama")
+        # Called with (model, usage) after every generation (residency tracking)
+        self.usage_listeners: List[Callable[[str, dict], None]] = []
+
+    def keep_alive_for(self, model: str) -> str:
+        return (self.cfg.keep_alive_models or {}).get(model, self.cfg.keep_alive)
+
+    def _notify_usage(self, model: str, usage: dict) -> None:
+        for listener in self.usage_listeners:
+            try:
+                listener(model, usage)
+            except Exception as e:
+                self.log.debug("Usage listener failed: %s", e)
+
+    def list_running(self) -> List[dict]:
+        """Models currently loaded by Ollama (/api/ps): name, size, size_vram, expires_at."""
+        url = f"{self.cfg.host.rstrip('/')}/api/ps"
+        r = requests.get(url, timeout=5.0)
+        r.raise_for_status()
+        return (r.json() or {}).get("models", []) or []
 
     def list_models(self) -> List[str]:
         """List available local Ollama models via /api/tags."""
@@ -53,23 +73,68 @@ class OllamaLLM(LLMProvider):
         url = f"{self.cfg.host.rstrip('/')}/api/generate"
         target_model = kwargs.get("model") or self.cfg.model
         payload = {"model": target_model, "prompt": prompt, "stream": False}
+        if self.keep_alive_for(target_model):
+            payload["keep_alive"] = self.keep_alive_for(target_model)
         try:
             r = requests.post(url, json=payload, timeout=120.0)
             r.raise_for_status()
             data = r.json()
             text = (data.get("response") or "").strip()
-            return LLMResponse(text=text, raw_response=data)
+            usage = self._usage(data)
+            self._notify_usage(target_model, usage)
+            return LLMResponse(text=text, raw_response=data, usage=usage)
         except Exception as e:
             self.log.error("Ollama generate failed: %s", e)
             raise OllamaChatError(f"Error generando con Ollama: {e}", e)
 
+    def warmup(self, model: str | None = None, num_ctx: int | None = None) -> None:
+        """Send a one-token prompt so Ollama loads the model weights before the first turn.
+
+        Pass the num_ctx real calls will use: a different context size makes Ollama reload the model.
+        """
+        url = f"{self.cfg.host.rstrip('/')}/api/generate"
+        target_model = model or self.cfg.model
+        options = {"num_predict": 1}
+        if num_ctx:
+            options["num_ctx"] = num_ctx
+        payload = {"model": target_model, "prompt": "hola", "stream": False, "options": options}
+        if self.keep_alive_for(target_model):
+            payload["keep_alive"] = self.keep_alive_for(target_model)
+        try:
+            r = requests.post(url, json=payload, timeout=300.0)
+            r.raise_for_status()
+            self._notify_usage(target_model, self._usage(r.json() or {}))
+        except Exception as e:
+            self.log.error("Ollama warm-up failed for %s: %s", target_model, e)
+            raise OllamaChatError(f"No pude precargar el modelo {target_model}: {e}", e)
+
+    @staticmethod
+    def _usage(data: dict) -> dict:
+        """Token counts and timings Ollama reports with a finished generation (durations in ms)."""
+        usage = {k: data[k] for k in ("prompt_eval_count", "eval_count", "done_reason") if k in data}
+        for key in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration"):
+            if key in data:
+                usage[f"{key}_ms"] = round(data[key] / 1e6, 1)
+        return usage
+
     def chat(self, messages: List[dict], **kwargs) -> LLMResponse:
-        """Multi-turn chat completion using /api/chat."""
+        """Multi-turn chat completion using /api/chat.
+
+        kwargs: model, enable_tools, options (Ollama generation options:
+        num_ctx, num_predict, temperature, stop...), cancel (a CancelToken: the
+        reply is streamed and the connection dropped as soon as the turn is cancelled).
+        """
         url = f"{self.cfg.host.rstrip('/')}/api/chat"
         target_model = kwargs.get("model") or self.cfg.model
         enable_tools = kwargs.get("enable_tools", False)
+        cancel = kwargs.get("cancel")
         
         payload = {"model": target_model, "messages": messages, "stream": False}
+        if self.keep_alive_for(target_model):
+            # Keep both tiers of the cascade resident instead of Ollama's 5-minute default
+            payload["keep_alive"] = self.keep_alive_for(target_model)
+        if kwargs.get("options"):
+            payload["options"] = kwargs["options"]
         
         # Enable native tool calling if requested
         if enable_tools:
@@ -81,9 +146,12 @@ class OllamaLLM(LLMProvider):
                 self.log.warning("ollama_tools module not found, tools disabled")
         
         try:
-            r = requests.post(url, json=payload, timeout=120.0)
-            r.raise_for_status()
-            data = r.json()
+            if cancel is not None:
+                data = self._chat_streamed(url, payload, cancel)
+            else:
+                r = requests.post(url, json=payload, timeout=120.0)
+                r.raise_for_status()
+                data = r.json()
             # Response in data["message"]["content"] for /api/chat
             msg = data.get("message", {})
             content = msg.get("content") or ""
@@ -115,7 +183,47 @@ class OllamaLLM(LLMProvider):
                     content = f"{content}\n\n{bridge_text}" if content else bridge_text
             
             final_content = content.strip()
-            return LLMResponse(text=final_content, raw_response=data)
+            usage = self._usage(data)
+            self._notify_usage(target_model, usage)
+            return LLMResponse(text=final_content, raw_response=data, usage=usage)
         except Exception as e:
+            if cancel is not None:
+                cancel.check()  # the read failed because the turn closed the connection
             self.log.error("Ollama chat failed: %s", e)
             raise OllamaChatError(f"No pude conectar con Ollama o el modelo falló: {e}", e)
+
+    def _chat_streamed(self, url: str, payload: dict, cancel) -> dict:
+        """/api/chat with stream=True, aborted at the HTTP level when `cancel` fires.
+
+        Closing the connection makes Ollama stop generating. Returns the same
+        shape as a non-streamed reply (message + the final chunk's counters).
+        """
+        r = requests.post(url, json={**payload, "stream": True}, stream=True, timeout=120.0)
+        unregister = cancel.on_cancel(r.close)
+        content: List[str] = []
+        tool_calls: List[dict] = []
+        data: dict = {}
+        try:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                cancel.check()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                msg = chunk.get("message") or {}
+                content.append(msg.get("content") or "")
+                tool_calls.extend(msg.get("tool_calls") or [])
+                if chunk.get("done"):
+                    data = chunk
+                    break
+            cancel.check()
+        except BaseException:
+            if cancel.cancelled:
+                self.log.info("Ollama generation aborted after %d chunks (%s)", len(content), cancel.reason)
+            raise
+        finally:
+            unregister()
+            r.close()
+        return {**data, "message": {"role": "assistant", "content": "".join(content), "tool_calls": tool_calls}}
@@ -52,6 +52,27 @@ OLLAMA_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "memorize_dir",
+            "description": "Guarda en la memoria permanente (RAG) todos los archivos de texto de una carpeta.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "dir_path": {
+                        "type": "string",
+                        "description": "Ruta absoluta de la carpeta a memorizar"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Patrón glob opcional (ej: **/*.md)"
+                    }
+                },
+                "required": ["dir_path"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
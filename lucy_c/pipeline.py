@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import re
+import threading
 import time
 import traceback
 import platform
@@ -20,6 +22,7 @@ try:
 except ImportError:
     XTTS_AVAILABLE = False
 from lucy_c.ollama_llm import OllamaLLM
+from lucy_c.services.model_residency import ModelResidency
 from lucy_c.history_store import HistoryStore, default_history_dir
 from lucy_c.facts_store import FactsStore, default_facts_dir
 from lucy_c.text_normalizer import normalize_for_tts
@@ -35,6 +38,7 @@ from lucy_c.tools.cognitive_tools import create_cognitive_tools
 from lucy_c.rag_engine import MemoryEngine
 from lucy_c.tools.knowledge_tools import create_knowledge_tools
 from lucy_c.tools.core_tools import create_core_tools
+from lucy_c.services.phrase_bank import PhraseBank, register_phrases
 
 
 @dataclass
@@ -53,6 +57,15 @@ DEFAULT_SYSTEM_PROMPT = SYSTEM_PROMPT
 MAX_CONTEXT_CHARS = 4000  # Reserve space for system prompt + current message
 LOCAL_ONLY = os.environ.get("LUCY_LOCAL_ONLY", "1") == "1"
 
+# Fixed fallbacks; the error ID is appended for the text reply but never spoken
+OLLAMA_UNREACHABLE = "No pude conectar con Ollama. ¿Podrías fijarte si el servidor está corriendo en 127.0.0.1:11434?"
+CONNECTION_PROBLEM = "Perdón, che, parece que tengo un problema de conexión con mi cerebro local. ¿Te fijás si Ollama está corriendo? Intentá de nuevo en un ratito."
+BLANK_REPLY = "Che, mi cerebro se quedó en blanco. ¿Podrías preguntarme de otra forma o repetirme lo último?"
+GENERIC_FAILURE = "Ups, algo no salió bien procesando eso. ¿Probamos de nuevo con otra frase?"
+register_phrases("Decime algo.", "No escuché nada.", OLLAMA_UNREACHABLE, CONNECTION_PROBLEM, BLANK_REPLY,
+                 GENERIC_FAILURE, source="moltbot")
+_ERROR_ID = re.compile(r"\s*\(ID: [0-9a-f]{8}\)$")
+
 
 class Moltbot:
     def __init__(self, cfg: LucyConfig, history: HistoryStore | None = None, facts: FactsStore | None = None, status_callback: Callable[[str, str], None] | None = None):
@@ -67,6 +80,9 @@ class Moltbot:
 
         self.asr = FasterWhisperASR(cfg.asr)
         self.ollama = OllamaLLM(cfg.ollama)
+        # Preloads the brain as soon as it changes and warns when sessions thrash VRAM
+        self.residency = ModelResidency(self.ollama, max_loaded_models=cfg.ollama.max_loaded_models,
+                                        reload_threshold_ms=cfg.ollama.reload_threshold_ms)
         
         # Model Fallback: Ensure the configured model exists in Ollama
         if LOCAL_ONLY:
@@ -76,6 +92,11 @@ class Moltbot:
         self.clawdbot = ClawdbotLLM(cfg.clawdbot)
 
         self.tts = self._initialize_tts(cfg)
+        self.phrase_bank = None
+        if cfg.tts.phrase_bank:
+            # Pin the fixed replies in the background; until then they're synthesized on demand
+            self.phrase_bank = PhraseBank(lambda text: self.tts.pin(normalize_for_tts(text)), extra=cfg.tts.phrases)
+            threading.Thread(target=self._build_phrase_bank, name="phrase-bank", daemon=True).start()
         self.history = history or HistoryStore(default_history_dir())
         self.facts = facts or FactsStore(default_facts_dir())
         self.status_callback = status_callback
@@ -85,7 +106,7 @@ class Moltbot:
         
         # Initialize RAG Memory Engine
         try:
-            self.memory = MemoryEngine(persist_directory="data/chroma_db")
+            self.memory = MemoryEngine(cfg=cfg.memory)
             self.log.info("RAG Memory Engine initialized.")
         except Exception as e:
             self.log.warning("Failed to initialize RAG memory: %s. Memory features disabled.", e)
@@ -113,6 +134,12 @@ class Moltbot:
 
         self._register_default_tools()
     
+    def _build_phrase_bank(self):
+        try:
+            self.phrase_bank.build()
+        except Exception as e:
+            self.log.warning("Phrase bank build failed: %s", e)
+
     def _initialize_tts(self, cfg):
         """Initialize TTS service with fallback."""
         provider = getattr(cfg.tts, 'provider', 'mimic3')
@@ -202,8 +229,9 @@ class Moltbot:
         # Knowledge/Memory tools (require RAG memory engine)
         if self.memory:
             knowledge_tools = create_knowledge_tools(self.memory)
-            self.tool_router.register_tool("memorize_file", knowledge_tools["memorize_file"])
-            self.tool_router.register_tool("recall", knowledge_tools["recall"])
+            self.tool_router.register_tool("memorize_file", knowledge_tools["memorize_file"], blocking=True)
+            self.tool_router.register_tool("memorize_dir", knowledge_tools["memorize_dir"], blocking=True)
+            self.tool_router.register_tool("recall", knowledge_tools["recall"], blocking=True)
             self.tool_router.register_tool("memory_stats", knowledge_tools["memory_stats"])
             
         # Vision UI tools (OCR-based intelligent interaction)
@@ -235,6 +263,7 @@ class Moltbot:
                 "remember": "Guardando en memoria",
                 "forget": "Olvidando",
                 "memorize_file": "Guardando en memoria",
+                "memorize_dir": "Guardando carpeta en memoria",
                 "recall": "Buscando en memoria",
                 "search_web": "Buscando en internet",
                 "web_search": "Buscando en internet",
@@ -261,28 +290,42 @@ class Moltbot:
             return text + f"\n\n[⚠️ ERROR CORE]: Error al ejecutar herramientas: {e}"
 
     def switch_brain(self, model_name: str, provider: str = "ollama", session_user: str | None = None):
-        """Perform a formal brain exchange. If session_user is provided, persist the choice."""
-        old_model = self.cfg.ollama.model
-        old_provider = self.cfg.llm.provider
-        
+        """Perform a formal brain exchange.
+
+        With session_user the choice is persisted for that session only; without it,
+        the default brain (shared config) changes.
+        """
         provider = provider.lower()
-        self.cfg.llm.provider = provider
         if provider == "ollama":
-            self.cfg.ollama.model = model_name
-            self.ollama.cfg.model = model_name
+            # Start loading now so the next turn doesn't pay the full model load
+            self.residency.assign(session_user or "lucy-c:anonymous", model_name)
         
         if self.facts and session_user:
             self.facts.set_fact(session_user, "selected_model", model_name)
             self.facts.set_fact(session_user, "selected_provider", provider)
             self.log.info("Persisted brain choice for %s: %s (%s)", session_user, model_name, provider)
+            return
+        
+        old_model = self.cfg.ollama.model
+        old_provider = self.cfg.llm.provider
+        self.cfg.llm.provider = provider
+        if provider == "ollama":
+            self.cfg.ollama.model = model_name
+            self.ollama.cfg.model = model_name
         
         self.log.info("BRAIN EXCHANGE: %s (%s) -> %s (%s)", 
                      old_provider, old_model, provider, model_name)
 
-    def _apply_persisted_brain(self, session_user: str | None = None):
-        """Load and apply persisted brain choice from FactsStore."""
+    def _apply_persisted_brain(self, session_user: str | None = None) -> tuple[str, str]:
+        """Resolve the session's persisted brain choice from FactsStore.
+
+        Returns (provider, model) for this turn only: concurrent sessions with
+        different brains must not race on the shared config.
+        """
+        provider = (self.cfg.llm.provider or "ollama").lower()
+        model = self.cfg.ollama.model
         if not self.facts or not session_user:
-            return
+            return provider, model
         
         facts = self.facts.get_facts(session_user)
         persisted_model = facts.get("selected_model")
@@ -297,14 +340,15 @@ class Moltbot:
             persisted_provider = "ollama"
             persisted_model = self.cfg.ollama.model
 
-        if persisted_model and (persisted_model != self.cfg.ollama.model or persisted_provider != self.cfg.llm.provider):
-            self.log.info("Applying persisted brain for %s: %s (%s)", 
-                         session_user, persisted_model, persisted_provider)
-            # Use internal direct update to avoid re-persisting the same data
-            self.cfg.llm.provider = persisted_provider
-            if persisted_provider == "ollama":
-                self.cfg.ollama.model = persisted_model
-                self.ollama.cfg.model = persisted_model
+        if persisted_model:
+            provider, model = persisted_provider or "ollama", persisted_model
+            if model != self.cfg.ollama.model:
+                self.log.info("Using persisted brain for %s: %s (%s)", session_user, model, provider)
+        
+        if provider == "ollama":
+            # Keeps the session's model in the active set (thrash detection) and loads it if it isn't yet
+            self.residency.assign(session_user, model, preload=model != self.cfg.ollama.model)
+        return provider, model
 
 
     def _get_chat_messages(self, text: str, session_user: str | None = None) -> list[dict]:
@@ -388,13 +432,10 @@ class Moltbot:
         
         # Phase 1: Force ollama for now, though we keep the config flexibility
         session_user = session_user or "lucy-c:anonymous"
-        self._apply_persisted_brain(session_user)
-        
-        provider = (self.cfg.llm.provider or "ollama").lower()
+        provider, model = self._apply_persisted_brain(session_user)
         if LOCAL_ONLY and provider not in ["ollama", "clawdbot"]:
             provider = "ollama"
             
-        model = self.cfg.ollama.model
         messages = self._get_chat_messages(text, session_user=session_user)
         
         self.log.info("Moltbot processing prompt using %s (%s)", provider, model)
@@ -476,17 +517,17 @@ class Moltbot:
                 if is_ollama_error:
                     # Provide clearer feedback for Ollama specific issues
                     if "connect" in err_str or "refused" in err_str:
-                         return f"No pude conectar con Ollama. ¿Podrías fijarte si el servidor está corriendo en 127.0.0.1:11434? (ID: {error_id})"
+                         return f"{OLLAMA_UNREACHABLE} (ID: {error_id})"
                     if "not found" in err_str or "model" in err_str:
                          return f"Parece que el modelo '{model}' no está instalado o no se encuentra. ¿Probamos con otro? (ID: {error_id})"
                     return f"Tuve un problema técnico con mi cerebro local: {e} (ID: {error_id})"
 
                 if "connection" in err_str or "timeout" in err_str or "unreachable" in err_str:
-                    return f"Perdón, che, parece que tengo un problema de conexión con mi cerebro local. ¿Te fijás si Ollama está corriendo? Intentá de nuevo en un ratito. (ID: {error_id})"
+                    return f"{CONNECTION_PROBLEM} (ID: {error_id})"
                 elif "venerable" in err_str or "empty" in err_str or "invalida" in err_str or "inválida" in err_str:
-                    return f"Che, mi cerebro se quedó en blanco. ¿Podrías preguntarme de otra forma o repetirme lo último? (ID: {error_id})"
+                    return f"{BLANK_REPLY} (ID: {error_id})"
                 else:
-                    return f"Ups, algo no salió bien procesando eso. ¿Probamos de nuevo con otra frase? (ID: {error_id})"
+                    return f"{GENERIC_FAILURE} (ID: {error_id})"
 
     def _validate_model_fallback(self):
         """If configured model missing, fallback to first available."""
@@ -508,7 +549,8 @@ class Moltbot:
     def _tts_bytes(self, reply_text: str) -> tuple[bytes, int]:
         """Return (wav_bytes, sample_rate). Empty wav if TTS fails."""
         try:
-            tts_text = normalize_for_tts(reply_text)
+            # Without the error ID the fallbacks are fixed phrases, pinned in the TTS cache
+            tts_text = normalize_for_tts(_ERROR_ID.sub("", reply_text))
             tts_res = self.tts.synthesize(tts_text)
             from lucy_c.audio_codec import encode_wav_bytes
 
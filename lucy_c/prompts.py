@@ -43,7 +43,8 @@ POLICIES = """
 9. **Delegación Cognitiva (SOTA)**:
    - `[[ask_sota(prompt)]]`: Consulta a un modelo de lenguaje de última generación (SOTA) en la nube para tareas que exceden tus capacidades locales. Usá esto cuando necesités razonamiento extremadamente complejo, conocimiento actual del mundo (2024-2026), o capacidades creativas avanzadas.
 10. **Memoria Semántica (RAG)**:
-   - `[[memorize_file(file_path)]]`: Lee y guarda un archivo en tu memoria permanente para consultas futuras. Usá esto cuando el usuario te pida leer documentación, código, o cualquier archivo de texto.
+   - `[[memorize_file(file_path)]]`: Lee y guarda un archivo en tu memoria permanente para consultas futuras. Usá esto cuando el usuario te pida leer documentación, código, o cualquier archivo de texto, PDF, DOCX, HTML o EPUB.
+   - `[[memorize_dir(dir_path, pattern)]]`: Guarda en tu memoria todos los documentos de una carpeta (pattern es opcional, ej: "**/*.md").
    - `[[recall(query)]]`: Busca en tu memoria semántica información relevante. Usá esto cuando necesités recordar algo de archivos que leíste anteriormente, incluso si fue en sesiones pasadas.
 
 **IMPORTANTE**: 
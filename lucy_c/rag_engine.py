@@ -1,205 +1,1221 @@
-"""RAG Memory Engine for Lucy using ChromaDB and sentence-transformers."""
+"""RAG Memory Engine for Lucy: pluggable vector store (Chroma or a local ANN index) and embedding backend."""
+import json
 import logging
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
 import hashlib
 
+import numpy as np
+
+from lucy_c.bm25_index import BM25Index
+from lucy_c.config import MemoryConfig
+from lucy_c.embedding_backends import create_embedding_backend
+from lucy_c.embedding_service import EmbeddingCache, EmbeddingService
+from lucy_c.extraction import detect_format, extract_text, iter_text_blocks
+
 log = logging.getLogger("LucyC.RAG")
 
-class MemoryEngine:
-    """Semantic memory engine using ChromaDB for document storage and retrieval."""
+COLLECTION_NAME = "lucy_memory"
+# Collections created before embedding_space was recorded used this model
+LEGACY_EMBEDDING_SPACE = "all-MiniLM-L6-v2"
+
+# Sentence or line ends: the only places a chunk may be cut.
+_UNIT_BOUNDARY = re.compile(r"[.!?]\s+|\n+")
+
+
+@dataclass
+class IngestStats:
+    total: int
+    added: int
+    removed: int
+    unchanged: int
+
+
+@dataclass
+class DirIngestStats:
+    files: int = 0
+    synced: int = 0
+    failed: List[str] = field(default_factory=list)
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+def _slices(unit: str, max_len: int) -> Iterator[str]:
+    # Minified code or text without punctuation: fixed slices relative to the unit
+    for i in range(0, len(unit), max_len):
+        yield unit[i:i + max_len]
+
+
+def _split_units(text: str, max_len: int) -> List[str]:
+    """Split text at sentence/line ends; hard-split units longer than max_len."""
+    return list(iter_units([text], max_len))
+
+
+def iter_units(blocks: Iterable[str], max_len: int) -> Iterator[str]:
+    """Streaming `_split_units`: same units for any split of the text into blocks.
     
-    def __init__(self, persist_directory: str = "data/chroma_db"):
-        """Initialize the memory engine.
-        
-        Args:
-            persist_directory: Path where ChromaDB will persist data
-        """
-        self.persist_dir = Path(persist_directory)
-        self.persist_dir.mkdir(parents=True, exist_ok=True)
+    A boundary that touches the end of the buffered text may still grow (or a
+    trailing '.' may become one) with the next block, so it is held back.
+    Text without boundaries is flushed in whole max_len slices to bound memory.
+    """
+    carry = ""
+    for block in blocks:
+        carry += block
+        start = 0
+        pending = False
+        for m in _UNIT_BOUNDARY.finditer(carry):
+            if m.end() == len(carry):
+                pending = True
+                break
+            yield from _slices(carry[start:m.end()], max_len)
+            start = m.end()
+        carry = carry[start:]
+        if not pending and len(carry) > max_len:
+            # Keep the last char: a '.' there could start a boundary in the next block
+            cut = ((len(carry) - 1) // max_len) * max_len
+            yield from _slices(carry[:cut], max_len)
+            carry = carry[cut:]
+    
+    start = 0
+    for m in _UNIT_BOUNDARY.finditer(carry):
+        yield from _slices(carry[start:m.end()], max_len)
+        start = m.end()
+    if start < len(carry):
+        yield from _slices(carry[start:], max_len)
+
+
+def iter_chunks(blocks: Iterable[str], chunk_size: int = 500, overlap: int = 50) -> Iterator[str]:
+    """Streaming `chunk_text` over blocks of text (identical output, bounded memory)."""
+    min_size = chunk_size // 2
+    prev = ""
+    
+    def emit(chunk: str) -> Iterator[str]:
+        nonlocal prev
+        body = chunk.strip()
+        if not body:
+            return
+        tail = prev[-overlap:] if overlap and prev else ""
+        yield (tail + " " + body).strip() if tail else body
+        prev = body
+    
+    buf = ""
+    for unit in iter_units(blocks, chunk_size):
+        if buf and len(buf) + len(unit) > chunk_size:
+            yield from emit(buf)
+            buf = ""
+        buf += unit
+        if len(buf) >= min_size and zlib.crc32(unit.strip().encode("utf-8")) % 6 == 0:
+            yield from emit(buf)
+            buf = ""
+    if buf:
+        yield from emit(buf)
+
+
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
+    """Split text into content-defined chunks of at most ~chunk_size characters.
+    
+    Cut points are chosen by the content of the sentence that ends a chunk
+    (a crc32 of it), not by absolute offsets. An edit therefore only changes
+    the chunks around it: after the edited region the boundaries fall on the
+    same sentences as before, so the chunk hashes match and nothing downstream
+    needs re-embedding.
+    
+    Args:
+        text: Text to chunk
+        chunk_size: Upper bound for each chunk (in characters, before overlap)
+        overlap: Characters of the previous chunk prepended for context
         
+    Returns:
+        List of text chunks
+    """
+    return list(iter_chunks([text], chunk_size=chunk_size, overlap=overlap))
+
+
+def iter_chunk_ids(source_id: str, chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """(id, chunk) pairs with content-hash IDs, unique within a source even for repeated chunks."""
+    seen: Dict[str, int] = {}
+    for chunk in chunks:
+        digest = hashlib.sha1(chunk.encode("utf-8")).hexdigest()[:16]
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        yield (f"{source_id}_{digest}" if n == 0 else f"{source_id}_{digest}-{n}"), chunk
+
+
+def chunk_ids(source_id: str, chunks: List[str]) -> List[str]:
+    """Content-hash IDs, unique within a source even for repeated chunks."""
+    return [cid for cid, _ in iter_chunk_ids(source_id, chunks)]
+
+
+def _iter_file_blocks(path: Path, block_bytes: int, cache_dir: Path, pdf_workers: int | None = None) -> Iterable[str]:
+    """Text of a file as blocks: streamed for plain text, via the extraction stage otherwise."""
+    fmt = detect_format(path)
+    if fmt == "text":
+        return iter_text_blocks(path, block_bytes)
+    result = extract_text(path, cache_dir=cache_dir, workers=pdf_workers, fmt=fmt)
+    if result.error:
+        raise ValueError(f"Could not extract text from {path.name}: {result.error}")
+    return [result.text]
+
+
+def _extract_file_chunks(path: str, chunk_size: int, overlap: int, block_bytes: int,
+                         cache_dir: str) -> Tuple[str, List[str]]:
+    """Process-pool worker for ingest_dir: extract + chunk one file."""
+    # Already inside a pool worker: PDFs are extracted serially here
+    blocks = _iter_file_blocks(Path(path), block_bytes, Path(cache_dir), pdf_workers=1)
+    return path, list(iter_chunks(blocks, chunk_size, overlap))
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[tuple]:
+    """Fuse ranked ID lists: score(d) = sum over lists of 1 / (k + rank). Best first."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+# --- Vector stores ---------------------------------------------------------
+
+
+class VectorStore(ABC):
+    """Storage + nearest-neighbour search for chunk embeddings.
+    
+    Distances are squared L2 between normalized vectors (2 - 2*cosine), which is
+    what Chroma's default space returns, so thresholds work with every backend.
+    """
+    
+    name = "unknown"
+    
+    @property
+    @abstractmethod
+    def stored_space(self) -> str:
+        """Embedding space the stored vectors belong to."""
+    
+    @abstractmethod
+    def count(self) -> int: ...
+    
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: np.ndarray, documents: List[str],
+               metadatas: List[Dict[str, Any]]) -> None: ...
+    
+    @abstractmethod
+    def delete(self, ids: Sequence[str]) -> None: ...
+    
+    @abstractmethod
+    def get(self, ids: Sequence[str] | None = None, where: Dict[str, Any] | None = None,
+            limit: int | None = None, offset: int | None = None) -> Dict[str, list]:
+        """{"ids", "documents", "metadatas"} of the matching chunks."""
+    
+    @abstractmethod
+    def query(self, embedding: np.ndarray, n_results: int) -> List[Dict[str, Any]]:
+        """Nearest chunks as [{"id", "text", "metadata", "distance"}], closest first."""
+    
+    @abstractmethod
+    def reset(self, space: str) -> None:
+        """Drop every chunk; the store now holds vectors of `space`."""
+    
+    @abstractmethod
+    def migrate(self, space: str, encode: Callable[[List[str]], np.ndarray], page_size: int = 256) -> int:
+        """Re-embed every chunk into `space` and swap it in. Returns chunks migrated."""
+    
+    def flush(self) -> None:
+        """Persist pending writes (no-op for stores that write through)."""
+
+
+class ChromaVectorStore(VectorStore):
+    """Chroma collection (metadata and documents live in Chroma's own SQLite)."""
+    
+    name = "chroma"
+    
+    def __init__(self, persist_dir: Path, space: str):
         try:
             import chromadb
             from chromadb.config import Settings
-            from sentence_transformers import SentenceTransformer
-            
-            # Initialize ChromaDB client
-            self.client = chromadb.Client(Settings(
-                persist_directory=str(self.persist_dir),
-                anonymized_telemetry=False
-            ))
-            
-            # Get or create collection
-            self.collection = self.client.get_or_create_collection(
-                name="lucy_memory",
-                metadata={"description": "Lucy's semantic memory"}
-            )
-            
-            # Initialize embedding model (lightweight and fast)
-            log.info("Loading embedding model (all-MiniLM-L6-v2)...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            log.info("Memory engine initialized. Collection has %d documents.", self.collection.count())
-            
         except ImportError as e:
             log.error("Failed to import RAG dependencies: %s", e)
             raise RuntimeError("ChromaDB or sentence-transformers not installed. Run: pip install chromadb sentence-transformers")
+        
+        # On-disk client: manifests and the BM25 index persist, so the vectors must too
+        self.client = chromadb.PersistentClient(path=str(persist_dir),
+                                                settings=Settings(anonymized_telemetry=False))
+        
+        # Get or create collection
+        self.collection = self.client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata=self._metadata(space)
+        )
     
-    def _chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-        """Split text into overlapping chunks.
+    @staticmethod
+    def _metadata(space: str) -> Dict[str, Any]:
+        return {"description": "Lucy's semantic memory", "embedding_space": space}
+    
+    @property
+    def stored_space(self) -> str:
+        return (self.collection.metadata or {}).get("embedding_space", LEGACY_EMBEDDING_SPACE)
+    
+    def count(self) -> int:
+        return self.collection.count()
+    
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        self.collection.upsert(ids=ids, embeddings=np.asarray(embeddings).tolist(),
+                               documents=documents, metadatas=metadatas)
+    
+    def delete(self, ids) -> None:
+        if ids:
+            self.collection.delete(ids=list(ids))
+    
+    def get(self, ids=None, where=None, limit=None, offset=None) -> Dict[str, list]:
+        res = self.collection.get(ids=list(ids) if ids is not None else None, where=where, limit=limit,
+                                  offset=offset, include=["documents", "metadatas"])
+        return {"ids": res["ids"], "documents": res["documents"], "metadatas": res["metadatas"]}
+    
+    def query(self, embedding, n_results) -> List[Dict[str, Any]]:
+        results = self.collection.query(query_embeddings=[np.asarray(embedding).tolist()], n_results=n_results)
+        return [{
+            "id": cid,
+            "text": results['documents'][0][i],
+            "metadata": results['metadatas'][0][i],
+            "distance": results['distances'][0][i] if 'distances' in results else None
+        } for i, cid in enumerate(results['ids'][0])]
+    
+    def reset(self, space: str) -> None:
+        self.client.delete_collection(COLLECTION_NAME)
+        self.collection = self.client.get_or_create_collection(name=COLLECTION_NAME, metadata=self._metadata(space))
+    
+    def migrate(self, space, encode, page_size=256) -> int:
+        # New collection page by page (the dimension may differ, which Chroma
+        # can't update in place), then swapped in under the same name.
+        tmp_name = f"{COLLECTION_NAME}__reembed"
+        try:
+            self.client.delete_collection(tmp_name)  # leftover of an interrupted migration
+        except Exception:
+            pass
+        target = self.client.create_collection(name=tmp_name, metadata=self._metadata(space))
+        total = self.count()
+        for offset in range(0, total, page_size):
+            page = self.collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+            if not page["ids"]:
+                break
+            target.add(ids=page["ids"], embeddings=encode(page["documents"]).tolist(),
+                       documents=page["documents"], metadatas=page["metadatas"])
+        self.client.delete_collection(COLLECTION_NAME)
+        target.modify(name=COLLECTION_NAME, metadata=self._metadata(space))
+        self.collection = target
+        return total
+
+
+class _FaissEngine:
+    """HNSW (inner product) in FAISS; readers mmap the saved index read-only."""
+    
+    def __init__(self, m: int, ef_construction: int, ef_search: int):
+        import faiss
+        self.faiss = faiss
+        self.m, self.ef_construction, self.ef_search = m, ef_construction, ef_search
+        self.index = None
+    
+    def create(self, dim: int) -> None:
+        base = self.faiss.IndexHNSWFlat(dim, self.m, self.faiss.METRIC_INNER_PRODUCT)
+        base.hnsw.efConstruction = self.ef_construction
+        base.hnsw.efSearch = self.ef_search
+        self.index = self.faiss.IndexIDMap2(base)
+    
+    def load(self, path: Path, dim: int, read_only: bool) -> None:
+        flags = (self.faiss.IO_FLAG_MMAP | self.faiss.IO_FLAG_READ_ONLY) if read_only else 0
+        self.index = self.faiss.read_index(str(path), flags)
+        self.faiss.downcast_index(self.index.index).hnsw.efSearch = self.ef_search
+    
+    def save(self, path: Path) -> None:
+        self.faiss.write_index(self.index, str(path))
+    
+    def add(self, vectors: np.ndarray, labels: np.ndarray) -> None:
+        self.index.add_with_ids(vectors, labels.astype(np.int64))
+    
+    def remove(self, labels: np.ndarray) -> None:
+        pass  # FAISS HNSW can't remove; dead labels are filtered, then dropped on compaction
+    
+    def vectors(self, labels: np.ndarray) -> np.ndarray:
+        return np.vstack([self.index.reconstruct(int(label)) for label in labels])
+    
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores, labels = self.index.search(query.reshape(1, -1), k)
+        keep = labels[0] >= 0
+        return labels[0][keep], scores[0][keep]
+
+
+class _HnswlibEngine:
+    """HNSW in hnswlib (the saved index is read into RAM, not mmap'd)."""
+    
+    def __init__(self, m: int, ef_construction: int, ef_search: int):
+        import hnswlib
+        self.hnswlib = hnswlib
+        self.m, self.ef_construction, self.ef_search = m, ef_construction, ef_search
+        self.index = None
+    
+    def create(self, dim: int) -> None:
+        self.index = self.hnswlib.Index(space="ip", dim=dim)
+        self.index.init_index(max_elements=1024, ef_construction=self.ef_construction, M=self.m)
+        self.index.set_ef(self.ef_search)
+    
+    def load(self, path: Path, dim: int, read_only: bool) -> None:
+        self.index = self.hnswlib.Index(space="ip", dim=dim)
+        self.index.load_index(str(path))
+        self.index.set_ef(self.ef_search)
+    
+    def save(self, path: Path) -> None:
+        self.index.save_index(str(path))
+    
+    def add(self, vectors: np.ndarray, labels: np.ndarray) -> None:
+        needed = self.index.get_current_count() + len(labels)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(vectors, labels)
+    
+    def remove(self, labels: np.ndarray) -> None:
+        for label in labels:
+            try:
+                self.index.mark_deleted(int(label))
+            except RuntimeError:
+                pass  # already deleted
+    
+    def vectors(self, labels: np.ndarray) -> np.ndarray:
+        return np.asarray(self.index.get_items([int(label) for label in labels]), dtype=np.float32)
+    
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.index.get_current_count())
+        while k > 0:
+            try:
+                labels, distances = self.index.knn_query(query.reshape(1, -1), k=k)
+                return labels[0], 1.0 - distances[0]  # hnswlib "ip" distance is 1 - ip
+            except RuntimeError:
+                k //= 2  # fewer live elements than k (deleted ones don't count)
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+
+class _ExactEngine:
+    """Brute-force search over one .npy matrix; readers np.load it memory-mapped.
+    
+    No extra dependency; fine up to ~100k chunks (one matrix-vector product per
+    query). Each row is [label as two float32 words | vector].
+    """
+    
+    def __init__(self, *_):
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.labels = np.zeros(0, dtype=np.int64)
+    
+    def create(self, dim: int) -> None:
+        self.matrix = np.zeros((0, dim), dtype=np.float32)
+        self.labels = np.zeros(0, dtype=np.int64)
+    
+    def load(self, path: Path, dim: int, read_only: bool) -> None:
+        rows = np.load(path, mmap_mode="r" if read_only else None, allow_pickle=False)
+        self.labels = np.ascontiguousarray(rows[:, :2]).view(np.int64).reshape(-1)
+        self.matrix = rows[:, 2:]
+    
+    def save(self, path: Path) -> None:
+        rows = np.hstack([self.labels.reshape(-1, 1).view(np.float32), np.asarray(self.matrix, dtype=np.float32)])
+        with open(path, "wb") as f:
+            np.save(f, rows, allow_pickle=False)
+    
+    def add(self, vectors: np.ndarray, labels: np.ndarray) -> None:
+        self.matrix = np.vstack([self.matrix, vectors])
+        self.labels = np.concatenate([self.labels, labels.astype(np.int64)])
+    
+    def remove(self, labels: np.ndarray) -> None:
+        keep = ~np.isin(self.labels, labels)
+        self.matrix, self.labels = self.matrix[keep], self.labels[keep]
+    
+    def vectors(self, labels: np.ndarray) -> np.ndarray:
+        pos = {int(label): i for i, label in enumerate(self.labels)}
+        return np.asarray(self.matrix[[pos[int(label)] for label in labels]], dtype=np.float32)
+    
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.labels):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return self.labels[top], scores[top]
+
+
+_ANN_ENGINES = {"faiss": _FaissEngine, "hnswlib": _HnswlibEngine, "exact": _ExactEngine}
+
+
+class HnswVectorStore(VectorStore):
+    """Local ANN index file + SQLite for ids, documents and metadata.
+    
+    The writer keeps the index in memory and rewrites the file atomically on
+    flush(); read-only instances (other processes) open it memory-mapped and
+    reload when the file changes. Deletes/overwrites are tombstoned in SQLite
+    and the index is compacted once tombstones pass 25% of live chunks.
+    
+    Args:
+        persist_dir: Directory for vectors.sqlite and the index file
+        space: Embedding space for a new store
+        engine: "faiss", "hnswlib", "exact" or "auto" (first importable, in that order)
+        read_only: Open for queries only (shareable between processes)
+    """
+    
+    name = "hnsw"
+    
+    def __init__(self, persist_dir: Path, space: str, engine: str = "auto", m: int = 16,
+                 ef_construction: int = 200, ef_search: int = 64, read_only: bool = False):
+        self.dir = Path(persist_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        
+        names = ["faiss", "hnswlib", "exact"] if engine == "auto" else [engine]
+        for engine_name in names:
+            try:
+                self._engine = _ANN_ENGINES[engine_name](m, ef_construction, ef_search)
+                break
+            except ImportError:
+                continue
+        else:
+            raise RuntimeError(f"Vector index engine '{engine}' not installed. Run: pip install faiss-cpu (or hnswlib)")
+        self.engine_name = engine_name
+        self.index_path = self.dir / f"vectors.{engine_name}"
+        
+        uri = f"file:{self.dir / 'vectors.sqlite'}" + ("?mode=ro" if read_only else "")
+        if read_only and not (self.dir / "vectors.sqlite").exists():
+            raise FileNotFoundError(f"No vector store to open read-only in {self.dir}")
+        self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        if not read_only:
+            self._db.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS chunks (
+                    label INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL, document TEXT, metadata TEXT,
+                    dead INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS chunks_live_id ON chunks (id) WHERE dead = 0;
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                """
+            )
+            self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('embedding_space', ?)", (space,))
+            self._db.commit()
+        
+        self._dim = int(self._meta("dim") or 0)
+        self._loaded_mtime = None
+        self._dirty = False
+        if self.index_path.exists() and self._dim:
+            self._load()
+        elif self._dim:
+            self._engine.create(self._dim)
+    
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+    
+    def _load(self) -> None:
+        self._engine.load(self.index_path, self._dim, self.read_only)
+        self._loaded_mtime = self.index_path.stat().st_mtime_ns
+    
+    def _maybe_reload(self) -> None:
+        """Readers pick up the writer's latest flush."""
+        if not self.read_only or not self.index_path.exists():
+            return
+        mtime = self.index_path.stat().st_mtime_ns
+        if mtime != self._loaded_mtime:
+            self._dim = int(self._meta("dim") or 0)
+            self._load()
+    
+    @property
+    def stored_space(self) -> str:
+        return self._meta("embedding_space") or LEGACY_EMBEDDING_SPACE
+    
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM chunks WHERE dead = 0").fetchone()[0]
+    
+    def _dead_count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM chunks WHERE dead = 1").fetchone()[0]
+    
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError("Vector store opened read-only")
+    
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        self._check_writable()
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if not self._dim:
+                self._dim = vectors.shape[1]
+                self._set_meta("dim", self._dim)
+                self._engine.create(self._dim)
+            self._kill(ids)
+            labels = []
+            for cid, doc, meta in zip(ids, documents, metadatas):
+                cur = self._db.execute("INSERT INTO chunks (id, document, metadata) VALUES (?, ?, ?)",
+                                       (cid, doc, json.dumps(meta, ensure_ascii=False)))
+                labels.append(cur.lastrowid)
+            self._db.commit()
+            self._engine.add(vectors, np.asarray(labels, dtype=np.int64))
+            self._dirty = True
+    
+    def _kill(self, ids: Sequence[str]) -> None:
+        rows = []
+        for start in range(0, len(ids), 500):
+            part = list(ids[start:start + 500])
+            rows += self._db.execute(
+                f"SELECT label FROM chunks WHERE dead = 0 AND id IN ({','.join('?' * len(part))})", part
+            ).fetchall()
+        if rows:
+            labels = [r[0] for r in rows]
+            self._db.executemany("UPDATE chunks SET dead = 1 WHERE label = ?", [(label,) for label in labels])
+            self._engine.remove(np.asarray(labels, dtype=np.int64))
+    
+    def delete(self, ids) -> None:
+        self._check_writable()
+        if not ids:
+            return
+        with self._lock:
+            self._kill(list(ids))
+            self._db.commit()
+            self._dirty = True
+    
+    def get(self, ids=None, where=None, limit=None, offset=None) -> Dict[str, list]:
+        sql = "SELECT id, document, metadata FROM chunks WHERE dead = 0"
+        params: List[Any] = []
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                return {"ids": [], "documents": [], "metadatas": []}
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params += ids
+        for key, value in (where or {}).items():
+            sql += " AND json_extract(metadata, ?) = ?"
+            params += [f"$.{key}", value]
+        sql += " ORDER BY label"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset or 0]
+        rows = self._db.execute(sql, params).fetchall()
+        return {"ids": [r[0] for r in rows], "documents": [r[1] for r in rows],
+                "metadatas": [json.loads(r[2]) if r[2] else {} for r in rows]}
+    
+    def query(self, embedding, n_results) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._maybe_reload()
+            if not self._dim:
+                return []
+            q = np.ascontiguousarray(embedding, dtype=np.float32).reshape(-1)
+            # Over-fetch past tombstones the engine may still return
+            k = n_results + min(self._dead_count(), 4 * n_results + 64)
+            labels, scores = self._engine.search(q, k)
+        if not len(labels):
+            return []
+        score_by_label = {int(label): float(score) for label, score in zip(labels, scores)}
+        rows = self._db.execute(
+            f"SELECT label, id, document, metadata FROM chunks WHERE dead = 0 AND label IN ({','.join('?' * len(score_by_label))})",
+            list(score_by_label),
+        ).fetchall()
+        hits = [{
+            "id": cid,
+            "text": doc,
+            "metadata": json.loads(meta) if meta else {},
+            "distance": max(0.0, 2.0 - 2.0 * score_by_label[label]),
+        } for label, cid, doc, meta in rows]
+        hits.sort(key=lambda h: h["distance"])
+        return hits[:n_results]
+    
+    def flush(self) -> None:
+        """Compact if needed, then write the index file atomically (readers reload it)."""
+        if self.read_only:
+            return
+        with self._lock:
+            if not self._dirty or not self._dim:
+                return
+            live, dead = self.count(), self._dead_count()
+            if dead > 1000 and dead > live // 4:
+                self._compact()
+            tmp = self.index_path.with_suffix(".tmp")
+            self._engine.save(tmp)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+    
+    def _compact(self) -> None:
+        labels = np.asarray([r[0] for r in self._db.execute("SELECT label FROM chunks WHERE dead = 0 ORDER BY label")],
+                            dtype=np.int64)
+        vectors = self._engine.vectors(labels) if len(labels) else np.zeros((0, self._dim), dtype=np.float32)
+        self._engine.create(self._dim)
+        if len(labels):
+            self._engine.add(np.ascontiguousarray(vectors, dtype=np.float32), labels)
+        self._db.execute("DELETE FROM chunks WHERE dead = 1")
+        self._db.commit()
+        log.info("Compacted vector index: %d live chunks", len(labels))
+    
+    def reset(self, space: str) -> None:
+        self._check_writable()
+        with self._lock:
+            self._db.execute("DELETE FROM chunks")
+            self._db.execute("DELETE FROM meta WHERE key = 'dim'")
+            self._set_meta("embedding_space", space)
+            self._db.commit()
+            self._dim = 0
+            self.index_path.unlink(missing_ok=True)
+            self._dirty = False
+    
+    def migrate(self, space, encode, page_size=256) -> int:
+        self._check_writable()
+        with self._lock:
+            rows = self._db.execute("SELECT label, document FROM chunks WHERE dead = 0 ORDER BY label").fetchall()
+            self._db.execute("DELETE FROM chunks WHERE dead = 1")
+            self._dim = 0
+            for start in range(0, len(rows), page_size):
+                page = rows[start:start + page_size]
+                vectors = np.ascontiguousarray(encode([doc for _, doc in page]), dtype=np.float32)
+                if not self._dim:
+                    self._dim = vectors.shape[1]
+                    self._engine.create(self._dim)
+                self._engine.add(vectors, np.asarray([label for label, _ in page], dtype=np.int64))
+            self._set_meta("embedding_space", space)
+            if self._dim:
+                self._set_meta("dim", self._dim)
+            self._db.commit()
+            if not rows:
+                self.index_path.unlink(missing_ok=True)
+            self._dirty = True
+            self.flush()
+            return len(rows)
+
+
+def create_vector_store(cfg: MemoryConfig, persist_dir: Path, space: str) -> VectorStore:
+    """Store selected by memory.vector_store."""
+    if cfg.vector_store == "chroma":
+        return ChromaVectorStore(persist_dir, space)
+    if cfg.vector_store == "hnsw":
+        return HnswVectorStore(persist_dir / "ann", space, engine=cfg.ann_engine, m=cfg.hnsw_m,
+                               ef_construction=cfg.hnsw_ef_construction, ef_search=cfg.hnsw_ef_search,
+                               read_only=cfg.read_only)
+    raise ValueError(f"Unknown vector store: {cfg.vector_store}")
+
+
+class MemoryEngine:
+    """Semantic memory engine: chunk storage/retrieval over a VectorStore plus a BM25 index."""
+    
+    def __init__(self, persist_directory: str | None = None, cfg: MemoryConfig | None = None):
+        """Initialize the memory engine.
         
         Args:
-            text: Text to chunk
-            chunk_size: Target size of each chunk (in characters)
-            overlap: Overlap between chunks
-            
-        Returns:
-            List of text chunks
+            persist_directory: Where the vector store, keyword index and manifests live (overrides cfg)
+            cfg: Memory settings (query cache, batching, embedding backend); defaults if omitted
         """
-        chunks = []
-        start = 0
-        text_len = len(text)
+        self.cfg = cfg or MemoryConfig()
+        self.persist_dir = Path(persist_directory or self.cfg.persist_directory)
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
         
-        while start < text_len:
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            # Try to break at sentence boundary
-            if end < text_len:
-                last_period = chunk.rfind('.')
-                last_newline = chunk.rfind('\n')
-                break_point = max(last_period, last_newline)
-                
-                if break_point > chunk_size // 2:  # Only break if we're past halfway
-                    chunk = chunk[:break_point + 1]
-                    end = start + break_point + 1
-            
-            chunks.append(chunk.strip())
-            start = end - overlap
+        self.backend = create_embedding_backend(self.cfg)
+        self._ingest_lock = threading.Lock()
+        # store.count() can be a round-trip to Chroma; cache it and invalidate on write
+        self._count: Optional[int] = None
+        
+        cache = None
+        if self.cfg.query_cache_size > 0 or self.cfg.query_cache_disk:
+            disk_path = self.persist_dir / "query_cache.sqlite" if self.cfg.query_cache_disk else None
+            cache = EmbeddingCache(self.cfg.query_cache_size, disk_path=disk_path, namespace=self.backend.name)
+        self.embeddings = EmbeddingService(lambda: self.backend, cache,
+                                          max_batch=self.cfg.batch_max_size,
+                                          max_wait_ms=self.cfg.batch_max_wait_ms)
+        # Keyword index kept in sync with the collection (same chunk IDs)
+        self.keywords = BM25Index(self.persist_dir / "bm25.sqlite")
+        self._keywords_synced = False
+        # Extracted PDF/DOCX/HTML/EPUB text, keyed by file content hash
+        self._extraction_cache = self.persist_dir / "extracted"
+        
+        self.store = create_vector_store(self.cfg, self.persist_dir, self.backend.space)
+        if not self.cfg.read_only:
+            self._reconcile_manifests()
+        
+        # The model itself is loaded lazily (or by the warm-up at boot).
+        stored_space = self.store.stored_space
+        self.needs_reembed = stored_space != self.backend.space and self._collection_count() > 0
+        if self.needs_reembed:
+            log.warning("Memory was embedded with %s but the backend uses %s; dense recall is unreliable "
+                        "until reembed_all() runs", stored_space, self.backend.space)
         
-        return [c for c in chunks if c]  # Filter empty chunks
+        log.info("Memory engine initialized (%s, %s). Collection has %d documents.",
+                 self.store.name, self.backend.name, self._collection_count())
     
-    def ingest_text(self, text: str, metadata: Dict[str, Any]) -> int:
-        """Ingest text into memory by chunking and embedding.
+    @property
+    def last_used(self) -> float:
+        return self.backend.last_used
+    
+    def warmup(self) -> None:
+        """Load the embedding model and run one encode so the first recall is fast."""
+        self.backend.encode(["warmup"])
+        if self.needs_reembed and self.cfg.auto_reembed:
+            self.reembed_all()
+        self._ensure_keywords_synced()
+    
+    def _collection_count(self) -> int:
+        count = self._count
+        if count is None:
+            count = self._count = self.store.count()
+        return count
+    
+    def _ensure_keywords_synced(self, page_size: int = 500) -> None:
+        """Backfill the BM25 index from the collection if they disagree (older data dirs)."""
+        if self._keywords_synced:
+            return
+        with self._ingest_lock:
+            if self._keywords_synced:
+                return
+            total = self._collection_count()
+            if self.keywords.count() != total:
+                log.info("Rebuilding keyword index from %d stored chunks...", total)
+                self.keywords.clear()
+                for offset in range(0, total, page_size):
+                    page = self.store.get(limit=page_size, offset=offset)
+                    self.keywords.add(zip(page["ids"], page["documents"]))
+            self._keywords_synced = True
+    
+    def _reconcile_manifests(self, page_size: int = 500) -> None:
+        """Drop manifests whose chunks are missing from the vector store.
+        
+        A store that lost its vectors (wiped, or never persisted) would otherwise
+        leave manifests claiming those sources are current: files would be skipped
+        as unchanged and BM25 would return IDs with no vector. Dropping the stale
+        manifests and their keyword rows makes the next sync re-ingest them.
+        """
+        manifests = [m for m in (self._load_manifest(p.stem)
+                                 for p in sorted((self.persist_dir / "manifests").glob("*.json"))) if m]
+        expected = sum(len(m["chunk_ids"]) for m in manifests)
+        count = self._collection_count()
+        if count >= expected:
+            return  # chunk IDs are unique per source, so nothing can be missing
+        stale = []
+        for m in manifests:
+            ids = m["chunk_ids"]
+            found = 0 if count == 0 else sum(len(self.store.get(ids=ids[i:i + page_size])["ids"])
+                                             for i in range(0, len(ids), page_size))
+            if found < len(ids):
+                stale.append(m)
+        for m in stale:
+            if count:
+                self.store.delete(m["chunk_ids"])
+            self.keywords.delete(m["chunk_ids"])
+            self._manifest_path(m["source_id"]).unlink(missing_ok=True)
+        self._count = None
+        self.store.flush()
+        log.warning("Vector store is missing chunks of %d of %d synced sources; they will be re-ingested",
+                    len(stale), len(manifests))
+    
+    def reembed_all(self, page_size: int = 256) -> int:
+        """Migrate the stored vectors to the current backend's space. Returns chunks re-embedded."""
+        with self._ingest_lock:
+            log.info("Re-embedding %d chunks with %s...", self._collection_count(), self.backend.name)
+            total = self.store.migrate(self.backend.space, self.embeddings.encode, page_size)
+            self._count = None
+            self.needs_reembed = False
+        log.info("Re-embedded %d chunks", total)
+        return total
+    
+    def is_loaded(self) -> bool:
+        return self.backend.is_loaded()
+    
+    def unload(self) -> None:
+        """Drop the embedding model to free RAM; the next query reloads it."""
+        self.backend.unload()
+    
+    def resident_bytes(self) -> int:
+        return self.backend.resident_bytes()
+    
+    def _chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
+        """Split text into overlapping, content-defined chunks (see chunk_text)."""
+        return chunk_text(text, chunk_size=chunk_size, overlap=overlap)
+    
+    @staticmethod
+    def _source_id(text: str, metadata: Dict[str, Any]) -> str:
+        """Stable ID for the thing being memorized: its path if it has one, else its content."""
+        key = metadata.get("source_id") or metadata.get("file_path")
+        if not key:
+            return hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()[:12]
+        return hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:12]
+    
+    def _manifest_path(self, source_id: str) -> Path:
+        return self.persist_dir / "manifests" / f"{source_id}.json"
+    
+    def _load_manifest(self, source_id: str) -> Optional[Dict[str, Any]]:
+        p = self._manifest_path(source_id)
+        if not p.exists():
+            return None
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.warning("Corrupted manifest %s (%s); re-ingesting from scratch", p, e)
+            return None
+    
+    def _save_manifest(self, source_id: str, manifest: Dict[str, Any]) -> None:
+        p = self._manifest_path(source_id)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(p)
+    
+    def upsert_text(self, text: str, metadata: Dict[str, Any]) -> IngestStats:
+        """Incrementally sync one source into memory.
+        
+        Chunks are identified by content hash, so only new or edited chunks are
+        embedded; chunks that disappeared from the source are deleted.
         
         Args:
             text: Text content to memorize
             metadata: Metadata about the text (e.g., file_path, source)
             
         Returns:
-            Number of chunks added
+            IngestStats with added/removed/unchanged chunk counts
         """
-        chunks = self._chunk_text(text)
-        
-        if not chunks:
-            log.warning("No chunks created from text")
-            return 0
+        return self.upsert_chunks(self._chunk_text(text), metadata, self._source_id(text, metadata))
+    
+    def upsert_chunks(self, chunks: Iterable[str], metadata: Dict[str, Any], source_id: str,
+                      manifest_extra: Dict[str, Any] | None = None,
+                      between_batches: Callable[[], None] | None = None) -> IngestStats:
+        """Incrementally sync a stream of chunks as one source.
         
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(chunks, show_progress_bar=False)
+        New chunks are embedded and added in batches of cfg.ingest_batch_size,
+        so memory stays bounded by the batch (plus the source's chunk IDs),
+        whatever the size of the source. `between_batches` is called before
+        each embedding batch (background indexers use it to yield the CPU).
+        """
+        with self._ingest_lock:
+            manifest = self._load_manifest(source_id)
+            if manifest is None and metadata.get("file_path"):
+                # First sync with a manifest: drop chunks stored by the old positional-ID scheme.
+                legacy = self.store.get(where={"file_path": metadata["file_path"]})["ids"]
+                if legacy:
+                    self.store.delete(legacy)
+                    self.keywords.delete(legacy)
+            
+            old_ids = set(manifest["chunk_ids"]) if manifest else set()
+            ids: List[str] = []
+            batch: List[Tuple[str, str]] = []
+            added = 0
+            for cid, chunk in iter_chunk_ids(source_id, chunks):
+                ids.append(cid)
+                if cid in old_ids:
+                    continue
+                batch.append((cid, chunk))
+                if len(batch) >= self.cfg.ingest_batch_size:
+                    if between_batches:
+                        between_batches()
+                    self._add_batch(batch, metadata, source_id)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                if between_batches:
+                    between_batches()
+                self._add_batch(batch, metadata, source_id)
+                added += len(batch)
+            
+            removed = sorted(old_ids - set(ids))
+            if removed:
+                self.store.delete(removed)
+                self.keywords.delete(removed)
+            if added or removed or manifest is None:
+                self._count = None
+                self.store.flush()
+            
+            self._save_manifest(source_id, {
+                "source_id": source_id,
+                "source": metadata.get("file_path") or metadata.get("source", "unknown"),
+                "metadata": metadata,
+                "chunk_ids": ids,
+                "updated_at": time.time(),
+                **(manifest_extra or {}),
+            })
         
-        # Create unique IDs for each chunk
-        base_id = hashlib.md5(text.encode()).hexdigest()[:8]
-        ids = [f"{base_id}_chunk_{i}" for i in range(len(chunks))]
+        stats = IngestStats(total=len(ids), added=added, removed=len(removed),
+                            unchanged=len(ids) - added)
+        log.info("Synced %s: %d chunks (+%d / -%d / =%d)", metadata.get("file_name") or metadata.get("source", "unknown"),
+                 stats.total, stats.added, stats.removed, stats.unchanged)
+        return stats
+    
+    def _add_batch(self, batch: List[Tuple[str, str]], metadata: Dict[str, Any], source_id: str) -> None:
+        """Embed one batch of new chunks and bulk-add it to the collection and keyword index."""
+        texts = [chunk for _, chunk in batch]
+        embeddings = self.embeddings.encode(texts)
         
-        # Prepare metadata for each chunk
         metadatas = []
-        for i, chunk in enumerate(chunks):
+        for cid, chunk in batch:
             chunk_meta = metadata.copy()
             chunk_meta.update({
-                "chunk_index": i,
-                "total_chunks": len(chunks),
+                "source_id": source_id,
+                "chunk_hash": cid.split("_", 1)[1],
                 "chunk_text": chunk[:200]  # Store preview
             })
             metadatas.append(chunk_meta)
         
-        # Add to collection
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings.tolist(),
-            documents=chunks,
-            metadatas=metadatas
-        )
+        self.store.upsert([cid for cid, _ in batch], embeddings, texts, metadatas)
+        self.keywords.add(batch)
+    
+    def ingest_text(self, text: str, metadata: Dict[str, Any]) -> int:
+        """Ingest text into memory by chunking and embedding.
         
-        log.info("Ingested %d chunks from %s", len(chunks), metadata.get("source", "unknown"))
-        return len(chunks)
+        Args:
+            text: Text content to memorize
+            metadata: Metadata about the text (e.g., file_path, source)
+            
+        Returns:
+            Number of chunks the source has in memory
+        """
+        stats = self.upsert_text(text, metadata)
+        if not stats.total:
+            log.warning("No chunks created from text")
+        return stats.total
     
-    def ingest_file(self, file_path: str) -> int:
-        """Read and ingest a file into memory.
+    def upsert_file(self, file_path: str, between_batches: Callable[[], None] | None = None) -> IngestStats:
+        """Read a file and incrementally sync it into memory.
         
         Args:
             file_path: Path to file to ingest
+            between_batches: Optional hook called before each embedding batch
             
         Returns:
-            Number of chunks added
+            IngestStats for the file
         """
         path = Path(file_path)
         
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Read file content
-        try:
-            content = path.read_text(encoding='utf-8')
-        except UnicodeDecodeError:
-            # Try with latin-1 as fallback
-            content = path.read_text(encoding='latin-1')
-        
-        metadata = {
+        # Text is streamed in blocks; PDF/DOCX/HTML/EPUB go through the (cached) extraction stage.
+        # Either way chunks are produced lazily and embedded/added in batches.
+        st = path.stat()
+        blocks = _iter_file_blocks(path, self.cfg.ingest_block_bytes, self._extraction_cache)
+        return self._upsert_file_chunks(path, iter_chunks(blocks), st, between_batches)
+    
+    @staticmethod
+    def _file_metadata(path: Path) -> Dict[str, Any]:
+        return {
             "source": "file",
             "file_path": str(path.absolute()),
             "file_name": path.name,
-            "file_size": path.stat().st_size
         }
+    
+    def _upsert_file_chunks(self, path: Path, chunks: Iterable[str], st: os.stat_result | None = None,
+                            between_batches: Callable[[], None] | None = None) -> IngestStats:
+        metadata = self._file_metadata(path)
+        st = st or path.stat()
+        extra = {"file_size": st.st_size, "file_mtime_ns": st.st_mtime_ns}
+        return self.upsert_chunks(chunks, metadata, self._source_id("", metadata), extra, between_batches)
+    
+    def is_file_current(self, file_path: str | Path) -> bool:
+        """True if the file is in memory and unchanged (size and mtime) since it was synced."""
+        path = Path(file_path)
+        manifest = self._load_manifest(self._source_id("", {"file_path": str(path.absolute())}))
+        if manifest is None:
+            return False
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return manifest.get("file_size") == st.st_size and manifest.get("file_mtime_ns") == st.st_mtime_ns
+    
+    def file_sources(self) -> List[str]:
+        """Absolute paths of every file synced into memory."""
+        out = []
+        for p in sorted((self.persist_dir / "manifests").glob("*.json")):
+            try:
+                file_path = json.loads(p.read_text(encoding="utf-8")).get("metadata", {}).get("file_path")
+            except Exception:
+                continue
+            if file_path:
+                out.append(file_path)
+        return out
+    
+    def ingest_dir(self, root: str | Path, pattern: str = "**/*", workers: int | None = None,
+                   progress: Callable[[int, int, str], None] | None = None) -> DirIngestStats:
+        """Incrementally sync every supported document (text, PDF, DOCX, HTML, EPUB) under a directory.
+        
+        Decoding and chunking run in a process pool (cfg.ingest_workers); embedding
+        and writes stay in this process. Files larger than cfg.pool_max_file_mb are
+        streamed here instead, so a worker never ships a huge chunk list back.
+        
+        Args:
+            root: Directory to scan
+            pattern: Glob relative to root (hidden files/dirs are skipped)
+            workers: Pool size override (0 = no pool)
+            progress: Called as progress(done, total, file_name) after each file
+        """
+        root = Path(root)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {root}")
+        
+        files = sorted(p for p in root.glob(pattern)
+                       if p.is_file() and not any(part.startswith(".") for part in p.relative_to(root).parts))
+        files = [p for p in files if detect_format(p) != "unknown"]
+        stats = DirIngestStats(files=len(files))
+        limit = self.cfg.pool_max_file_mb * 1024 * 1024
+        pooled = [p for p in files if p.stat().st_size <= limit]
+        inline = [p for p in files if p.stat().st_size > limit]
+        workers = max(0, self.cfg.ingest_workers if workers is None else workers)
+        done = 0
+        
+        def record(path: Path, result: IngestStats | None) -> None:
+            nonlocal done
+            done += 1
+            if result is None:
+                stats.failed.append(str(path))
+            else:
+                stats.synced += 1
+                stats.added += result.added
+                stats.removed += result.removed
+                stats.unchanged += result.unchanged
+            if progress:
+                progress(done, len(files), path.name)
+        
+        if pooled and workers:
+            args = (500, 50, self.cfg.ingest_block_bytes, str(self._extraction_cache))
+            # spawn: don't fork the web server / loaded models into the workers
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                queue = iter(pooled)
+                inflight = {}
+                for path in queue:
+                    inflight[pool.submit(_extract_file_chunks, str(path), *args)] = path
+                    if len(inflight) >= workers * 2:  # bound extracted-but-not-embedded text
+                        break
+                while inflight:
+                    finished, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        path = inflight.pop(fut)
+                        try:
+                            _, chunks = fut.result()
+                            record(path, self._upsert_file_chunks(path, chunks))
+                        except Exception as e:
+                            log.error("Failed to ingest %s: %s", path, e)
+                            record(path, None)
+                        nxt = next(queue, None)
+                        if nxt is not None:
+                            inflight[pool.submit(_extract_file_chunks, str(nxt), *args)] = nxt
+        else:
+            inline = pooled + inline
+        
+        for path in inline:
+            try:
+                record(path, self.upsert_file(str(path)))
+            except Exception as e:
+                log.error("Failed to ingest %s: %s", path, e)
+                record(path, None)
+        
+        log.info("Synced dir %s: %d/%d files (+%d / -%d / =%d chunks)", root, stats.synced, stats.files,
+                 stats.added, stats.removed, stats.unchanged)
+        return stats
+    
+    def ingest_file(self, file_path: str) -> int:
+        """Read and ingest a file into memory.
         
-        return self.ingest_text(content, metadata)
+        Args:
+            file_path: Path to file to ingest
+            
+        Returns:
+            Number of chunks the file has in memory
+        """
+        return self.upsert_file(file_path).total
+    
+    def forget_source(self, source_key: str) -> int:
+        """Remove every chunk of a source (e.g. a deleted file). Returns chunks removed."""
+        source_id = self._source_id("", {"source_id": source_key})
+        with self._ingest_lock:
+            manifest = self._load_manifest(source_id)
+            if manifest is None:
+                return 0
+            if manifest["chunk_ids"]:
+                self.store.delete(manifest["chunk_ids"])
+                self.store.flush()
+                self.keywords.delete(manifest["chunk_ids"])
+                self._count = None
+            self._manifest_path(source_id).unlink(missing_ok=True)
+        log.info("Forgot %s (%d chunks)", source_key, len(manifest["chunk_ids"]))
+        return len(manifest["chunk_ids"])
     
-    def query(self, query_text: str, n_results: int = 3) -> List[Dict[str, Any]]:
+    def query(self, query_text: str, n_results: int = 3, mode: str | None = None) -> List[Dict[str, Any]]:
         """Search memory for relevant information.
         
         Args:
             query_text: Query string
             n_results: Number of results to return
+            mode: "dense" (vectors only) or "hybrid" (BM25 + vectors, fused with RRF);
+                defaults to cfg.retrieval_mode
             
         Returns:
             List of relevant chunks with metadata
         """
-        if self.collection.count() == 0:
+        count = self._collection_count()
+        if count == 0:
             log.warning("Memory is empty, no results to return")
             return []
         
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query_text], show_progress_bar=False)[0]
+        mode = mode or self.cfg.retrieval_mode
+        hybrid = mode == "hybrid"
+        # Hybrid over-fetches from both retrievers so fusion has something to re-rank
+        n_dense = min(max(n_results, self.cfg.hybrid_candidates) if hybrid else n_results, count)
+        
+        # Generate query embedding (cached / micro-batched)
+        query_embedding = self.embeddings.encode_query(query_text)
         
         # Search
-        results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
-            n_results=min(n_results, self.collection.count())
-        )
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for hit in self.store.query(query_embedding, n_dense):
+            cid = hit.pop("id")
+            by_id[cid] = hit
+        dense_ids = list(by_id)
         
-        # Format results
-        formatted_results = []
-        for i in range(len(results['ids'][0])):
-            formatted_results.append({
-                "text": results['documents'][0][i],
-                "metadata": results['metadatas'][0][i],
-                "distance": results['distances'][0][i] if 'distances' in results else None
-            })
+        if not hybrid:
+            formatted_results = [by_id[cid] for cid in dense_ids]
+        else:
+            self._ensure_keywords_synced()
+            keyword_ids = [cid for cid, _ in self.keywords.search(query_text, k=self.cfg.hybrid_candidates)]
+            fused = reciprocal_rank_fusion([dense_ids, keyword_ids], k=self.cfg.rrf_k)[:n_results]
+            
+            # Keyword-only hits weren't returned by the vector query; fetch them
+            missing = [cid for cid, _ in fused if cid not in by_id]
+            if missing:
+                extra = self.store.get(ids=missing)
+                for cid, doc, meta in zip(extra["ids"], extra["documents"], extra["metadatas"]):
+                    by_id[cid] = {"text": doc, "metadata": meta, "distance": None}
+            
+            formatted_results = []
+            for cid, score in fused:
+                if cid in by_id:  # index ahead of a concurrent delete
+                    formatted_results.append({**by_id[cid], "score": round(score, 5)})
         
-        log.info("Query '%s' returned %d results", query_text[:50], len(formatted_results))
+        log.info("Query '%s' (%s) returned %d results", query_text[:50], mode, len(formatted_results))
         return formatted_results
     
     def clear(self):
         """Clear all memory (for testing)."""
-        self.client.delete_collection("lucy_memory")
-        self.collection = self.client.get_or_create_collection(
-            name="lucy_memory",
-            metadata={"description": "Lucy's semantic memory"}
-        )
+        self.store.reset(self.backend.space)
+        shutil.rmtree(self.persist_dir / "manifests", ignore_errors=True)
+        self.keywords.clear()
+        self._count = None
+        self.needs_reembed = False
         log.info("Memory cleared")
     
     def stats(self) -> Dict[str, Any]:
         """Get memory statistics."""
         return {
-            "total_documents": self.collection.count(),
-            "persist_directory": str(self.persist_dir)
+            "total_documents": self._collection_count(),
+            "persist_directory": str(self.persist_dir),
+            "vector_store": self.store.name,
+            "retrieval_mode": self.cfg.retrieval_mode,
+            "embedding_backend": self.backend.name,
+            "needs_reembed": self.needs_reembed,
+            "keyword_index_documents": self.keywords.count(),
+            "embeddings": self.embeddings.stats()
         }
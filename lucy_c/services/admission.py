@@ -0,0 +1,131 @@
+"""
+Admission control for concurrent turns.
+
+Every stage of a turn (ASR, LLM, TTS) has a concurrency limit and a bounded
+wait queue. Up to `limit` turns run a stage at once, up to `max_queue` more
+wait for it (at most `queue_timeout_s`), and the rest are rejected right away
+with `Busy`, which carries a retry hint. The web layer turns that into
+HTTP 429 or a Socket.IO `busy` event. Under a spike, the turns that get in
+keep their normal latency instead of everyone slowing down together until
+the 120 s Ollama timeout.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+log = logging.getLogger("LucyC.Admission")
+
+
+class Busy(Exception):
+    """A stage is saturated; retry after `retry_after_s` seconds."""
+
+    def __init__(self, stage: str, retry_after_s: int, reason: str = "queue full"):
+        super().__init__(f"{stage} busy ({reason}), retry in {retry_after_s}s")
+        self.stage = stage
+        self.retry_after_s = retry_after_s
+        self.reason = reason
+
+
+class _Stage:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.running = 0
+        self.waiting = 0
+        self.waits: Deque[float] = deque(maxlen=512)
+        self.service: Deque[float] = deque(maxlen=128)
+        self.counts = {"admitted": 0, "rejected": 0, "timed_out": 0}
+
+
+class AdmissionController:
+    """Per-stage concurrency limits with a bounded wait queue.
+
+    Args:
+        limits: Concurrent turns per stage, e.g. {"llm": 8, "asr": 2, "tts": 2}
+        max_queue: Turns allowed to wait per stage; beyond that they are rejected
+        queue_timeout_s: Longest a turn waits for a stage before it's rejected
+    """
+
+    def __init__(self, limits: Dict[str, int], max_queue: int = 16, queue_timeout_s: float = 30.0):
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout_s = float(queue_timeout_s)
+        self._cond = threading.Condition()
+        self._stages = {name: _Stage(name, limit) for name, limit in limits.items()}
+
+    def _retry_after(self, stage: _Stage) -> int:
+        # Time for the queue ahead to drain at the observed service rate
+        service = sum(stage.service) / len(stage.service) if stage.service else 1.0
+        return max(1, math.ceil(service * (stage.waiting + 1) / stage.limit))
+
+    def check(self, name: str) -> None:
+        """Raise Busy now if `name` would reject a new turn (avoid doing ASR for a turn the LLM will refuse)."""
+        stage = self._stages.get(name)
+        if stage is None:
+            return
+        with self._cond:
+            if stage.running >= stage.limit and stage.waiting >= self.max_queue:
+                stage.counts["rejected"] += 1
+                raise Busy(name, self._retry_after(stage))
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[float]:
+        """Hold a slot of stage `name`; yields the seconds spent queued. Unknown stages are unlimited."""
+        stage = self._stages.get(name)
+        if stage is None:
+            yield 0.0
+            return
+        start = time.monotonic()
+        with self._cond:
+            if stage.running >= stage.limit:
+                if stage.waiting >= self.max_queue:
+                    stage.counts["rejected"] += 1
+                    raise Busy(name, self._retry_after(stage))
+                stage.waiting += 1
+                try:
+                    deadline = start + self.queue_timeout_s
+                    while stage.running >= stage.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            stage.counts["timed_out"] += 1
+                            raise Busy(name, self._retry_after(stage), "queue timeout")
+                        self._cond.wait(remaining)
+                finally:
+                    stage.waiting -= 1
+            stage.running += 1
+            stage.counts["admitted"] += 1
+            waited = time.monotonic() - start
+            stage.waits.append(waited)
+        if waited > 1.0:
+            log.info("Turn waited %.1fs for the %s stage", waited, name)
+        began = time.monotonic()
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                stage.running -= 1
+                stage.service.append(time.monotonic() - began)
+                self._cond.notify_all()
+
+    def report(self) -> Dict[str, object]:
+        out: Dict[str, object] = {}
+        with self._cond:
+            for name, s in self._stages.items():
+                waits = sorted(s.waits)
+                out[name] = {
+                    "limit": s.limit,
+                    "running": s.running,
+                    "waiting": s.waiting,
+                    **s.counts,
+                    "wait_avg_s": round(sum(waits) / len(waits), 3) if waits else None,
+                    "wait_p95_s": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else None,
+                    "wait_max_s": round(waits[-1], 3) if waits else None,
+                    "service_avg_s": round(sum(s.service) / len(s.service), 3) if s.service else None,
+                }
+        return {"max_queue": self.max_queue, "queue_timeout_s": self.queue_timeout_s, "stages": out}
@@ -0,0 +1,120 @@
+"""
+Deferred speech for HTTP replies.
+
+`/api/chat` used to hold the text reply until TTS finished and inline the
+WAV as base64, even for API clients that only read the text. Now the reply
+text goes out immediately with an audio handle. The clip is synthesized
+either in the background right away (prefetch) or when the client first
+fetches `/api/audio/<id>`. Clips nobody fetches cost no TTS time beyond the
+optional prefetch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+log = logging.getLogger("LucyC.AudioStore")
+
+
+@dataclass
+class AudioClip:
+    id: str
+    text: str
+    created: float = field(default_factory=time.time)
+    state: str = "pending"  # pending | ready | failed
+    wav: bytes = b""
+    sample_rate: int = 0
+    synth_s: float = 0.0
+    fetched: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def etag(self) -> str:
+        return hashlib.sha1(self.wav).hexdigest()[:16]
+
+
+class AudioStore:
+    """Reply audio by id, synthesized once: in the background or on first fetch.
+
+    Args:
+        synthesize: text -> (wav bytes, sample rate); empty bytes means TTS failed
+        max_items: Clips kept (oldest dropped first)
+        ttl_s: A clip's lifetime; also how long clients may cache it
+    """
+
+    def __init__(self, synthesize: Callable[[str], Tuple[bytes, int]], max_items: int = 256, ttl_s: float = 600.0):
+        self.synthesize = synthesize
+        self.max_items = max(1, int(max_items))
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._clips: "OrderedDict[str, AudioClip]" = OrderedDict()
+        self.stats = {"submitted": 0, "prefetched": 0, "synthesized": 0, "fetched": 0,
+                      "failed": 0, "expired_unfetched": 0, "never_synthesized": 0}
+
+    def submit(self, text: str, prefetch: bool = False) -> str:
+        """Register the speech for `text` and return its id; `prefetch` starts synthesis now."""
+        clip = AudioClip(id=uuid.uuid4().hex, text=text)
+        with self._lock:
+            self._evict()
+            self._clips[clip.id] = clip
+            self.stats["submitted"] += 1
+            if prefetch:
+                self.stats["prefetched"] += 1
+        if prefetch:
+            threading.Thread(target=self._ensure, args=(clip,), name=f"tts-{clip.id[:8]}", daemon=True).start()
+        return clip.id
+
+    def get(self, audio_id: str) -> Optional[AudioClip]:
+        """The clip, synthesized (waits for a prefetch in progress). None if unknown or expired."""
+        with self._lock:
+            clip = self._clips.get(audio_id)
+            if clip is not None and time.time() - clip.created > self.ttl_s:
+                clip = None
+        if clip is None:
+            return None
+        self._ensure(clip)
+        if not clip.fetched:
+            clip.fetched = True
+            with self._lock:
+                self.stats["fetched"] += 1
+        return clip
+
+    def _ensure(self, clip: AudioClip) -> None:
+        # One synthesis per clip: a fetch during the prefetch waits for it instead of starting another
+        with clip._lock:
+            if clip.state == "ready":
+                return
+            start = time.monotonic()
+            try:
+                wav, sr = self.synthesize(clip.text)
+            except Exception as e:
+                log.warning("Deferred TTS failed for %s: %s", clip.id, e)
+                wav, sr = b"", 0
+            clip.synth_s = time.monotonic() - start
+            clip.wav, clip.sample_rate = wav, sr
+            clip.state = "ready" if wav else "failed"
+        with self._lock:
+            self.stats["synthesized" if wav else "failed"] += 1
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._clips:
+            oldest = next(iter(self._clips.values()))
+            if len(self._clips) < self.max_items and now - oldest.created <= self.ttl_s:
+                break
+            self._clips.popitem(last=False)
+            if not oldest.fetched:
+                self.stats["expired_unfetched"] += 1
+                if oldest.state == "pending":
+                    self.stats["never_synthesized"] += 1
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            return {"clips": len(self._clips), "ttl_s": self.ttl_s, **self.stats}
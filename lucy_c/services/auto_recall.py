@@ -0,0 +1,92 @@
+"""
+Speculative memory retrieval for a turn.
+
+Queries semantic memory with the user's utterance while the orchestrator
+builds the prompt context; hits above a similarity threshold go straight into
+the first prompt, so the model can answer without a `[[recall(...)]]` round
+trip (tool call + reflection). Counts how often that tool path was skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional
+
+from lucy_c.services.offload import call_blocking
+
+log = logging.getLogger("LucyC.AutoRecall")
+
+
+class AutoRecall:
+    """Runs a memory query alongside context building.
+
+    Args:
+        memory: MemoryEngine (query, stats)
+        min_similarity: Cosine similarity a hit needs to be injected
+        n_results: Hits fetched per turn
+        timeout_ms: How long the turn waits for the query once context is built
+        min_chars: Utterances shorter than this ("hola", "gracias") don't trigger a query
+    """
+
+    def __init__(self, memory: Any, min_similarity: float = 0.5, n_results: int = 3,
+                 timeout_ms: float = 300.0, min_chars: int = 12):
+        self.memory = memory
+        self.min_similarity = float(min_similarity)
+        self.n_results = int(n_results)
+        self.timeout_s = float(timeout_ms) / 1000.0
+        self.min_chars = int(min_chars)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auto-recall")
+        self._lock = threading.Lock()
+        self._counts = {"queries": 0, "injected": 0, "below_threshold": 0, "timeouts": 0, "errors": 0,
+                        "recall_tool_after_inject": 0, "recall_tool_without_inject": 0}
+
+    def _bump(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def _query(self, text: str) -> List[Dict[str, Any]]:
+        # Dense mode: its distances are calibrated (RRF scores aren't), so the threshold means something
+        hits = call_blocking(lambda: self.memory.query(text, n_results=self.n_results, mode="dense"))
+        return [h for h in hits if h.get("distance") is not None and 1.0 - h["distance"] / 2.0 >= self.min_similarity]
+
+    def start(self, text: str) -> Optional[Future]:
+        """Kick off the query for a turn (None when the utterance is too short to bother)."""
+        if len(text.strip()) < self.min_chars:
+            return None
+        self._bump("queries")
+        return self._pool.submit(self._query, text)
+
+    def result(self, pending: Optional[Future]) -> List[Dict[str, Any]]:
+        """Hits worth injecting; [] on timeout, error or nothing close enough."""
+        if pending is None:
+            return []
+        try:
+            hits = pending.result(timeout=self.timeout_s)
+        except FutureTimeout:
+            self._bump("timeouts")
+            return []
+        except Exception as e:
+            self._bump("errors")
+            log.warning("Auto-recall failed: %s", e)
+            return []
+        self._bump("injected" if hits else "below_threshold")
+        return hits
+
+    def note_turn(self, injected: bool, used_recall_tool: bool) -> None:
+        """Record whether the model still went through [[recall]] after this turn's injection decision."""
+        if used_recall_tool:
+            self._bump("recall_tool_after_inject" if injected else "recall_tool_without_inject")
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        injected = counts["injected"]
+        skipped = injected - counts["recall_tool_after_inject"]
+        return {
+            **counts,
+            "min_similarity": self.min_similarity,
+            "tool_path_skipped": skipped,
+            "tool_path_skip_rate": round(skipped / injected, 3) if injected else None,
+        }
@@ -0,0 +1,200 @@
+"""
+Turn cancellation and barge-in.
+
+A turn that nobody will hear any more (the user sent another message or
+started talking over Lucy) used to run to the end anyway: generation,
+tools, reflection and TTS. Every turn now carries a CancelToken. Each stage
+checks the token before it starts. The Ollama stream is closed as soon as
+the token fires, which makes Ollama stop generating. TurnTracker keeps the
+current turn of every session: starting a new one supersedes (cancels) the
+previous turn, and a "barge_in" from the browser cancels it directly.
+
+The compute saved is estimated from what completed turns spend in each
+stage. A turn cancelled in "think" saves the rest of its generation plus
+the average tools, reflect and TTS time of a finished turn.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+log = logging.getLogger("LucyC.Cancellation")
+
+# Pipeline order, for "what would still have run"
+TURN_STAGES = ("asr", "think", "tools", "reflect", "tts")
+
+
+class Cancelled(BaseException):
+    """The turn was cancelled; raised at the next checkpoint.
+
+    A BaseException (like asyncio.CancelledError) so the many `except Exception`
+    fallbacks along the pipeline don't turn it into an error reply. Never raise it
+    inside a worker-pool function: tpool only marshals Exception subclasses back.
+    """
+
+    def __init__(self, reason: str = "cancelled", stage: str = ""):
+        super().__init__(f"turn cancelled ({reason}) at {stage or 'start'}")
+        self.reason = reason
+        self.stage = stage
+
+
+class CancelToken:
+    """Set once; stages poll it and blocking I/O registers a callback to abort itself."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+        self.stage: str = ""  # stage running when the token fired
+        self.timings: Dict[str, float] = {}  # stage -> seconds spent in this turn
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the turn; False if it already was."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                log.debug("Cancel callback failed: %s", e)
+        return True
+
+    def check(self, stage: str = "") -> None:
+        if self._event.is_set():
+            raise Cancelled(self.reason or "cancelled", stage or self.stage)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback` when the token fires (right away if it already has). Returns an unregister function."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class TurnTracker:
+    """The running turn of each session, plus what cancelling turns saved.
+
+    Args:
+        supersede: A new turn cancels the session's previous one
+        shared_sessions: Sessions many clients share (anonymous); never superseded
+    """
+
+    def __init__(self, supersede: bool = True, shared_sessions=("lucy-c:anonymous",)):
+        self.supersede = supersede
+        self.shared_sessions = set(shared_sessions)
+        self._lock = threading.Lock()
+        self._current: Dict[str, CancelToken] = {}
+        self._stage_total_s = {stage: 0.0 for stage in TURN_STAGES}
+        self._stage_runs = {stage: 0 for stage in TURN_STAGES}
+        self.stats = {"started": 0, "completed": 0, "cancelled": 0, "superseded": 0, "barge_in": 0,
+                      "wasted_s": 0.0, "saved_s_est": 0.0}
+        self.cancelled_at: Dict[str, int] = {}
+        # Called with (session_user, token) as every turn closes; token.timings has its stage times
+        self.end_listeners: List[Callable[[str, CancelToken], None]] = []
+
+    def begin(self, session_user: str) -> CancelToken:
+        """A token for a new turn of `session_user`, superseding the one still running."""
+        token = CancelToken()
+        with self._lock:
+            self.stats["started"] += 1
+            previous = self._current.get(session_user)
+            if session_user not in self.shared_sessions:
+                self._current[session_user] = token
+        if self.supersede and previous is not None and previous.cancel("superseded"):
+            with self._lock:
+                self.stats["superseded"] += 1
+            log.info("Turn of %s superseded by a new one (at %s)", session_user, previous.stage or "start")
+        return token
+
+    def cancel(self, session_user: str, reason: str = "barge_in") -> bool:
+        """Cancel the session's running turn (the user started talking over Lucy)."""
+        with self._lock:
+            token = self._current.get(session_user)
+        if token is None or not token.cancel(reason):
+            return False
+        with self._lock:
+            if reason in self.stats:
+                self.stats[reason] += 1
+        log.info("Turn of %s cancelled (%s, at %s)", session_user, reason, token.stage or "start")
+        return True
+
+    def end(self, session_user: str, token: CancelToken) -> None:
+        """Close the turn: its stage timings feed the estimates, or it counts as cancelled."""
+        for listener in self.end_listeners:
+            try:
+                listener(session_user, token)
+            except Exception as e:
+                log.debug("Turn listener failed: %s", e)
+        with self._lock:
+            if self._current.get(session_user) is token:
+                del self._current[session_user]
+            if not token.cancelled:
+                self.stats["completed"] += 1
+                for stage, seconds in token.timings.items():
+                    self._stage_total_s[stage] += seconds
+                    self._stage_runs[stage] += 1
+                return
+            self.stats["cancelled"] += 1
+            stage = token.stage or "start"
+            self.cancelled_at[stage] = self.cancelled_at.get(stage, 0) + 1
+            self.stats["wasted_s"] += sum(token.timings.values())
+            self.stats["saved_s_est"] += self._remaining_s(token)
+
+    def _remaining_s(self, token: CancelToken) -> float:
+        # Rest of the stage it was in (vs. that stage's average run) + expected cost of the later ones per turn
+        completed = self.stats["completed"]
+        if not completed:
+            return 0.0
+        saved = 0.0
+        later = TURN_STAGES[TURN_STAGES.index(token.stage) + 1:] if token.stage in TURN_STAGES else TURN_STAGES
+        if token.stage in TURN_STAGES and self._stage_runs[token.stage]:
+            avg = self._stage_total_s[token.stage] / self._stage_runs[token.stage]
+            saved += max(0.0, avg - token.timings.get(token.stage, 0.0))
+        for stage in later:
+            saved += self._stage_total_s[stage] / completed
+        return saved
+
+    @contextmanager
+    def stage(self, token: Optional[CancelToken], name: str):
+        """Checkpoint before `name` and time it for the turn (no-op without a token)."""
+        if token is None:
+            yield
+            return
+        token.stage = name
+        token.check(name)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            token.timings[name] = token.timings.get(name, 0.0) + time.monotonic() - start
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["wasted_s"] = round(stats["wasted_s"], 3)
+            stats["saved_s_est"] = round(stats["saved_s_est"], 3)
+            stats["running"] = len(self._current)
+            stats["cancelled_at"] = dict(self.cancelled_at)
+            stats["stage_avg_s"] = {s: round(self._stage_total_s[s] / self._stage_runs[s], 3)
+                                    for s in TURN_STAGES if self._stage_runs[s]}
+            return stats
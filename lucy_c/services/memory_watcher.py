@@ -0,0 +1,236 @@
+"""
+Background re-indexer for directories Lucy keeps in semantic memory.
+
+Watches the configured directories (inotify via the optional `inotify_simple`
+package, polling otherwise), debounces bursts of changes, and syncs only the
+files that changed through MemoryEngine's incremental path; files that
+disappear are forgotten. Indexing is throttled so it never competes with a
+live turn: it waits while `is_busy()` is true (checked between files and
+between embedding batches) and pauses between files.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lucy_c.extraction import detect_format
+from lucy_c.services.offload import call_blocking
+
+log = logging.getLogger("LucyC.MemoryWatcher")
+
+
+class MemoryWatcher:
+    """Keeps memory in sync with a set of directories.
+
+    Args:
+        memory: MemoryEngine (upsert_file, forget_source, is_file_current, file_sources)
+        dirs: Directories to watch recursively
+        debounce_s: A file is indexed once it has been quiet this long
+        poll_interval_s: Rescan period when inotify isn't available
+        pause_s: Sleep between indexed files
+        is_busy: Returns True while a live turn runs; indexing waits for it
+    """
+
+    def __init__(self, memory: Any, dirs: List[str], debounce_s: float = 2.0, poll_interval_s: float = 10.0,
+                 pause_s: float = 0.5, is_busy: Callable[[], bool] | None = None):
+        self.memory = memory
+        self.dirs = [Path(d).expanduser().resolve() for d in dirs]
+        self.debounce_s = float(debounce_s)
+        self.poll_interval_s = float(poll_interval_s)
+        self.pause_s = float(pause_s)
+        self.is_busy = is_busy or (lambda: False)
+
+        self._pending: Dict[Path, float] = {}  # path -> time of last change
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+        self.mode = "off"
+        self.synced = 0
+        self.forgotten = 0
+        self.failed = 0
+        self.waited_s = 0.0
+
+    # --- change detection -------------------------------------------------
+
+    def _watched(self, path: Path) -> bool:
+        root = next((d for d in self.dirs if path.is_relative_to(d)), None)
+        if root is None or any(part.startswith(".") for part in path.relative_to(root).parts):
+            return False
+        return detect_format(path) != "unknown" if path.exists() else True
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snap = {}
+        for root in self.dirs:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for name in filenames:
+                    if name.startswith("."):
+                        continue
+                    p = Path(dirpath) / name
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    snap[p] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def mark(self, path: Path, now: float | None = None) -> None:
+        """Queue a path for (re)indexing or removal after the debounce window."""
+        with self._lock:
+            self._pending[Path(path)] = time.time() if now is None else now
+
+    def reconcile(self) -> None:
+        """Startup pass: queue files changed or deleted while Lucy wasn't running."""
+        self._snapshot = call_blocking(self._scan)
+        for p in self._snapshot:
+            if self._watched(p) and not self.memory.is_file_current(p):
+                self.mark(p, now=0.0)
+        for source in self.memory.file_sources():
+            p = Path(source)
+            if any(p.is_relative_to(d) for d in self.dirs) and not p.exists():
+                self.mark(p, now=0.0)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval_s):
+            snap = call_blocking(self._scan)
+            for p, sig in snap.items():
+                if self._snapshot.get(p) != sig:
+                    self.mark(p)
+            for p in self._snapshot.keys() - snap.keys():
+                self.mark(p)
+            self._snapshot = snap
+
+    def _inotify_loop(self, inotify_simple: Any) -> None:
+        inotify = inotify_simple.INotify()
+        F = inotify_simple.flags
+        mask = F.CLOSE_WRITE | F.MOVED_TO | F.MOVED_FROM | F.DELETE | F.CREATE
+        wds: Dict[int, Path] = {}
+
+        def watch_tree(root: Path) -> None:
+            for dirpath, dirnames, _ in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                try:
+                    wds[inotify.add_watch(dirpath, mask)] = Path(dirpath)
+                except OSError as e:
+                    log.warning("Cannot watch %s: %s", dirpath, e)
+
+        for d in self.dirs:
+            watch_tree(d)
+        while not self._stop.is_set():
+            for event in call_blocking(lambda: inotify.read(timeout=1000)):
+                parent = wds.get(event.wd)
+                if parent is None or not event.name:
+                    continue
+                p = parent / event.name
+                if event.mask & F.ISDIR:
+                    if event.mask & (F.CREATE | F.MOVED_TO):
+                        watch_tree(p)
+                        for child in p.rglob("*"):
+                            if child.is_file():
+                                self.mark(child)
+                    elif event.mask & F.MOVED_FROM:
+                        # Moved out of the tree: no per-file events follow
+                        for source in self.memory.file_sources():
+                            if Path(source).is_relative_to(p):
+                                self.mark(Path(source))
+                    continue
+                self.mark(p)
+        inotify.close()
+
+    # --- indexing -----------------------------------------------------------
+
+    def _wait_until_idle(self) -> None:
+        start = time.time()
+        while self.is_busy() and not self._stop.is_set():
+            time.sleep(0.25)
+        self.waited_s += time.time() - start
+
+    def _due(self, now: float) -> List[Path]:
+        with self._lock:
+            due = [p for p, t in self._pending.items() if now - t >= self.debounce_s]
+            for p in due:
+                del self._pending[p]
+        return sorted(due)
+
+    def process_due(self, now: float | None = None) -> int:
+        """Index/forget every pending path whose debounce window has passed. Returns paths handled."""
+        due = self._due(time.time() if now is None else now)
+        for p in due:
+            if self._stop.is_set():
+                break
+            self._wait_until_idle()
+            try:
+                if p.is_file():
+                    if not self._watched(p) or self.memory.is_file_current(p):
+                        continue
+                    call_blocking(lambda: self.memory.upsert_file(str(p), between_batches=self._wait_until_idle))
+                    self.synced += 1
+                elif not p.exists():
+                    if self.memory.forget_source(str(p)):
+                        self.forgotten += 1
+            except Exception as e:
+                self.failed += 1
+                log.warning("Re-index of %s failed: %s", p, e)
+            if self.pause_s:
+                time.sleep(self.pause_s)
+        return len(due)
+
+    def _index_loop(self) -> None:
+        while not self._stop.wait(min(1.0, self.debounce_s)):
+            try:
+                self.process_due()
+            except Exception as e:
+                log.error("Memory watcher indexing failed: %s", e)
+
+    # --- lifecycle ------------------------------------------------------------
+
+    def start(self) -> None:
+        """Reconcile, then watch and index in daemon threads (no-op without directories)."""
+        if not self.dirs or self._threads:
+            return
+        missing = [d for d in self.dirs if not d.is_dir()]
+        for d in missing:
+            log.warning("Watched directory does not exist: %s", d)
+        self.dirs = [d for d in self.dirs if d.is_dir()]
+        if not self.dirs:
+            return
+
+        try:
+            import inotify_simple
+            self.mode = "inotify"
+            watch = threading.Thread(target=self._inotify_loop, args=(inotify_simple,), name="memory-watch", daemon=True)
+        except ImportError:
+            self.mode = "poll"
+            watch = threading.Thread(target=self._poll_loop, name="memory-watch", daemon=True)
+
+        def run():
+            self.reconcile()
+            watch.start()
+            self._index_loop()
+
+        t = threading.Thread(target=run, name="memory-reindex", daemon=True)
+        self._threads = [t, watch]
+        t.start()
+        log.info("Watching %s for memory updates (%s)", ", ".join(map(str, self.dirs)), self.mode)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "mode": self.mode,
+            "dirs": [str(d) for d in self.dirs],
+            "pending": pending,
+            "synced": self.synced,
+            "forgotten": self.forgotten,
+            "failed": self.failed,
+            "waited_for_turns_s": round(self.waited_s, 1),
+        }
@@ -0,0 +1,170 @@
+"""
+Ollama model residency: what is loaded, what is about to be needed, and
+whether sessions are fighting over VRAM.
+
+Changing the brain used to be free until the next turn, which then paid the
+full model load (10–30 s for a 20B model). The manager preloads the target
+model in the background as soon as the choice changes, with that model's
+keep_alive, tracks resident models through Ollama's `/api/ps`, and watches
+every generation's `load_duration`: a model that keeps being reloaded, or
+more distinct models in active sessions than Ollama can hold, is logged as
+thrash.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+log = logging.getLogger("LucyC.Residency")
+
+
+class ModelResidency:
+    """Preloads models and watches for VRAM/RAM thrash.
+
+    Args:
+        llm: OllamaLLM (warmup, list_running, keep_alive_for, usage_listeners)
+        max_loaded_models: How many models Ollama can keep loaded (OLLAMA_MAX_LOADED_MODELS)
+        reload_threshold_ms: A generation whose load_duration exceeds this loaded the model
+        num_ctx: Context size used by real calls (preloading with another one forces a reload)
+        session_ttl_s: A session counts as active this long after its last turn
+        thrash_window_s / thrash_reloads: This many reloads of one model within the window is thrash
+    """
+
+    def __init__(self, llm: Any, max_loaded_models: int = 2, reload_threshold_ms: float = 1500.0,
+                 num_ctx: int | None = None, session_ttl_s: float = 600.0,
+                 thrash_window_s: float = 600.0, thrash_reloads: int = 3, ps_ttl_s: float = 5.0):
+        self.llm = llm
+        self.max_loaded_models = int(max_loaded_models)
+        self.reload_threshold_ms = float(reload_threshold_ms)
+        self.num_ctx = num_ctx
+        self.session_ttl_s = float(session_ttl_s)
+        self.thrash_window_s = float(thrash_window_s)
+        self.thrash_reloads = int(thrash_reloads)
+        self.ps_ttl_s = float(ps_ttl_s)
+
+        self._lock = threading.Lock()
+        self._preloading: Dict[str, threading.Thread] = {}
+        self._preload_state: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, tuple[str, float]] = {}  # session -> (model, last seen)
+        self._loads: Dict[str, Deque[float]] = {}
+        self._resident: List[Dict[str, Any]] = []
+        self._resident_at = 0.0
+        self.thrash_warnings = 0
+        llm.usage_listeners.append(self.note_usage)
+
+    # --- preloading -----------------------------------------------------------
+
+    def preload(self, model: str) -> bool:
+        """Start loading `model` in the background. False if it's already resident or loading."""
+        if not model:
+            return False
+        with self._lock:
+            if model in self._preloading:
+                return False
+        if model in self.resident_models():
+            return False
+
+        def run():
+            start = time.time()
+            try:
+                self.llm.warmup(model, num_ctx=self.num_ctx)
+                state = {"state": "ready", "load_s": round(time.time() - start, 2)}
+                log.info("Preloaded %s in %.1fs (keep_alive=%s)", model, time.time() - start,
+                         self.llm.keep_alive_for(model))
+            except Exception as e:
+                state = {"state": "failed", "error": str(e)}
+                log.warning("Preload of %s failed: %s", model, e)
+            with self._lock:
+                self._preloading.pop(model, None)
+                self._preload_state[model] = state
+                self._resident_at = 0.0  # refresh /api/ps on next look
+
+        t = threading.Thread(target=run, name=f"preload-{model}", daemon=True)
+        with self._lock:
+            self._preloading[model] = t
+            self._preload_state[model] = {"state": "loading"}
+        t.start()
+        return True
+
+    def wait(self, model: str, timeout: float | None = None) -> None:
+        """Block until a pending preload of `model` finishes (no-op if none)."""
+        with self._lock:
+            t = self._preloading.get(model)
+        if t is not None:
+            t.join(timeout)
+
+    # --- session assignments ----------------------------------------------------
+
+    def assign(self, session_user: str, model: str, preload: bool = True) -> None:
+        """Record that a session now uses `model`; preload it and warn if active sessions can't all fit."""
+        now = time.time()
+        with self._lock:
+            self._sessions[session_user] = (model, now)
+            active = {m for m, seen in self._sessions.values() if now - seen <= self.session_ttl_s}
+        if len(active) > self.max_loaded_models:
+            self.thrash_warnings += 1
+            log.warning("Active sessions use %d models (%s) but Ollama keeps %d loaded: turns will swap "
+                        "weights back and forth", len(active), ", ".join(sorted(active)), self.max_loaded_models)
+        if preload:
+            self.preload(model)
+
+    def active_models(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            return sorted({m for m, seen in self._sessions.values() if now - seen <= self.session_ttl_s})
+
+    # --- observation ------------------------------------------------------------
+
+    def note_usage(self, model: str, usage: Dict[str, Any]) -> None:
+        """Listener for every generation: a long load_duration means the model wasn't resident."""
+        if float(usage.get("load_duration_ms") or 0.0) < self.reload_threshold_ms:
+            return
+        now = time.time()
+        with self._lock:
+            loads = self._loads.setdefault(model, deque())
+            loads.append(now)
+            while loads and now - loads[0] > self.thrash_window_s:
+                loads.popleft()
+            count = len(loads)
+            self._resident_at = 0.0
+        log.info("%s was (re)loaded (%.0f ms)", model, usage.get("load_duration_ms"))
+        if count >= self.thrash_reloads:
+            self.thrash_warnings += 1
+            log.warning("%s reloaded %d times in %.0f min: models are evicting each other "
+                        "(raise OLLAMA_MAX_LOADED_MODELS or pin fewer models)",
+                        model, count, self.thrash_window_s / 60)
+
+    def resident(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Ollama's /api/ps (cached a few seconds)."""
+        now = time.time()
+        if refresh or now - self._resident_at > self.ps_ttl_s:
+            try:
+                running = self.llm.list_running()
+                self._resident = [{"name": m.get("name"), "size_gb": round((m.get("size") or 0) / 1e9, 2),
+                                   "vram_gb": round((m.get("size_vram") or 0) / 1e9, 2),
+                                   "expires_at": m.get("expires_at")} for m in running]
+            except Exception as e:
+                log.debug("Could not read /api/ps: %s", e)
+            self._resident_at = now
+        return self._resident
+
+    def resident_models(self) -> List[str]:
+        return [m["name"] for m in self.resident()]
+
+    def report(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            reloads = {m: sum(1 for t in q if now - t <= self.thrash_window_s) for m, q in self._loads.items()}
+            preloads = {m: dict(s) for m, s in self._preload_state.items()}
+        return {
+            "resident": self.resident(),
+            "active_session_models": self.active_models(),
+            "max_loaded_models": self.max_loaded_models,
+            "preloads": preloads,
+            "recent_reloads": reloads,
+            "thrash_warnings": self.thrash_warnings,
+        }
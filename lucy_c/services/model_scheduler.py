@@ -0,0 +1,171 @@
+"""
+Model-grouped turn scheduler.
+
+Each turn runs on its session's model. When sessions with different models
+interleave, Ollama evicts and reloads weights on every other turn. The
+scheduler admits turns so that the model that is already running (or resident)
+drains its backlog before another model is let in:
+
+- Turns for the current model go first, up to `max_batch` in a row while other
+  models are waiting.
+- Then the oldest turn for another model is next; it starts once the running
+  turns finish (or immediately if its model is already resident).
+- A turn that has waited `max_wait_s` goes next regardless of its model, so
+  nobody starves.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+log = logging.getLogger("LucyC.Scheduler")
+
+
+@dataclass
+class _Ticket:
+    model: str
+    session_user: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+class ModelScheduler:
+    """Admits LLM turns grouped by model.
+
+    Args:
+        max_concurrent: Turns allowed to run at once (Ollama's OLLAMA_NUM_PARALLEL is the natural bound)
+        max_batch: Consecutive turns of one model while turns for other models wait
+        max_wait_s: A turn queued this long goes next, whatever its model
+        resident: Returns the models Ollama has loaded (e.g. ModelResidency.resident_models);
+            those can run alongside the current one without a swap
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_batch: int = 4, max_wait_s: float = 20.0,
+                 resident: Callable[[], List[str]] | None = None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = float(max_wait_s)
+        self._resident = resident or (lambda: [])
+
+        self._cond = threading.Condition()
+        self._queue: List[_Ticket] = []
+        self._running: Dict[str, int] = {}
+        self._current: Optional[str] = None
+        self._streak = 0
+        self._waits: Deque[float] = deque(maxlen=512)
+        self.stats = {"granted": 0, "swaps": 0, "fairness_switches": 0, "starved": 0}
+
+    @contextmanager
+    def slot(self, model: str, session_user: str = "") -> Iterator[float]:
+        """Hold a turn slot for `model`; yields how long the turn waited (seconds)."""
+        ticket = _Ticket(model, session_user)
+        resident = self._resident_models()
+        with self._cond:
+            self._queue.append(ticket)
+            self._dispatch(resident)
+            while not ticket.granted:
+                # Wake up periodically so max_wait_s is honored even without releases
+                self._cond.wait(timeout=min(1.0, self.max_wait_s or 1.0))
+                if not ticket.granted:
+                    self._dispatch(resident)
+        waited = time.monotonic() - ticket.enqueued_at
+        self._waits.append(waited)
+        if waited > 1.0:
+            log.info("Turn for %s on %s waited %.1fs in the model queue", session_user or "?", model, waited)
+        try:
+            yield waited
+        finally:
+            resident = self._resident_models()
+            with self._cond:
+                self._running[model] -= 1
+                if not self._running[model]:
+                    del self._running[model]
+                self._dispatch(resident)
+
+    def _resident_models(self) -> List[str]:
+        # Read outside the lock: it may hit Ollama's /api/ps
+        try:
+            return list(self._resident() or [])
+        except Exception as e:
+            log.debug("Could not read resident models: %s", e)
+            return []
+
+    # --- policy (called with the lock held) ---------------------------------------
+
+    def _dispatch(self, resident: List[str]) -> None:
+        granted = False
+        while self._queue and sum(self._running.values()) < self.max_concurrent:
+            ticket = self._pick(resident)
+            if ticket is None:
+                break
+            self._grant(ticket)
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _pick(self, resident: List[str]) -> Optional[_Ticket]:
+        oldest = self._queue[0]
+        others_waiting = any(t.model != self._current for t in self._queue)
+        if time.monotonic() - oldest.enqueued_at >= self.max_wait_s:
+            candidate = oldest
+            forced = "starved"
+        elif self._streak >= self.max_batch and others_waiting:
+            candidate = next(t for t in self._queue if t.model != self._current)
+            forced = "fairness_switches"
+        else:
+            forced = None
+            candidate = (next((t for t in self._queue if t.model == self._current), None)
+                         or next((t for t in self._queue if t.model in resident), None)
+                         or oldest)
+        if self._running and candidate.model not in self._running and candidate.model not in resident:
+            # Loading another model now would evict the running one: let the running turns drain first
+            return None
+        if forced and candidate.model != self._current:
+            self.stats[forced] += 1
+        return candidate
+
+    def _grant(self, ticket: _Ticket) -> None:
+        self._queue.remove(ticket)
+        ticket.granted = True
+        self._running[ticket.model] = self._running.get(ticket.model, 0) + 1
+        if ticket.model == self._current:
+            self._streak += 1
+        else:
+            if self._current is not None:
+                self.stats["swaps"] += 1
+            self._current = ticket.model
+            self._streak = 1
+        self.stats["granted"] += 1
+
+    # --- metrics ----------------------------------------------------------------
+
+    def report(self) -> Dict[str, object]:
+        with self._cond:
+            queued: Dict[str, int] = {}
+            for t in self._queue:
+                queued[t.model] = queued.get(t.model, 0) + 1
+            oldest = time.monotonic() - self._queue[0].enqueued_at if self._queue else 0.0
+            running = dict(self._running)
+            stats = dict(self.stats)
+            current, streak = self._current, self._streak
+        waits = sorted(self._waits)
+        return {
+            "current_model": current,
+            "streak": streak,
+            "running": running,
+            "queued": queued,
+            "queue_depth": sum(queued.values()),
+            "oldest_wait_s": round(oldest, 2),
+            "wait_avg_s": round(sum(waits) / len(waits), 3) if waits else None,
+            "wait_p95_s": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else None,
+            "wait_max_s": round(waits[-1], 3) if waits else None,
+            "limits": {"max_concurrent": self.max_concurrent, "max_batch": self.max_batch,
+                       "max_wait_s": self.max_wait_s},
+            **stats,
+        }
@@ -0,0 +1,131 @@
+"""
+Execution layer for blocking work under the eventlet web server.
+
+`eventlet.monkey_patch()` makes sockets, `time.sleep` and subprocess pipes
+cooperative, but C-extension work (Whisper/CTranslate2, torch TTS, OpenCV,
+Tesseract image prep, lxml parsing) still runs on the single hub thread and
+freezes every connected client, Socket.IO heartbeats included. WorkerPools
+sends that work to eventlet's native thread pool (`eventlet.tpool`), with a
+bounded number of concurrent jobs per pool, and waits for it cooperatively.
+Outside the web app (CLI, tests, worker threads) jobs run inline.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+log = logging.getLogger("LucyC.Offload")
+
+
+def on_eventlet_hub() -> bool:
+    """True when the web app has monkey-patched threads (blocking calls would stall the hub)."""
+    # Only look at eventlet if someone already imported it: importing it from a
+    # worker thread has side effects on `threading` we don't want outside the web app.
+    patcher = sys.modules.get("eventlet.patcher")
+    return patcher is not None and patcher.is_monkey_patched("thread")
+
+
+def call_blocking(func: Callable[[], Any]) -> Any:
+    """Run `func` on a native thread when under the eventlet hub, inline otherwise."""
+    if on_eventlet_hub():
+        from eventlet import tpool
+        return tpool.execute(func)
+    return func()
+
+
+@contextmanager
+def hub_relay(callback: Optional[Callable[..., Any]], interval_s: float = 0.1) -> Iterator[Optional[Callable[..., Any]]]:
+    """A thread-safe stand-in for `callback` while blocking work runs off the hub.
+
+    Socket.IO emits (status callbacks) must run on the hub, not on a tpool
+    thread. Calls made through the relay are queued and replayed on the hub by
+    a green thread every `interval_s`, and once more when the block exits.
+    Outside the web app `callback` itself is yielded.
+    """
+    if callback is None or not on_eventlet_hub():
+        yield callback
+        return
+    import eventlet
+
+    pending: Deque[tuple] = deque()  # append/popleft are atomic across threads
+
+    def replay() -> None:
+        while pending:
+            args, kwargs = pending.popleft()
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                log.warning("Relayed callback failed: %s", e)
+
+    def pump() -> None:
+        while True:
+            replay()
+            eventlet.sleep(interval_s)
+
+    pumper = eventlet.spawn(pump)
+    try:
+        yield lambda *args, **kwargs: pending.append((args, kwargs))
+    finally:
+        pumper.kill()
+        replay()
+
+
+class WorkerPools:
+    """Named, bounded pools for blocking stages ("asr", "tts", "tools").
+
+    Args:
+        sizes: Concurrent jobs per pool; a job for an unknown pool runs unbounded
+    """
+
+    def __init__(self, sizes: Dict[str, int]):
+        self.sizes = {name: max(1, int(n)) for name, n in sizes.items()}
+        # Patched semaphores are green: a job waiting for its pool yields to the hub
+        self._slots = {name: threading.BoundedSemaphore(n) for name, n in self.sizes.items()}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        if on_eventlet_hub():
+            from eventlet import tpool
+            # tpool's threads are shared by every pool (and by warm-up/recall/watcher jobs)
+            tpool.set_num_threads(max(20, sum(self.sizes.values()) + 4))
+
+    def run(self, pool: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `func(*args, **kwargs)` on pool `pool` and return its result (exceptions propagate)."""
+        slot = self._slots.get(pool)
+        queued = time.monotonic()
+        if slot is not None:
+            slot.acquire()
+        started = time.monotonic()
+        try:
+            return call_blocking(lambda: func(*args, **kwargs))
+        finally:
+            if slot is not None:
+                slot.release()
+            self._record(pool, started - queued, time.monotonic() - started)
+
+    def _record(self, pool: str, wait_s: float, run_s: float) -> None:
+        with self._lock:
+            s = self._stats.setdefault(pool, {"jobs": 0, "run_s": deque(maxlen=256), "wait_s": deque(maxlen=256)})
+            s["jobs"] += 1
+            s["run_s"].append(run_s)
+            s["wait_s"].append(wait_s)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {}
+            for pool, s in self._stats.items():
+                runs: Deque[float] = s["run_s"]
+                waits: Deque[float] = s["wait_s"]
+                out[pool] = {
+                    "size": self.sizes.get(pool),
+                    "jobs": s["jobs"],
+                    "run_avg_s": round(sum(runs) / len(runs), 3) if runs else None,
+                    "run_max_s": round(max(runs), 3) if runs else None,
+                    "wait_avg_s": round(sum(waits) / len(waits), 3) if waits else None,
+                }
+        return {"offloaded": on_eventlet_hub(), "pools": out}
@@ -0,0 +1,94 @@
+"""
+Pre-synthesized audio for fixed phrases.
+
+Replies such as "Decime algo.", "No escuché nada.", the connection error
+messages and tool confirmations ("Listo, me lo anoto.") come up over and
+over. Each was synthesized on demand and then lost when the TTS cache
+evicted it. Modules register those phrases here at import time. At startup
+the bank synthesizes each one once for the configured voice and pins it in
+the TTS cache, so it is never evicted.
+
+Tools register their canned phrases with the same hook:
+
+    from lucy_c.services.phrase_bank import register_phrases
+    register_phrases("Listo, me lo anoto.", source="remember")
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+log = logging.getLogger("LucyC.PhraseBank")
+
+# phrase -> who registered it (insertion order = build order)
+_REGISTRY: Dict[str, str] = {}
+_registry_lock = threading.Lock()
+
+
+def register_phrases(*phrases: str, source: str = "core") -> None:
+    """Add fixed phrases to the bank. Registering the same phrase twice is a no-op."""
+    with _registry_lock:
+        for phrase in phrases:
+            phrase = (phrase or "").strip()
+            if phrase:
+                _REGISTRY.setdefault(phrase, source)
+
+
+def registered_phrases() -> Dict[str, str]:
+    with _registry_lock:
+        return dict(_REGISTRY)
+
+
+class PhraseBank:
+    """Synthesizes and pins every registered phrase once.
+
+    Args:
+        pin: text -> True if it is now pinned in the TTS cache (e.g. `SensorySystem.pin`)
+        extra: Phrases from config, on top of the registry
+    """
+
+    def __init__(self, pin: Callable[[str], bool], extra: Iterable[str] = ()):
+        self.pin = pin
+        self.extra = [p for p in extra if p]
+        self._lock = threading.Lock()
+        self.pinned: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.build_s: Optional[float] = None
+
+    def phrases(self) -> List[str]:
+        registry = registered_phrases()
+        return list(registry) + [p for p in dict.fromkeys(self.extra) if p not in registry]
+
+    def build(self) -> Dict[str, object]:
+        """Synthesize and pin all phrases; a phrase that fails is logged and skipped."""
+        start = time.monotonic()
+        phrases = self.phrases()
+        for phrase in phrases:
+            try:
+                ok = self.pin(phrase)
+            except Exception as e:
+                ok = False
+                with self._lock:
+                    self.failed[phrase] = str(e)
+            with self._lock:
+                if ok:
+                    self.pinned.append(phrase)
+                else:
+                    self.failed.setdefault(phrase, "not cached by this TTS provider")
+        with self._lock:
+            self.build_s = round(time.monotonic() - start, 3)
+        log.info("Phrase bank: %d/%d phrases pinned in %.1fs", len(self.pinned), len(phrases), self.build_s)
+        if self.failed:
+            log.warning("Phrase bank: could not pin %s", sorted(self.failed))
+        if not self.pinned and phrases:
+            # Surfaces as a failed (optional) warm-up component
+            raise RuntimeError(f"no phrase could be pinned ({len(phrases)} registered)")
+        return self.report()
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            return {"registered": len(self.phrases()), "pinned": len(self.pinned),
+                    "failed": dict(self.failed), "build_s": self.build_s}
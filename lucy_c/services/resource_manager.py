@@ -0,0 +1,140 @@
+"""
+Idle-based unloading of Lucy's heavy models.
+
+Each managed component exposes a small duck-typed contract:
+
+- `last_used` (float, epoch seconds) updated on every use
+- `is_loaded() -> bool`
+- `unload() -> None` (the next use reloads transparently)
+- `resident_bytes() -> int` (best-effort estimate, 0 if unknown)
+
+The manager sweeps periodically and unloads whatever has been idle longer
+than `idle_unload_s`, so Ollama can reclaim the RAM/VRAM between bursts.
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger("LucyC.Resources")
+
+
+def torch_module_bytes(module: Any) -> int:
+    """Parameter + buffer bytes of a torch nn.Module (0 if it isn't one)."""
+    try:
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+        return int(total)
+    except Exception:
+        return 0
+
+
+def path_bytes(path: str | Path) -> int:
+    """Total size of a file or directory tree (weights on disk as a proxy for resident size)."""
+    p = Path(path)
+    if p.is_file():
+        return p.stat().st_size
+    if not p.is_dir():
+        return 0
+    return sum(f.stat().st_size for f in p.rglob("*") if f.is_file())
+
+
+def release_memory() -> None:
+    """Return freed tensors to the OS/driver after dropping a model reference."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+
+class ResourceManager:
+    """Tracks heavy components and unloads the ones that sit idle."""
+
+    def __init__(self, idle_unload_s: float, check_interval_s: float = 30.0):
+        self.idle_unload_s = float(idle_unload_s)
+        self.check_interval_s = float(check_interval_s)
+        self._components: Dict[str, Any] = {}
+        self._unloads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, component: Any) -> None:
+        with self._lock:
+            self._components[name] = component
+            self._unloads.setdefault(name, 0)
+
+    def sweep(self, now: float | None = None) -> List[str]:
+        """Unload every loaded component idle for longer than idle_unload_s."""
+        if self.idle_unload_s <= 0:
+            return []
+        now = time.time() if now is None else now
+        with self._lock:
+            items = list(self._components.items())
+
+        unloaded = []
+        for name, component in items:
+            if not component.is_loaded():
+                continue
+            idle = now - (component.last_used or 0.0)
+            if idle < self.idle_unload_s:
+                continue
+            size_mb = component.resident_bytes() / (1024 * 1024)
+            try:
+                component.unload()
+            except Exception as e:
+                log.warning("Failed to unload %s: %s", name, e)
+                continue
+            with self._lock:
+                self._unloads[name] += 1
+            unloaded.append(name)
+            log.info("Unloaded %s after %.0fs idle (~%.0f MB)", name, idle, size_mb)
+
+        if unloaded:
+            release_memory()
+        return unloaded
+
+    def start(self) -> None:
+        """Sweep in a background daemon thread (no-op when idle unloading is disabled)."""
+        if self.idle_unload_s <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="resource-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.check_interval_s):
+            try:
+                self.sweep()
+            except Exception as e:
+                log.error("Resource sweep failed: %s", e)
+
+    def report(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            items = list(self._components.items())
+            unloads = dict(self._unloads)
+
+        out: Dict[str, Any] = {}
+        for name, component in items:
+            loaded = component.is_loaded()
+            last_used = component.last_used or None
+            out[name] = {
+                "loaded": loaded,
+                "idle_s": round(now - last_used, 1) if last_used else None,
+                "resident_mb": round(component.resident_bytes() / (1024 * 1024), 1) if loaded else 0.0,
+                "unloads": unloads.get(name, 0),
+            }
+        return out
@@ -0,0 +1,107 @@
+"""
+Boot-time warm-up for Lucy's heavy components.
+
+Loads ASR, embeddings, TTS and the Ollama model in parallel background
+threads and keeps per-component readiness so `/api/health?deep=1` can hold
+load-balancer traffic until the node is warm.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+from lucy_c.services.offload import call_blocking
+
+log = logging.getLogger("LucyC.Warmup")
+
+
+@dataclass
+class ComponentStatus:
+    name: str
+    required: bool = True
+    offload: bool = True
+    state: str = "pending"  # pending | loading | ready | failed
+    load_time_s: Optional[float] = None
+    error: Optional[str] = None
+
+
+class WarmupOrchestrator:
+    """Runs registered loaders once, in parallel, and tracks their readiness."""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._status: Dict[str, ComponentStatus] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._started_at: Optional[float] = None
+
+    def register(self, name: str, loader: Callable[[], Any], required: bool = True, offload: bool = True) -> None:
+        """Add a component. Optional components never block readiness, even if they fail.
+
+        `offload=False` is for loaders that are just network/subprocess I/O (Ollama,
+        mimic3); those cooperate with eventlet and don't need a native thread.
+        """
+        self._loaders[name] = loader
+        self._status[name] = ComponentStatus(name=name, required=required, offload=offload)
+
+    def start(self) -> None:
+        """Spawn one daemon thread per registered component."""
+        if self._started_at is not None:
+            return
+        self._started_at = time.time()
+        for name in self._loaders:
+            t = threading.Thread(target=self._run, args=(name,), name=f"warmup-{name}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _run(self, name: str) -> None:
+        with self._lock:
+            self._status[name].state = "loading"
+        log.info("Warm-up: loading %s...", name)
+        start = time.time()
+        try:
+            if self._status[name].offload:
+                call_blocking(self._loaders[name])
+            else:
+                self._loaders[name]()
+        except Exception as e:
+            elapsed = time.time() - start
+            log.warning("Warm-up: %s failed after %.1fs: %s", name, elapsed, e)
+            with self._lock:
+                status = self._status[name]
+                status.state = "failed"
+                status.error = str(e)
+                status.load_time_s = round(elapsed, 3)
+            return
+
+        elapsed = time.time() - start
+        log.info("Warm-up: %s ready in %.1fs", name, elapsed)
+        with self._lock:
+            status = self._status[name]
+            status.state = "ready"
+            status.load_time_s = round(elapsed, 3)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every loader finished (ready or failed). Returns is_ready()."""
+        deadline = None if timeout is None else time.time() + timeout
+        for t in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            t.join(remaining)
+        return self.is_ready()
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(s.state == "ready" for s in self._status.values() if s.required)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            components = {name: asdict(s) for name, s in self._status.items()}
+        return {
+            "ready": all(c["state"] == "ready" for c in components.values() if c["required"]),
+            "started_at": self._started_at,
+            "components": components,
+        }
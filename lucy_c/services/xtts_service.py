@@ -4,6 +4,7 @@ Coqui TTS with GPU acceleration and voice cloning.
 """
 
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -11,6 +12,7 @@ import numpy as np
 
 from lucy_c.config import TTSConfig
 from lucy_c.mimic3_tts import TTSResult
+from lucy_c.tts_cache import TTSCache
 
 log = logging.getLogger("LucyC.XTTS")
 
@@ -22,10 +24,10 @@ class XTTSService:
         self.cfg = cfg
         self.log = log
         self.model = None
+        self._model_lock = threading.Lock()
+        self.last_used = 0.0
         self.speaker_wav = None
-        self._cache: dict[str, tuple[TTSResult, float]] = {}
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self.cache = TTSCache(max_items=100, log=log)
         self._enabled = False
         
         # Try to initialize
@@ -64,6 +66,35 @@ class XTTSService:
             self.log.error(f"Failed to load XTTS model: {e}")
             raise
     
+    def _ensure_model(self):
+        """Return the loaded model, reloading it if the ResourceManager unloaded it."""
+        self.last_used = time.time()
+        model = self.model
+        if model is not None:
+            return model
+        with self._model_lock:
+            if self.model is None:
+                self._load_model()
+            return self.model
+    
+    def is_loaded(self) -> bool:
+        return self.model is not None
+    
+    def unload(self):
+        """Free the XTTS weights and the audio cache (except pinned phrases); next synthesize reloads."""
+        with self._model_lock:
+            self.model = None
+            self.cache.clear(keep_pinned=True)
+    
+    def resident_bytes(self) -> int:
+        from lucy_c.services.resource_manager import torch_module_bytes
+        model = self.model
+        if model is None:
+            return 0
+        # TTS.api.TTS wraps the actual nn.Module in its synthesizer
+        inner = getattr(getattr(model, "synthesizer", None), "tts_model", None)
+        return torch_module_bytes(inner if inner is not None else model)
+    
     def _load_speaker(self):
         """Load speaker reference audio for voice cloning."""
         speaker_path = getattr(self.cfg, 'speaker_wav', 'data/voices/lucy_ref.wav')
@@ -85,6 +116,11 @@ class XTTSService:
         self.speaker_wav = str(speaker_file.absolute())
         self.log.info(f"Loaded speaker reference: {self.speaker_wav}")
     
+    def warmup(self) -> None:
+        """Run one short synthesis so CUDA kernels and the speaker latents are ready."""
+        if self._enabled:
+            self.synthesize("Hola.")
+    
     def synthesize(self, text: str) -> TTSResult:
         """
         Synthesize speech from text using XTTS.
@@ -100,19 +136,13 @@ class XTTSService:
         
         # Cache check
         cache_key = f"xtts:{text}"
-        current_time = time.time()
-        
-        if cache_key in self._cache:
-            result, _ = self._cache[cache_key]
-            self._cache[cache_key] = (result, current_time)
-            self._cache_hits += 1
-            hit_rate = self._cache_hits / (self._cache_hits + self._cache_misses) * 100
-            self.log.debug(f"TTS Cache HIT ({hit_rate:.1f}%): {text[:30]}")
-            return result
-        
-        self._cache_misses += 1
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
+            model = self._ensure_model()
+            
             # Get language
             language = getattr(self.cfg, 'language', 'es')
             
@@ -121,14 +151,14 @@ class XTTSService:
             
             if self.speaker_wav:
                 # With voice cloning
-                wav = self.model.tts(
+                wav = model.tts(
                     text=text,
                     speaker_wav=self.speaker_wav,
                     language=language
                 )
             else:
                 # Without voice cloning (will use default voice)
-                wav = self.model.tts(
+                wav = model.tts(
                     text=text,
                     language=language
                 )
@@ -142,26 +172,22 @@ class XTTSService:
                 wav = wav[:, 0]
             
             # Get sample rate from model
-            sample_rate = self.model.synthesizer.output_sample_rate if hasattr(self.model, 'synthesizer') else 22050
+            sample_rate = model.synthesizer.output_sample_rate if hasattr(model, 'synthesizer') else 22050
             
             result = TTSResult(
                 audio_f32=wav.astype(np.float32).reshape(-1),
                 sample_rate=sample_rate
             )
             
-            # Cache management (LRU)
-            MAX_CACHE_SIZE = 100
-            if len(self._cache) >= MAX_CACHE_SIZE:
-                items = sorted(self._cache.items(), key=lambda x: x[1][1])
-                evict_count = int(MAX_CACHE_SIZE * 0.3)
-                for key, _ in items[:evict_count]:
-                    del self._cache[key]
-                self.log.info(f"TTS cache evicted {evict_count} items (LRU)")
-            
-            self._cache[cache_key] = (result, current_time)
+            self.cache.put(cache_key, result)
             
             return result
             
         except Exception as e:
             self.log.error(f"XTTS synthesis failed: {e}")
             raise
+
+    def pin(self, text: str) -> bool:
+        """Synthesize `text` (if needed) and keep it in the cache for good."""
+        self.synthesize(text)
+        return self.cache.pin(f"xtts:{text}")
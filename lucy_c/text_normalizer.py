@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import re
+import unicodedata
 
 
 _URL_RE = re.compile(r"https?://\S+")
 
 
+def fold(text: str) -> str:
+    """Case-fold and strip accents (configuración == configuracion)."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
 def normalize_for_tts(text: str) -> str:
     """Make assistant text sound natural when read aloud.
 
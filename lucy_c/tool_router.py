@@ -1,28 +1,77 @@
 from __future__ import annotations
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, Any, Dict, List, Optional
 
+from lucy_c.services.offload import hub_relay
+from lucy_c.services.phrase_bank import register_phrases
+
 @dataclass
 class ToolResult:
     success: bool
     output: str
     tag: str = "⚙️ TOOLS"
+    # Self-describing results ("Ventana 'x' cerrada.") can be the reply as-is:
+    # when every result of a turn sets needs_reflection=False the reflection LLM call is skipped
+    final_reply_hint: Optional[str] = None
+    needs_reflection: bool = True
+
+    @classmethod
+    def done(cls, output: str, tag: str = "⚙️ TOOLS", hint: str | None = None) -> "ToolResult":
+        """Successful result that needs no reflection; `hint` (default: output) is what Lucy says."""
+        return cls(True, output, tag, final_reply_hint=hint or output, needs_reflection=False)
+
+
+@dataclass
+class ToolRun:
+    """Outcome of executing the tool calls in a model reply."""
+    text: str  # reply with tool results appended
+    results: List[ToolResult] = field(default_factory=list)
+
+    @property
+    def needs_reflection(self) -> bool:
+        """False only when tools ran and every result is self-describing."""
+        return not self.results or any(r.needs_reflection or not r.final_reply_hint for r in self.results)
+
+    def reply_from_hints(self) -> str:
+        return " ".join(r.final_reply_hint for r in self.results if r.final_reply_hint)
+
 
 class ToolRouter:
-    def __init__(self):
+    def __init__(self, pools: Any = None):
         self.log = logging.getLogger("LucyC.ToolRouter")
         self.tools: Dict[str, Callable] = {}
+        # Tools registered as blocking (OCR, screenshots, subprocesses, HTML parsing) run on
+        # the "tools" worker pool when one is given, so they don't stall the eventlet hub
+        self.pools = pools
+        self.blocking: set = set()
         # tool_name -> list of forbidden strings in args (basic security)
         self.security_rules: Dict[str, List[str]] = {
             "all": [";", "&&", "||", ">", "<", "$(", "system("]
         }
 
-    def register_tool(self, name: str, func: Callable):
+    def register_tool(self, name: str, func: Callable, blocking: bool = False, phrases: tuple = ()):
+        """Add a tool. `phrases` are its fixed replies ("Listo, me lo anoto."), pre-synthesized by the phrase bank."""
         self.tools[name] = func
+        if blocking:
+            self.blocking.add(name)
+        if phrases:
+            register_phrases(*phrases, source=name)
         self.log.info("Tool registered: %s", name)
 
+    def call(self, name: str, args: List[Any], context: Dict[str, Any]) -> ToolResult:
+        """Invoke one tool, on the worker pool if it was registered as blocking.
+
+        A blocking tool's `status_callback` (progress reports) is relayed back to the hub.
+        """
+        if self.pools is not None and name in self.blocking:
+            with hub_relay(context.get("status_callback")) as relay:
+                if relay is not None:
+                    context = {**context, "status_callback": relay}
+                return self.pools.run("tools", self.tools[name], args, context)
+        return self.tools[name](args, context)
+
     def _validate_security(self, name: str, args_str: str) -> Optional[str]:
         """Check for forbidden patterns in arguments."""
         # Generic rules
@@ -42,6 +91,16 @@ class ToolRouter:
         Parses [[tool_name(args)]] from text and executes them.
         Returns the original text with tool results appended.
         """
+        return self.run(text, context, status_callback=status_callback).text
+
+    def run(self, text: str, context: Dict[str, Any], status_callback: Optional[Callable[[str, str], None]] = None) -> ToolRun:
+        """Like parse_and_execute, but also returns the structured result of every call.
+
+        Blocked, unknown or failing calls are recorded as results that need
+        reflection, so the model gets to explain them. `context` is the turn's
+        (session_user, room, cancel...); `status_callback` is already bound to that room.
+        Once the turn's `cancel` token fires, the remaining tools don't start.
+        """
         import ast
         # Matches [[ name ( args ) ]] - allowing dots in names just in case
         tool_pattern = re.compile(r'\[\[\s*([\w\.]+)\s*\((.*?)\)\s*\]\]', re.DOTALL)
@@ -49,11 +108,18 @@ class ToolRouter:
         
         if not matches:
             self.log.debug("No tool matches found in text.")
-            return text
+            return ToolRun(text)
             
         self.log.info("Parsed %d tool calls: %s", len(matches), matches)
+        if status_callback and "status_callback" not in context:
+            # Long-running tools (memorize_dir) report progress through it
+            context = {**context, "status_callback": status_callback}
         final_response = text
+        results: List[ToolResult] = []
+        cancel = context.get("cancel")
         for tool_name, args_str in matches:
+            if cancel is not None:
+                cancel.check("tools")
             self.log.info("Activating tool: %s(%s)", tool_name, args_str)
             
             # 1. Security Check
@@ -61,6 +127,7 @@ class ToolRouter:
             if sec_error:
                 self.log.warning("Security trigger: %s", sec_error)
                 final_response += f"\n\n[⚠️ SEGURIDAD]: {sec_error}"
+                results.append(ToolResult(False, sec_error, "⚠️ SEGURIDAD"))
                 if status_callback:
                     status_callback(f"⚠️ Bloqueo de seguridad: {tool_name}", "warning")
                 continue
@@ -69,6 +136,7 @@ class ToolRouter:
             if tool_name not in self.tools:
                 self.log.warning("Tool not found: %s", tool_name)
                 final_response += f"\n\n[⚠️ BASE CORE]: Herramienta '{tool_name}' no disponible."
+                results.append(ToolResult(False, f"Herramienta '{tool_name}' no disponible.", "⚠️ BASE CORE"))
                 continue
 
             # 3. Parse Args (Secure AST parsing)
@@ -101,16 +169,19 @@ class ToolRouter:
                     status_msg = status_map.get(tool_name, f"Ejecutando {tool_name}...")
                     status_callback(status_msg, "info")
 
-                result: ToolResult = self.tools[tool_name](args, context)
+                result: ToolResult = self.call(tool_name, args, context)
                 
                 self.log.info("%s result: %s", result.tag, result.output)
                 final_response += f"\n\n[{result.tag}]: {result.output}"
+                results.append(result)
                 
             except (ValueError, SyntaxError) as e:
                 self.log.error("Tool argument parsing failed for '%s': %s", args_str, e)
                 final_response += f"\n\n[⚠️ ERROR SINTAXIS]: No pude entender los argumentos de {tool_name}: {e}"
+                results.append(ToolResult(False, str(e), "⚠️ ERROR SINTAXIS"))
             except Exception as e:
                 self.log.error("Tool execution failed: %s", e)
                 final_response += f"\n\n[Moltbot Error]: Hubo un fallo inesperadamente ejecutando {tool_name}."
+                results.append(ToolResult(False, str(e), "Moltbot Error"))
                 
-        return final_response
+        return ToolRun(final_response, results)
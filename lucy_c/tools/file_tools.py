@@ -55,6 +55,6 @@ def tool_write_file(args: list[str], ctx: dict) -> ToolResult:
         # Ensure parent directories exist
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(content, encoding="utf-8")
-        return ToolResult(True, f"Archivo escrito exitosamente: {args[0]}", "📁 ARCHIVOS")
+        return ToolResult.done(f"Archivo escrito exitosamente: {args[0]}", "📁 ARCHIVOS", hint=f"Listo, guardé {args[0]}.")
     except Exception as e:
         return ToolResult(False, f"Error escribiendo archivo: {e}", "📁 ARCHIVOS")
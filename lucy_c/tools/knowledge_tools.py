@@ -32,17 +32,21 @@ def create_knowledge_tools(memory_engine):
             if not path.is_file():
                 return ToolResult(False, f"'{file_path}' no es un archivo.", "📚 MEMORIA")
             
-            # Check file size (limit to 10MB to avoid memory issues)
-            size_mb = path.stat().st_size / (1024 * 1024)
-            if size_mb > 10:
-                return ToolResult(False, f"El archivo es muy grande ({size_mb:.1f}MB). Límite: 10MB.", "📚 MEMORIA")
+            # Ingest the file (streamed in blocks, so there is no size cap;
+            # incremental: only new/edited chunks get embedded)
+            stats = memory_engine.upsert_file(str(path))
             
-            # Ingest the file
-            num_chunks = memory_engine.ingest_file(str(path))
+            if stats.total and not stats.added and not stats.removed:
+                return ToolResult(
+                    True,
+                    f"'{path.name}' ya estaba memorizado y no cambió ({stats.total} fragmentos).",
+                    "📚 MEMORIA"
+                )
             
             return ToolResult(
                 True, 
-                f"Memoricé '{path.name}' exitosamente ({num_chunks} fragmentos guardados). Ahora puedo consultarlo cuando lo necesite.",
+                f"Memoricé '{path.name}' exitosamente ({stats.total} fragmentos; {stats.added} nuevos, "
+                f"{stats.removed} eliminados). Ahora puedo consultarlo cuando lo necesite.",
                 "📚 MEMORIA"
             )
             
@@ -52,6 +56,49 @@ def create_knowledge_tools(memory_engine):
             log.error("Failed to memorize file %s: %s", file_path, e, exc_info=True)
             return ToolResult(False, f"Error al memorizar archivo: {e}", "📚 MEMORIA")
     
+    def tool_memorize_dir(args, ctx):
+        """Ingest every document (text, PDF, DOCX, HTML, EPUB) under a directory into Lucy's semantic memory.
+        
+        Files are extracted in parallel worker processes; progress is reported
+        through the status callback when the caller provides one.
+        
+        Args:
+            args[0]: dir_path (str) - Directory to memorize
+            args[1]: pattern (str, optional) - Glob relative to the directory (default: all files)
+        """
+        if not args:
+            return ToolResult(False, "Falta la ruta de la carpeta a memorizar.", "📚 MEMORIA")
+        
+        dir_path = args[0]
+        pattern = args[1] if len(args) > 1 and args[1] else "**/*"
+        log.info("Attempting to memorize dir: %s (%s)", dir_path, pattern)
+        
+        try:
+            path = Path(dir_path).expanduser().resolve()
+            if not path.is_dir():
+                return ToolResult(False, f"'{dir_path}' no es una carpeta.", "📚 MEMORIA")
+            
+            status_callback = ctx.get("status_callback")
+            
+            def progress(done, total, name):
+                if status_callback:
+                    status_callback(f"Memorizando {done}/{total}: {name}", "info")
+            
+            stats = memory_engine.ingest_dir(str(path), pattern=pattern, progress=progress)
+            
+            if not stats.files:
+                return ToolResult(False, f"No encontré documentos para memorizar en '{path.name}'.", "📚 MEMORIA")
+            
+            msg = (f"Memoricé {stats.synced}/{stats.files} archivos de '{path.name}' "
+                   f"({stats.added} fragmentos nuevos, {stats.removed} eliminados, {stats.unchanged} sin cambios).")
+            if stats.failed:
+                msg += f" Fallaron: {', '.join(Path(f).name for f in stats.failed[:5])}"
+            return ToolResult(stats.synced > 0, msg, "📚 MEMORIA")
+        
+        except Exception as e:
+            log.error("Failed to memorize dir %s: %s", dir_path, e, exc_info=True)
+            return ToolResult(False, f"Error al memorizar carpeta: {e}", "📚 MEMORIA")
+    
     def tool_recall(args, ctx):
         """Search Lucy's semantic memory for relevant information.
         
@@ -119,6 +166,7 @@ def create_knowledge_tools(memory_engine):
     
     return {
         "memorize_file": tool_memorize_file,
+        "memorize_dir": tool_memorize_dir,
         "recall": tool_recall,
         "memory_stats": tool_memory_stats
     }
@@ -60,7 +60,8 @@ def tool_os_run(args, ctx):
             # We use shell=True for complex commands with expansion if needed, 
             # but shlex.split + Popen is safer. However, expanduser already did the heavy lifting.
             subprocess.Popen(shlex.split(raw_cmd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            return ToolResult(True, f"Ejecutando '{raw_cmd}' en segundo plano.", "🖥️ OS")
+            return ToolResult.done(f"Ejecutando '{raw_cmd}' en segundo plano.", "🖥️ OS",
+                                   hint=f"Listo, abrí {shlex.split(raw_cmd)[0]}.")
         else:
             res = subprocess.run(
                 shlex.split(raw_cmd), 
@@ -135,7 +136,7 @@ def tool_window_manager(args, ctx):
             if result.returncode != 0:
                 return ToolResult(False, f"No encontré una ventana con '{target}'. Usá 'list' para ver las ventanas disponibles.", "🪟 VENTANAS")
             
-            return ToolResult(True, f"Ventana '{target}' traída al frente.", "🪟 VENTANAS")
+            return ToolResult.done(f"Ventana '{target}' traída al frente.", "🪟 VENTANAS")
         
         elif action == "minimize":
             if not target:
@@ -166,7 +167,7 @@ def tool_window_manager(args, ctx):
                 timeout=5
             )
             
-            return ToolResult(True, f"Ventana '{target}' minimizada.", "🪟 VENTANAS")
+            return ToolResult.done(f"Ventana '{target}' minimizada.", "🪟 VENTANAS")
         
         elif action == "close":
             if not target:
@@ -182,7 +183,7 @@ def tool_window_manager(args, ctx):
             if result.returncode != 0:
                 return ToolResult(False, f"No encontré ventana '{target}' para cerrar.", "🪟 VENTANAS")
             
-            return ToolResult(True, f"Ventana '{target}' cerrada.", "🪟 VENTANAS")
+            return ToolResult.done(f"Ventana '{target}' cerrada.", "🪟 VENTANAS")
         
         else:
             return ToolResult(False, f"Acción desconocida: {action}. Usa: list, focus, minimize, close", "🪟 VENTANAS")
@@ -112,7 +112,7 @@ def tool_os_run_secure(args, ctx):
         if is_gui:
             log.info("Launching GUI application in background: %s", parts)
             subprocess.Popen(parts, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, preexec_fn=os.setpgrp)
-            return ToolResult(True, f"Ejecutando '{raw_cmd}' en segundo plano.", "🖥️ OS")
+            return ToolResult.done(f"Ejecutando '{raw_cmd}' en segundo plano.", "🖥️ OS", hint=f"Listo, abrí {binary}.")
 
         # Run with shell=False for maximum security
         res = subprocess.run(
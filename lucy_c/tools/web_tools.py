@@ -52,7 +52,7 @@ def tool_open_url(args, ctx):
     try:
         # webbrowser.open() is much more secure in Linux/Snap than subprocess.Popen
         webbrowser.open(url)
-        return ToolResult(True, f"Abriendo {url} en el navegador del sistema.", "🌐 RED")
+        return ToolResult.done(f"Abriendo {url} en el navegador del sistema.", "🌐 RED", hint=f"Abriendo {url} en el navegador.")
     except Exception as e:
         log.error("Failed to launch browser: %s", e)
         return ToolResult(False, f"Error al abrir el navegador: {e}", "🌐 RED")
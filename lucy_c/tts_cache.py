@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from lucy_c.interfaces.audio import TTSResult
+
+
+class TTSCache:
+    """
+    In-memory audio cache shared by the TTS providers.
+
+    Least-recently-used entries are evicted in chunks when the cache is full.
+    Pinned entries (the phrase bank: "Decime algo.", canned confirmations...)
+    never count toward the limit and are never evicted.
+    """
+
+    def __init__(self, max_items: int = 100, evict_fraction: float = 0.3, log: logging.Logger | None = None):
+        self.max_items = max_items
+        self.evict_fraction = evict_fraction
+        self.log = log or logging.getLogger("LucyC.TTSCache")
+        self._lock = threading.Lock()
+        self._items: Dict[str, Tuple[TTSResult, float]] = {}  # key -> (result, last access)
+        self._pinned: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[TTSResult]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items[key] = (entry[0], time.time())
+            self.hits += 1
+            hit_rate = self.hits / (self.hits + self.misses) * 100
+        self.log.debug("TTS Cache HIT (%.1f%% hit rate): %s", hit_rate, key[:40])
+        return entry[0]
+
+    def put(self, key: str, result: TTSResult) -> None:
+        with self._lock:
+            unpinned = [k for k in self._items if k not in self._pinned]
+            if len(unpinned) >= self.max_items:
+                # Evict the oldest chunk by access time
+                unpinned.sort(key=lambda k: self._items[k][1])
+                evict_count = max(1, int(self.max_items * self.evict_fraction))
+                for k in unpinned[:evict_count]:
+                    del self._items[k]
+                self.log.info("TTS cache evicted %d items (LRU)", evict_count)
+            self._items[key] = (result, time.time())
+
+    def pin(self, key: str) -> bool:
+        """Protect a cached entry from eviction. False if it isn't cached."""
+        with self._lock:
+            if key not in self._items:
+                return False
+            self._pinned.add(key)
+            return True
+
+    def clear(self, keep_pinned: bool = True) -> None:
+        with self._lock:
+            if keep_pinned:
+                self._items = {k: v for k, v in self._items.items() if k in self._pinned}
+            else:
+                self._items.clear()
+                self._pinned.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"items": len(self._items), "pinned": len(self._pinned), "hits": self.hits,
+                    "misses": self.misses, "hit_rate": round(self.hits / lookups, 3) if lookups else None}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import io
 import logging
 import os
 import time
@@ -10,63 +11,63 @@ from pathlib import Path
 import eventlet
 eventlet.monkey_patch()
 
-from flask import Flask, jsonify, render_template, request, send_from_directory
+from flask import Flask, jsonify, render_template, request, send_file, send_from_directory
 from flask_socketio import SocketIO, emit
 
 from lucy_c.audio_codec import decode_audio_bytes_to_f32_mono
 from lucy_c.config import LucyConfig
 from lucy_c.history_store import HistoryItem, HistoryStore, default_history_dir
 from lucy_c.facts_store import FactsStore, default_facts_dir
+from lucy_c.web.events import SessionEvents, room_for
 
 # New Architecture Imports
 from lucy_c.core.orchestrator import LucyOrchestrator
 from lucy_c.core.cognitive import CognitiveEngine
+from lucy_c.core.model_router import ModelRouter
+from lucy_c.core.generation import GenerationPolicy
 from lucy_c.core.senses import SensorySystem
 from lucy_c.core.actions import ActionController
 from lucy_c.tool_router import ToolRouter
+from lucy_c.services.warmup import WarmupOrchestrator
+from lucy_c.services.resource_manager import ResourceManager
+from lucy_c.services.memory_watcher import MemoryWatcher
+from lucy_c.services.auto_recall import AutoRecall
+from lucy_c.services.model_residency import ModelResidency
+from lucy_c.services.model_scheduler import ModelScheduler
+from lucy_c.services.admission import AdmissionController, Busy
+from lucy_c.services.offload import WorkerPools
+from lucy_c.services.audio_store import AudioStore
+from lucy_c.services.phrase_bank import PhraseBank
+from lucy_c.services.cancellation import TurnTracker
+from lucy_c.intent_router import IntentRouter
 
 # Providers
 from lucy_c.ollama_llm import OllamaLLM
 from lucy_c.clawdbot_llm import ClawdbotLLM
 from lucy_c.asr import FasterWhisperASR
 from lucy_c.mimic3_tts import Mimic3TTS
+from lucy_c.interfaces.audio import ASRProvider, TTSProvider
 
 log = logging.getLogger("LucyC.Web")
 
-def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
+def create_app(cfg: LucyConfig | None = None, *, asr: ASRProvider | None = None, tts: TTSProvider | None = None,
+               history: HistoryStore | None = None, facts: FactsStore | None = None,
+               memory_enabled: bool = True) -> tuple[Flask, SocketIO, LucyOrchestrator]:
+    """Build the web app.
+
+    The arguments are for tests and the load-test harness (lucy_c.bench): a ready
+    config instead of config.yaml, stand-in ASR/TTS providers, throwaway stores,
+    and no semantic memory.
+    """
     app = Flask(__name__, template_folder="templates", static_folder="static")
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "lucy-c-dev-secret")
     app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
 
     socketio = SocketIO(app, cors_allowed_origins="*")
 
-    # Status Callback for WebSocket feedback
-    def status_callback(message: str, type: str = "info"):
-        socketio.emit("status", {"message": message, "type": type})
-        
-        # Detect tool execution and emit structured event (Badge System)
-        tool_badges = {
-            "Mirando pantalla": ("screenshot", "sensor", "👁️"),
-            "Haciendo clic": ("click", "actuator", "🖐️"),
-            "Escribiendo": ("type", "actuator", "⌨️"),
-            "Moviendo": ("move", "actuator", "🖱️"),
-            "Leyendo archivo": ("read_file", "sensor", "📄"),
-            "Escribiendo archivo": ("write_file", "actuator", "📝"),
-            "Guardando en memoria": ("remember", "memory", "🧠"),
-            "Buscando en internet": ("search_web", "sensor", "🔍"),
-            "Abriendo aplicación": ("os_run", "actuator", "🖐️"),
-        }
-        
-        for msg_pattern, (tool_name, category, emoji) in tool_badges.items():
-            if msg_pattern.lower() in message.lower():
-                socketio.emit("tool_event", {
-                    "tool": tool_name,
-                    "category": category,
-                    "emoji": emoji,
-                    "status": "running",
-                    "message": message
-                })
-                break
+    # Status / tool badge events go to the room of the session whose turn produced them
+    events = SessionEvents(socketio)
+    status_callback = events.status
 
     # Configuration & Persistence
     root = Path(__file__).resolve().parents[2]
@@ -79,14 +80,14 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
     except ImportError:
         pass
 
-    cfg = LucyConfig.load(cfg_path)
+    cfg = cfg or LucyConfig.load(cfg_path)
     
     # Overrides from Env
     if os.environ.get("CLAWDBOT_GATEWAY_TOKEN"):
         cfg.clawdbot.token = os.environ.get("CLAWDBOT_GATEWAY_TOKEN")
 
-    history = HistoryStore(default_history_dir())
-    facts = FactsStore(default_facts_dir())
+    history = history or HistoryStore(default_history_dir())
+    facts = facts or FactsStore(default_facts_dir())
 
     # --- Dependency Injection Construction ---
     
@@ -104,28 +105,144 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
     else:
         llm = OllamaLLM(cfg.ollama)
     
-    # 2. Audio Components
-    asr = FasterWhisperASR(cfg.asr)
-    tts = Mimic3TTS(cfg.tts)
-    senses = SensorySystem(asr=asr, tts=tts)
+    # 2. Audio Components (transcription/synthesis run on native worker threads, not the hub)
+    pools = WorkerPools({"asr": cfg.workers.asr, "tts": cfg.workers.tts, "tools": cfg.workers.tools})
+    asr = asr or FasterWhisperASR(cfg.asr)
+    tts = tts or Mimic3TTS(cfg.tts)
+    senses = SensorySystem(asr=asr, tts=tts, pools=pools)
+    
+    # Semantic memory (optional: chromadb + sentence-transformers)
+    memory = None
+    if memory_enabled:
+        try:
+            from lucy_c.rag_engine import MemoryEngine
+            memory = MemoryEngine(cfg=cfg.memory)
+        except Exception as e:
+            log.warning("RAG memory not available: %s. Memory features disabled.", e)
     
     # 3. Cognitive Engine
-    brain = CognitiveEngine(llm=llm, history=history, facts=facts)
+    # Small/large model cascade (ollama.draft_model); a no-op router when it's not configured
+    model_router = ModelRouter(cfg.ollama) if isinstance(llm, OllamaLLM) else None
+    generation = GenerationPolicy(cfg.generation)
+    residency = None
+    if isinstance(llm, OllamaLLM):
+        residency = ModelResidency(llm, max_loaded_models=cfg.ollama.max_loaded_models,
+                                   reload_threshold_ms=cfg.ollama.reload_threshold_ms,
+                                   num_ctx=cfg.generation.num_ctx)
+    brain = CognitiveEngine(llm=llm, history=history, facts=facts, router=model_router, policy=generation)
     
     # 4. Action Controller (Body)
-    tool_router = ToolRouter()
+    tool_router = ToolRouter(pools=pools)
     # Note: Actions need access to LLM for Vision tools, hence passing `llm`
-    body = ActionController(cfg=cfg, tool_router=tool_router, llm_provider=llm)
+    body = ActionController(cfg=cfg, tool_router=tool_router, llm_provider=llm, memory=memory)
     
-    # 5. Orchestrator
+    # 5. Orchestrator (with speculative memory recall when memory is available)
+    recall = None
+    if memory and cfg.memory.auto_recall:
+        recall = AutoRecall(
+            memory,
+            min_similarity=cfg.memory.auto_recall_min_similarity,
+            n_results=cfg.memory.auto_recall_results,
+            timeout_ms=cfg.memory.auto_recall_timeout_ms,
+        )
+    # Fast path for trivial intents; LUCY_FAST_PATH=0 turns it off without touching the config
+    intents = IntentRouter(
+        tool_router,
+        enabled=cfg.intents.enabled and os.environ.get("LUCY_FAST_PATH", "1") != "0",
+        disabled=cfg.intents.disabled,
+        encode=memory.embeddings.encode if memory and cfg.intents.embedding_classifier else None,
+        min_similarity=cfg.intents.min_similarity,
+        max_chars=cfg.intents.max_chars,
+    )
+    # Turns are queued per model: the loaded model drains its backlog before Ollama swaps
+    scheduler = None
+    if cfg.scheduler.enabled:
+        scheduler = ModelScheduler(
+            max_concurrent=cfg.scheduler.max_concurrent,
+            max_batch=cfg.scheduler.max_batch,
+            max_wait_s=cfg.scheduler.max_wait_s,
+            resident=residency.resident_models if residency else None,
+        )
+    # Backpressure: bounded concurrency and wait queue per stage, 429 / "busy" beyond that
+    admission = None
+    if cfg.admission.enabled:
+        admission = AdmissionController(
+            {"llm": cfg.admission.llm, "asr": cfg.admission.asr, "tts": cfg.admission.tts},
+            max_queue=cfg.admission.max_queue,
+            queue_timeout_s=cfg.admission.queue_timeout_s,
+        )
+    # One running turn per session: a newer message or a barge-in cancels the old one
+    turns = TurnTracker(supersede=cfg.cancellation.supersede)
     orchestrator = LucyOrchestrator(
         cfg=cfg,
         brain=brain,
         senses=senses,
         body=body,
-        status_callback=status_callback
+        status_callback=status_callback,
+        recall=recall,
+        intents=intents,
+        scheduler=scheduler,
+        admission=admission,
+        turns=turns
     )
 
+    # Speech for /api/chat replies: prefetched in the background or synthesized on first fetch
+    audio_store = AudioStore(orchestrator.speak, max_items=cfg.tts.audio_max_items, ttl_s=cfg.tts.audio_ttl_s)
+
+    def session_model(session_user: str) -> str:
+        """The model a session's turns run on, by name (history, /api/models).
+
+        Turns themselves get `orchestrator.session_model()`, which is None on the
+        default model: the CognitiveEngine only consults the draft cascade then.
+        """
+        return orchestrator.session_model(session_user) or cfg.ollama.model
+
+    def busy_payload(e: Busy) -> dict:
+        return {"ok": False, "error": "busy", "stage": e.stage, "retry_after_s": e.retry_after_s,
+                "message": f"Estoy con muchos pedidos a la vez. Probá de nuevo en {e.retry_after_s} s."}
+
+    # 6. Warm-up: load heavy models in the background so the first user doesn't pay for it
+    warmup = WarmupOrchestrator()
+    optional = set(cfg.warmup.optional or [])
+    warmup.register("asr", asr.warmup, required="asr" not in optional)
+    warmup.register("tts", tts.warmup, required="tts" not in optional, offload=False)
+    # Fixed phrases are synthesized once and pinned; never blocks readiness (synthesis runs on the tts pool)
+    phrase_bank = PhraseBank(senses.pin, extra=cfg.tts.phrases) if cfg.tts.phrase_bank else None
+    if phrase_bank:
+        warmup.register("phrase_bank", phrase_bank.build, required=False, offload=False)
+    if memory:
+        warmup.register("embeddings", memory.warmup, required="embeddings" not in optional)
+    if isinstance(llm, OllamaLLM):
+        warmup.register("llm", lambda: llm.warmup(num_ctx=cfg.generation.num_ctx),
+                        required="llm" not in optional, offload=False)
+        if model_router and model_router.enabled:
+            warmup.register("llm_draft", lambda: llm.warmup(cfg.ollama.draft_model, num_ctx=cfg.generation.num_ctx),
+                            required=False, offload=False)
+    if cfg.warmup.enabled:
+        warmup.start()
+
+    # 7. Idle unloading: give RAM back to Ollama between bursts
+    resources = ResourceManager(cfg.resources.idle_unload_s, cfg.resources.check_interval_s)
+    resources.register("asr", asr)
+    if memory:
+        resources.register("embeddings", memory)
+    if hasattr(tts, "unload"):
+        resources.register("tts", tts)
+    resources.start()
+
+    # 8. Keep watched directories in memory, yielding to live turns
+    watcher = None
+    if memory and cfg.memory.watch_dirs:
+        watcher = MemoryWatcher(
+            memory,
+            cfg.memory.watch_dirs,
+            debounce_s=cfg.memory.watch_debounce_s,
+            poll_interval_s=cfg.memory.watch_poll_interval_s,
+            pause_s=cfg.memory.watch_pause_s,
+            is_busy=orchestrator.is_busy,
+        )
+        watcher.start()
+
     # API Routes
     @app.route("/")
     def index():
@@ -133,7 +250,13 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
 
     @app.route("/api/health")
     def health():
-        return jsonify({"ok": True})
+        if request.args.get("deep") not in ("1", "true"):
+            return jsonify({"ok": True})
+        # Deep check: 503 until every required component is warm, so a load balancer holds traffic.
+        if not cfg.warmup.enabled:
+            return jsonify({"ok": True, "warmup": "disabled"})
+        report = warmup.report()
+        return jsonify({"ok": report["ready"], **report}), (200 if report["ready"] else 503)
 
     @app.route("/api/models")
     def models():
@@ -151,7 +274,8 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
                 models_list = llm.list_models()
                 models_data = [{"name": m, "size_gb": 0, "family": "unknown"} for m in models_list]
             
-            current_model = cfg.ollama.model if current_provider == "ollama" else (cfg.clawdbot.agent_id or "lucy")
+            session_user = (request.args.get("session_user") or "").strip() or "lucy-c:anonymous"
+            current_model = session_model(session_user) if current_provider == "ollama" else (cfg.clawdbot.agent_id or "lucy")
             
             return jsonify({
                 "models": models_data,
@@ -167,8 +291,18 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
         payload = request.get_json(silent=True) or {}
         text = (payload.get("message") or "").strip()
         session_user = (payload.get("session_user") or "").strip() or "lucy-c:anonymous"
+        model = orchestrator.session_model(session_user)  # None: default model, draft cascade applies
         
-        result = orchestrator.process_text_input(text, session_user=session_user)
+        # Text goes back right away; audio is a handle unless the client asks for the legacy inline WAV
+        audio_mode = "inline" if payload.get("inline_audio") else ("none" if payload.get("audio") is False else "handle")
+        try:
+            result = orchestrator.process_text_input(text, session_user=session_user, model=model,
+                                                     room=room_for(session_user), speak=audio_mode == "inline")
+        except Busy as e:
+            return jsonify(busy_payload(e)), 429, {"Retry-After": str(e.retry_after_s)}
+        if result.cancelled:
+            # A newer message of this session took over; this reply was never produced
+            return jsonify({"ok": False, "error": "cancelled"}), 409
         
         # Save to history (Orchestrator brain implies it, but we double save here or rely on brain?
         # CognitiveEngine uses history for *context building* but does it *write* to history?
@@ -181,7 +315,7 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
                 session_user=session_user,
                 kind="text",
                 llm_provider=cfg.llm.provider,
-                ollama_model=cfg.ollama.model,
+                ollama_model=model or cfg.ollama.model,
                 user_text=text,
                 transcript=text,
                 reply=result.reply,
@@ -189,6 +323,10 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
         )
 
         resp = {"ok": True, "reply": result.reply}
+        if audio_mode == "handle" and result.reply.strip():
+            prefetch = payload.get("prefetch", cfg.tts.http_prefetch)
+            audio_id = audio_store.submit(result.reply, prefetch=bool(prefetch))
+            resp["audio"] = {"id": audio_id, "url": f"/api/audio/{audio_id}", "mime": "audio/wav"}
         if result.reply_wav:
              resp["audio"] = {
                  "mime": "audio/wav",
@@ -197,6 +335,23 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
              }
         return jsonify(resp)
 
+    @app.route("/api/audio/<audio_id>")
+    def audio_api(audio_id: str):
+        clip = audio_store.get(audio_id)
+        if clip is None:
+            return jsonify({"ok": False, "error": "not_found"}), 404
+        if clip.state != "ready":
+            return jsonify({"ok": False, "error": "tts_unavailable"}), 503, {"Retry-After": "2"}
+        remaining = max(0, int(audio_store.ttl_s - (time.time() - clip.created)))
+        # The bytes behind an id never change: ETag/If-None-Match and Range (seeking, resumed downloads) apply
+        resp = send_file(io.BytesIO(clip.wav), mimetype="audio/wav", etag=clip.etag, conditional=True,
+                         max_age=remaining, download_name=f"{audio_id}.wav")
+        resp.cache_control.public = False
+        resp.cache_control.private = True
+        resp.cache_control.immutable = True
+        resp.headers["X-Sample-Rate"] = str(clip.sample_rate)
+        return resp
+
     @app.route("/api/history")
     def history_api():
         session_user = (request.args.get("session_user") or "").strip() or "lucy-c:anonymous"
@@ -208,53 +363,117 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
         import psutil
         import platform
         mem = psutil.virtual_memory()
+        tts_cache = getattr(tts, "cache", None)  # providers without a cache have no stats to report
         return jsonify({
             "ok": True,
             "cpu": psutil.cpu_percent(),
             "memory_used_gb": round(mem.used / (1024**3), 2),
-            "os": f"{platform.system()} {platform.release()}"
+            "os": f"{platform.system()} {platform.release()}",
+            "asr": asr.stats(),
+            "models": resources.report(),
+            "memory_watcher": watcher.report() if watcher else None,
+            "auto_recall": recall.report() if recall else None,
+            "intents": intents.report(),
+            "reflection": orchestrator.reflection_report(),
+            "llm_routing": model_router.report() if model_router else None,
+            "generation": generation.report(),
+            "llm_residency": residency.report() if residency else None,
+            "scheduler": scheduler.report() if scheduler else None,
+            "admission": admission.report() if admission else None,
+            "workers": pools.report(),
+            "socket_events": events.report(),
+            "deferred_audio": audio_store.report(),
+            "cancellation": turns.report(),
+            "phrase_bank": {**phrase_bank.report(), "tts_cache": tts_cache.stats() if tts_cache else None}
+                           if phrase_bank else None,
         })
 
+    @app.route("/api/intents", methods=["GET", "POST"])
+    def intents_api():
+        # Runtime kill switch for the fast path: POST {"enabled": false}
+        if request.method == "POST":
+            payload = request.get_json(silent=True) or {}
+            if "enabled" in payload:
+                intents.enabled = bool(payload["enabled"])
+                log.info("Intent fast path %s", "enabled" if intents.enabled else "disabled")
+        return jsonify({"ok": True, **intents.report()})
+
     @app.route("/api/settings/virtual_display")
     def settings_display():
         return jsonify({"ok": True, "enabled": False})
 
     # SocketIO Events
     @socketio.on("connect")
-    def on_connect():
+    def on_connect(auth=None):
+        # The client sends its session id on (re)connect so turn events reach it from the start
+        session_user = (auth or {}).get("session_user") if isinstance(auth, dict) else None
+        if session_user:
+            events.join(session_user)
         emit("status", {"message": "Connected (Core v2.0)", "type": "success"})
 
+    @socketio.on("update_config")
+    def on_update_config(data):
+        # Brain choice is per session (FactsStore), never written into the shared cfg
+        model = ((data or {}).get("ollama_model") or "").strip()
+        session_user = (data or {}).get("session_user") or "lucy-c:anonymous"
+        events.join(session_user)
+        if not model:
+            return
+        facts.set_fact(session_user, "selected_model", model)
+        facts.set_fact(session_user, "selected_provider", "ollama")
+        if residency:
+            residency.assign(session_user, model)
+        log.info("Brain for %s: %s", session_user, model)
+        emit("status", {"message": f"Cerebro: {model}", "type": "success"})
+
+    @socketio.on("barge_in")
+    def on_barge_in(data):
+        # The user started talking over Lucy: stop the turn still being generated for them
+        if not cfg.cancellation.barge_in:
+            return
+        session_user = (data or {}).get("session_user") or "lucy-c:anonymous"
+        if orchestrator.cancel_turn(session_user, "barge_in"):
+            events.emit("status", {"message": "Interrumpido", "type": "info"}, room=room_for(session_user))
+
     @socketio.on("chat_message")
     def on_chat_message(data):
         text = (data or {}).get("message", "")
         session_user = (data or {}).get("session_user") or "lucy-c:anonymous"
+        model = orchestrator.session_model(session_user)  # None: default model, draft cascade applies
+        room = events.join(session_user)
         
-        emit("message", {"type": "user", "content": text})
-        emit("status", {"message": "Thinking...", "type": "info"})
+        events.emit("message", {"type": "user", "content": text}, room=room)
+        events.emit("status", {"message": "Thinking...", "type": "info"}, room=room)
         
-        result = orchestrator.process_text_input(text, session_user=session_user)
+        try:
+            result = orchestrator.process_text_input(text, session_user=session_user, model=model, room=room)
+        except Busy as e:
+            events.emit("busy", busy_payload(e), room=room)
+            return
+        if result.cancelled:
+            return  # superseded: the newer turn reports to the room
         
-        emit("message", {"type": "assistant", "content": result.reply})
+        events.emit("message", {"type": "assistant", "content": result.reply}, room=room)
         
         history.append(HistoryItem(
             ts=time.time(),
             session_user=session_user,
             kind="text",
             llm_provider=cfg.llm.provider,
-            ollama_model=cfg.ollama.model,
+            ollama_model=model or cfg.ollama.model,
             user_text=text,
             transcript=text,
             reply=result.reply
         ))
         
         if result.reply_wav:
-            emit("audio", {
+            events.emit("audio", {
                 "mime": "audio/wav", 
                 "sample_rate": result.reply_sr, 
                 "wav_base64": base64.b64encode(result.reply_wav).decode("ascii")
-            })
+            }, room=room)
         
-        emit("status", {"message": "Ready", "type": "success"})
+        events.emit("status", {"message": "Ready", "type": "success"}, room=room)
 
     @socketio.on("voice_input")
     def on_voice_input(data):
@@ -262,36 +481,45 @@ def create_app() -> tuple[Flask, SocketIO, LucyOrchestrator]:
         if not raw: return
         
         raw_bytes = bytes(raw) if isinstance(raw, list) else raw
-        decoded = decode_audio_bytes_to_f32_mono(raw_bytes, target_sr=cfg.audio.sample_rate)
+        decoded = pools.run("asr", decode_audio_bytes_to_f32_mono, raw_bytes, target_sr=cfg.audio.sample_rate)
         
         session_user = (data or {}).get("session_user") or "lucy-c:anonymous"
+        model = orchestrator.session_model(session_user)  # None: default model, draft cascade applies
+        room = events.join(session_user)
         
-        result = orchestrator.process_audio_input(decoded.audio, session_user=session_user)
+        try:
+            result = orchestrator.process_audio_input(decoded.audio, session_user=session_user, model=model,
+                                                      room=room)
+        except Busy as e:
+            events.emit("busy", busy_payload(e), room=room)
+            return
+        if result.cancelled:
+            return
         
         if result.transcript:
-            emit("message", {"type": "user", "content": result.transcript})
+            events.emit("message", {"type": "user", "content": result.transcript}, room=room)
             
-        emit("message", {"type": "assistant", "content": result.reply})
+        events.emit("message", {"type": "assistant", "content": result.reply}, room=room)
         
         history.append(HistoryItem(
             ts=time.time(),
             session_user=session_user,
             kind="voice",
             llm_provider=cfg.llm.provider,
-            ollama_model=cfg.ollama.model,
+            ollama_model=model or cfg.ollama.model,
             user_text="",
             transcript=result.transcript,
             reply=result.reply
         ))
 
         if result.reply_wav:
-             emit("audio", {
+             events.emit("audio", {
                  "mime": "audio/wav", 
                  "sample_rate": result.reply_sr, 
                  "wav_base64": base64.b64encode(result.reply_wav).decode("ascii")
-             })
+             }, room=room)
              
-        emit("status", {"message": "Ready", "type": "success"})
+        events.emit("status", {"message": "Ready", "type": "success"}, room=room)
 
     return app, socketio, orchestrator
 
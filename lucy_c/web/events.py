@@ -0,0 +1,72 @@
+"""
+Session-scoped Socket.IO events.
+
+Status updates, tool badges and audio belong to the turn that produced them.
+Each browser joins its session's room (on connect and with every message),
+and turn events go to that room only. A busy server then costs
+O(turns × tabs of that session) emits instead of O(turns × connected clients).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask_socketio import SocketIO, join_room
+
+# Status message fragment -> (tool, category, emoji) for the UI badge system
+TOOL_BADGES: Dict[str, Tuple[str, str, str]] = {
+    "Mirando pantalla": ("screenshot", "sensor", "👁️"),
+    "Haciendo clic": ("click", "actuator", "🖐️"),
+    "Escribiendo": ("type", "actuator", "⌨️"),
+    "Moviendo": ("move", "actuator", "🖱️"),
+    "Leyendo archivo": ("read_file", "sensor", "📄"),
+    "Escribiendo archivo": ("write_file", "actuator", "📝"),
+    "Guardando en memoria": ("remember", "memory", "🧠"),
+    "Buscando en internet": ("search_web", "sensor", "🔍"),
+    "Abriendo aplicación": ("os_run", "actuator", "🖐️"),
+}
+
+
+def room_for(session_user: str) -> str:
+    # Prefixed so a session id can never collide with a Socket.IO sid room
+    return f"session:{session_user}"
+
+
+class SessionEvents:
+    """Emits turn events to the originating session's room."""
+
+    def __init__(self, socketio: SocketIO):
+        self.socketio = socketio
+        self._lock = threading.Lock()
+        self.counts = {"scoped": 0, "broadcast": 0}
+
+    def join(self, session_user: str) -> str:
+        """Put the current Socket.IO client in its session's room (call from a handler)."""
+        room = room_for(session_user)
+        join_room(room)
+        return room
+
+    def emit(self, event: str, data: dict, room: Optional[str] = None) -> None:
+        """Emit to `room`; without one the event is broadcast (server-wide notices only)."""
+        with self._lock:
+            self.counts["scoped" if room else "broadcast"] += 1
+        self.socketio.emit(event, data, to=room)
+
+    def status(self, message: str, type: str = "info", room: Optional[str] = None) -> None:
+        """Orchestrator status callback: the status line plus a tool badge when one applies."""
+        self.emit("status", {"message": message, "type": type}, room=room)
+        for msg_pattern, (tool_name, category, emoji) in TOOL_BADGES.items():
+            if msg_pattern.lower() in message.lower():
+                self.emit("tool_event", {
+                    "tool": tool_name,
+                    "category": category,
+                    "emoji": emoji,
+                    "status": "running",
+                    "message": message
+                }, room=room)
+                break
+
+    def report(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
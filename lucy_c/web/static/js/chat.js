@@ -42,7 +42,7 @@ function addLog(message, type = 'info') {
 async function loadModels() {
   console.log('loadModels: Started');
   try {
-    const response = await fetch('/api/models');
+    const response = await fetch('/api/models?session_user=' + encodeURIComponent(getSessionUser()));
     const data = await response.json();
     console.log('loadModels: Data received', data);
 
@@ -107,6 +107,13 @@ if (window.lucySocket) {
     }
   });
 
+  // Server saturated: the turn was not processed, tell the user when to retry
+  window.lucySocket.on('busy', (data) => {
+    hideTypingIndicator();
+    updateStatus(data.message || 'Ocupada', 'warning');
+    addLog(`⏳ Ocupada (${data.stage}), reintentar en ${data.retry_after_s}s`, 'warning');
+  });
+
   window.lucySocket.on('tool_event', (data) => {
     console.log('Tool Event:', data);
     // Show a temporary "activity" badge in the status bar or add a log
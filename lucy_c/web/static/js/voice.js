@@ -78,6 +78,12 @@ function pickMimeType() {
   return '';
 }
 
+function bargeIn() {
+  // Cancel the reply still being generated on the server (nobody is going to hear it)
+  const session_user = (window.getSessionUser && window.getSessionUser()) || null;
+  lucySocket.emit('barge_in', { session_user });
+}
+
 async function sendAudioBytes(uint8) {
   const session_user = (window.getSessionUser && window.getSessionUser()) || null;
   lucySocket.emit('voice_input', { audio: Array.from(uint8), session_user, handsfree: hfEnabled });
@@ -194,6 +200,7 @@ async function toggleRecording() {
       try { a.pause(); a.currentTime = 0; } catch { }
       window.__lucy_lastAudio = null;
     }
+    bargeIn();
     updateStatus('Escuchando... (clic para enviar)', 'warning');
     await startRecording();
   }
@@ -349,11 +356,16 @@ async function handsfreeStart() {
         else if (pending) updateStatus('Pensando...', 'info');
       }
 
-      // Barge-in Logic
-      if (isPlaying && loudBarge) {
+      // Barge-in Logic (also while the reply is still being generated)
+      if ((isPlaying || pending) && loudBarge) {
         if (!bargeInStart) bargeInStart = now;
         if (HF.bargeInMs === 0 || (now - bargeInStart) >= HF.bargeInMs) {
-          try { a.pause(); a.currentTime = 0; } catch { }
+          if (isPlaying) {
+            try { a.pause(); a.currentTime = 0; } catch { }
+          } else {
+            bargeIn();
+            HF.responsePending = false;
+          }
           window.__lucy_lastAudio = null;
           bargeInStart = 0;
           currentState = VState.LISTENING; // Break out of SPEAK_WAIT
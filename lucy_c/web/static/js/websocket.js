@@ -1,5 +1,7 @@
 // WebSocket connection handler
 const socket = io({
+  // Joins this browser's session room on every (re)connect: status/audio events are per session
+  auth: (cb) => cb({ session_user: localStorage.getItem('lucy_session_user') }),
   reconnection: true,
   reconnectionAttempts: Infinity,
   reconnectionDelay: 500,
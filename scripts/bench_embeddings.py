@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup and throughput benchmark: PyTorch vs ONNX int8 embedding backends.
+
+For each backend reports import+load time (cold start, first encode included),
+single-query latency p50/p95, batch throughput (texts/s) and peak RSS; then
+checks vector compatibility (cosine between the two backends on the same
+texts) so the ONNX backend can read a collection built with PyTorch.
+
+Run each backend in a fresh process for honest cold-start numbers:
+    python scripts/bench_embeddings.py --backend sentence-transformers
+    python scripts/bench_embeddings.py --backend onnx
+    python scripts/bench_embeddings.py --parity
+"""
+import argparse
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to sys.path
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+
+from lucy_c.config import MemoryConfig
+from lucy_c.embedding_backends import create_embedding_backend
+
+WORDS = ("puerto config ollama modelo whisper memoria archivo servidor flask n8n webhook "
+         "base datos postgres timeout voz lucy agente herramienta ventana navegador").split()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def texts(n, rnd, min_words=5, max_words=80):
+    return [" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(min_words, max_words))) for _ in range(n)]
+
+
+def bench(name, args):
+    rnd = random.Random(args.seed)
+    start = time.perf_counter()
+    backend = create_embedding_backend(MemoryConfig(embedding_backend=name))
+    backend.encode(["warmup"])
+    cold = time.perf_counter() - start
+
+    latencies = []
+    for q in texts(args.queries, rnd, 3, 12):
+        t0 = time.perf_counter()
+        backend.encode([q])
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    corpus = texts(args.batch_texts, rnd)
+    t0 = time.perf_counter()
+    backend.encode(corpus)
+    throughput = len(corpus) / (time.perf_counter() - t0)
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{backend.name:<32} cold={cold:6.2f}s  query p50={percentile(latencies, 50):6.2f}ms "
+          f"p95={percentile(latencies, 95):6.2f}ms  batch={throughput:7.1f} texts/s  peak_rss={rss_mb:6.0f}MB")
+
+
+def parity(args):
+    rnd = random.Random(args.seed)
+    sample = texts(200, rnd)
+    ref = create_embedding_backend(MemoryConfig(embedding_backend="sentence-transformers")).encode(sample)
+    onnx = create_embedding_backend(MemoryConfig(embedding_backend="onnx")).encode(sample)
+    cos = np.sum(ref * onnx, axis=1)
+    print(f"cosine(pytorch, onnx-int8): min={cos.min():.4f} mean={cos.mean():.4f}")
+
+    # Same neighbours? top-1 of each query against the other backend's vectors
+    agree = np.mean(np.argmax(ref @ ref.T - 2 * np.eye(len(ref)), axis=1)
+                    == np.argmax(ref @ onnx.T - 2 * np.eye(len(ref)), axis=1))
+    print(f"top-1 neighbour agreement: {agree:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=["sentence-transformers", "onnx"])
+    parser.add_argument("--parity", action="store_true")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-texts", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.parity:
+        parity(args)
+    elif args.backend:
+        bench(args.backend, args)
+    else:
+        parser.error("pass --backend or --parity")
+
+
+if __name__ == "__main__":
+    main()
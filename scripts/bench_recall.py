@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Recall latency benchmark for MemoryEngine.
+
+Ingests a synthetic corpus into a throwaway Chroma directory and replays a
+query mix with repeats (like auto-recall probes), once with the query cache
+disabled and once enabled, reporting p50/p95 latency for each.
+
+Usage: python scripts/bench_recall.py [--queries 500] [--repeat-ratio 0.6] [--mode dense|hybrid] [--model NAME_OR_PATH]
+"""
+import argparse
+import multiprocessing
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to sys.path
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+from lucy_c.config import MemoryConfig
+from lucy_c.rag_engine import MemoryEngine
+
+WORDS = ("puerto config ollama modelo whisper memoria archivo servidor flask n8n webhook "
+         "base datos postgres timeout voz lucy agente herramienta ventana navegador").split()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def corpus(n_docs, rnd):
+    for i in range(n_docs):
+        sentences = [" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(6, 18))).capitalize() + "."
+                     for _ in range(40)]
+        yield f"doc_{i}", " ".join(sentences)
+
+
+def query_mix(n, repeat_ratio, rnd):
+    seen = []
+    for _ in range(n):
+        if seen and rnd.random() < repeat_ratio:
+            yield rnd.choice(seen)
+        else:
+            q = "¿" + " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 8))) + "?"
+            seen.append(q)
+            yield q
+
+
+def run(label, cache_size, args):
+    rnd = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = MemoryEngine(cfg=MemoryConfig(persist_directory=tmp, query_cache_size=cache_size,
+                                           embedding_model=args.model))
+        engine.warmup()
+        for name, text in corpus(args.docs, rnd):
+            engine.ingest_text(text, {"source": "bench", "source_id": name, "file_name": name})
+
+        latencies = []
+        for q in query_mix(args.queries, args.repeat_ratio, rnd):
+            start = time.perf_counter()
+            engine.query(q, n_results=3, mode=args.mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        print(f"{label:<14} p50={percentile(latencies, 50):7.2f}ms  p95={percentile(latencies, 95):7.2f}ms  "
+              f"mean={statistics.mean(latencies):7.2f}ms  {engine.embeddings.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--repeat-ratio", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=["dense", "hybrid"], default="hybrid")
+    parser.add_argument("--model", default=MemoryConfig().embedding_model,
+                        help="Embedding model name or local path")
+    args = parser.parse_args()
+
+    # One process per run: Chroma keeps a single in-memory system per process
+    for label, cache_size in (("cache off", 0), ("cache on", 1024)):
+        proc = multiprocessing.Process(target=run, args=(label, cache_size, args))
+        proc.start()
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Vector store benchmark: Chroma vs the local ANN store (faiss / hnswlib / exact).
+
+Builds each store from the same synthetic clustered, normalized vectors
+(MiniLM-sized, 384 dims), then reports build time, cold start (open + first
+query, in a fresh process), query latency p50/p95 and recall@k against
+numpy brute force. No embedding model is involved, so the numbers are the
+store's alone.
+
+    python scripts/bench_vector_store.py --store hnsw --engine faiss --n 50000
+    python scripts/bench_vector_store.py --store chroma --n 50000
+"""
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to sys.path
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+import numpy as np
+
+from lucy_c.config import MemoryConfig
+from lucy_c.rag_engine import create_vector_store
+
+SPACE = "bench"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def dataset(n, dim, n_queries, seed):
+    """Clustered unit vectors (real embeddings are far from uniform)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(8, n // 500), dim)).astype(np.float32)
+    data = centers[rng.integers(len(centers), size=n)] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+    queries = centers[rng.integers(len(centers), size=n_queries)] + 0.35 * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return data, queries
+
+
+def open_store(args, path, read_only=False):
+    cfg = MemoryConfig(vector_store=args.store, ann_engine=args.engine, hnsw_m=args.m,
+                       hnsw_ef_search=args.ef_search, read_only=read_only)
+    return create_vector_store(cfg, path, SPACE)
+
+
+def build(args, path, data):
+    store = open_store(args, path)
+    start = time.perf_counter()
+    for i in range(0, len(data), args.batch):
+        ids = [f"c{j}" for j in range(i, min(i + args.batch, len(data)))]
+        store.upsert(ids, data[i:i + args.batch], ["x"] * len(ids), [{"n": 0}] * len(ids))
+    store.flush()
+    return time.perf_counter() - start
+
+
+def run_queries(args, path, queries, truth):
+    """Runs in a fresh process: cold start, then latency and recall."""
+    start = time.perf_counter()
+    store = open_store(args, path, read_only=args.store == "hnsw")
+    store.query(queries[0], args.k)
+    cold = time.perf_counter() - start
+
+    latencies, hits = [], 0
+    for q, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        found = store.query(q, args.k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len({int(h["id"][1:]) for h in found} & set(expected.tolist()))
+    return {
+        "cold_s": cold,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "recall": hits / (len(queries) * args.k),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--store", choices=["chroma", "hnsw"], default="hnsw")
+    parser.add_argument("--engine", choices=["auto", "faiss", "hnswlib", "exact"], default="auto")
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dir", help="Reuse a built store (internal: query phase)")
+    args = parser.parse_args()
+
+    data, queries = dataset(args.n, args.dim, args.queries, args.seed)
+    if args.dir:
+        truth = np.argsort(-(queries @ data.T), axis=1)[:, :args.k]
+        print(json.dumps(run_queries(args, Path(args.dir), queries, truth)))
+        return
+
+    work = Path(tempfile.mkdtemp(prefix="lucy-vs-bench-"))
+    try:
+        build_s = build(args, work, data)
+        # Query phase in a fresh process so cold start includes open + page-in (no warm OS cache of our own)
+        out = subprocess.run([sys.executable, __file__, *sys.argv[1:], "--dir", str(work)],
+                             check=True, capture_output=True, text=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        disk_mb = sum(p.stat().st_size for p in work.rglob("*") if p.is_file()) / 1e6
+        label = args.store if args.store == "chroma" else f"hnsw/{args.engine}"
+        print(f"{label:<14} n={args.n} build={build_s:6.1f}s disk={disk_mb:6.0f}MB cold={r['cold_s']:5.2f}s "
+              f"query p50={r['p50_ms']:6.2f}ms p95={r['p95_ms']:6.2f}ms recall@{args.k}={r['recall']:.3f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
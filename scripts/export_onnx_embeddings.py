@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Export the memory embedding model to int8 ONNX for memory.embedding_backend: onnx.
+
+Needs the heavy stack once (torch, sentence-transformers, onnx, onnxruntime);
+at runtime the ONNX backend only needs onnxruntime + tokenizers.
+
+Usage: python scripts/export_onnx_embeddings.py [--model all-MiniLM-L6-v2] [--out data/models/all-MiniLM-L6-v2-onnx]
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to sys.path
+root = Path(__file__).resolve().parents[1]
+sys.path.append(str(root))
+
+from lucy_c.config import MemoryConfig
+from lucy_c.embedding_backends import ONNX_MODEL_FILE
+
+
+def main():
+    defaults = MemoryConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=defaults.embedding_model)
+    parser.add_argument("--out", default=defaults.onnx_model_dir)
+    args = parser.parse_args()
+
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    st = SentenceTransformer(args.model, device="cpu")
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    tokenizer.save_pretrained(str(out))  # writes tokenizer.json (fast tokenizer)
+
+    sample = tokenizer(["hola lucy"], return_tensors="pt")
+    inputs = ("input_ids", "attention_mask", "token_type_ids")
+    dynamic = {name: {0: "batch", 1: "tokens"} for name in inputs}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "tokens"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32 = Path(tmp) / "model.onnx"
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                tuple(sample[name] for name in inputs),
+                str(fp32),
+                input_names=list(inputs),
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic,
+                opset_version=14,
+            )
+        quantize_dynamic(str(fp32), str(out / ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+
+    print(f"Wrote {out / ONNX_MODEL_FILE} and {out / 'tokenizer.json'}")
+    print("Set memory.embedding_backend: onnx in config/config.yaml")
+
+
+if __name__ == "__main__":
+    main()
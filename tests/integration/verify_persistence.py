@@ -45,8 +45,9 @@ def test_persistence():
     
     moltbot_reborn.run_turn_from_text("Hola", session_user=user)
     
-    current_model = moltbot_reborn.cfg.ollama.model
-    if current_model == new_model:
+    # The choice travels with the turn; the shared config keeps the default
+    current_model = moltbot_reborn.ollama.chat.call_args.kwargs.get("model")
+    if current_model == new_model and moltbot_reborn.cfg.ollama.model == default_model:
         log.info(f"SUCCESS: Brain choice persistent! Current: {current_model}")
     else:
         log.error(f"FAILURE: Brain choice NOT persistent. Found: {current_model}, Expected: {new_model}")
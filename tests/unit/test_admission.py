@@ -0,0 +1,76 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import LucyConfig
+from lucy_c.services.admission import AdmissionController, Busy
+
+
+def test_bounded_queue_rejects_with_retry_hint():
+    admission = AdmissionController({"llm": 1}, max_queue=1, queue_timeout_s=2)
+    release = threading.Event()
+    entered = []
+
+    def turn():
+        with admission.stage("llm"):
+            entered.append(time.monotonic())
+            release.wait(2)
+
+    first = threading.Thread(target=turn)
+    first.start()
+    while not entered:
+        time.sleep(0.005)
+    queued = threading.Thread(target=turn)
+    queued.start()
+    while admission.report()["stages"]["llm"]["waiting"] < 1:
+        time.sleep(0.005)
+
+    with pytest.raises(Busy) as busy:
+        with admission.stage("llm"):
+            pass
+    assert busy.value.stage == "llm" and busy.value.retry_after_s >= 1
+    with pytest.raises(Busy):
+        admission.check("llm")
+
+    time.sleep(0.02)
+    release.set()
+    first.join(2)
+    queued.join(2)
+    stats = admission.report()["stages"]["llm"]
+    assert stats["admitted"] == 2 and stats["rejected"] == 2 and stats["running"] == 0
+    assert stats["wait_max_s"] >= 0.02
+
+
+def test_queue_timeout():
+    admission = AdmissionController({"asr": 1}, max_queue=4, queue_timeout_s=0.05)
+    with admission.stage("asr"):
+        with pytest.raises(Busy) as busy:
+            with admission.stage("asr"):
+                pass
+    assert busy.value.reason == "queue timeout"
+    assert admission.report()["stages"]["asr"]["timed_out"] == 1
+    with admission.stage("tts") as waited:  # stages without a limit are free
+        assert waited == 0.0
+
+
+def test_orchestrator_rejects_audio_before_transcribing_and_degrades_tts():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.orchestrator import LucyOrchestrator
+
+    admission = AdmissionController({"llm": 1, "tts": 1}, max_queue=0)
+    brain, body, senses = MagicMock(), MagicMock(), MagicMock()
+    intents = MagicMock()
+    intents.handle.return_value = "Son las 10:00."
+    lucy = LucyOrchestrator(LucyConfig(), brain, senses, body, intents=intents, admission=admission)
+
+    with admission.stage("llm"):
+        with pytest.raises(Busy):
+            lucy.process_audio_input(b"audio")
+    senses.listen.assert_not_called()
+
+    with admission.stage("tts"):
+        result = lucy.process_text_input("¿qué hora es?")
+    assert result.reply == "Son las 10:00." and result.reply_wav == b""
+    senses.speak.assert_not_called()
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from lucy_c.services.audio_store import AudioStore
+
+
+class FakeTTS:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+
+    def __call__(self, text):
+        self.calls.append(text)
+        time.sleep(self.delay)
+        return (b"", 0) if self.fail else (b"RIFF" + text.encode(), 22050)
+
+
+def test_unfetched_audio_costs_no_tts():
+    tts = FakeTTS()
+    store = AudioStore(tts, max_items=2)
+    ids = [store.submit(f"respuesta {i}") for i in range(3)]
+    assert tts.calls == []
+    clip = store.get(ids[2])
+    assert clip.wav == b"RIFFrespuesta 2" and clip.sample_rate == 22050
+    assert store.get(ids[0]) is None  # evicted
+    assert tts.calls == ["respuesta 2"]
+    report = store.report()
+    assert report["never_synthesized"] == 1 and report["fetched"] == 1
+
+
+def test_prefetch_is_shared_with_concurrent_fetches():
+    tts = FakeTTS(delay=0.05)
+    store = AudioStore(tts)
+    audio_id = store.submit("hola", prefetch=True)
+    clips = []
+    fetchers = [threading.Thread(target=lambda: clips.append(store.get(audio_id))) for _ in range(3)]
+    for t in fetchers:
+        t.start()
+    for t in fetchers:
+        t.join(2)
+    assert tts.calls == ["hola"]
+    assert {c.etag for c in clips} == {clips[0].etag} and clips[0].state == "ready"
+    assert store.report()["synthesized"] == 1
+
+
+def test_failed_synthesis_is_retried_on_fetch_and_clips_expire():
+    tts = FakeTTS(fail=True)
+    store = AudioStore(tts, ttl_s=0.05)
+    audio_id = store.submit("hola")
+    assert store.get(audio_id).state == "failed"
+    tts.fail = False
+    assert store.get(audio_id).state == "ready"
+    time.sleep(0.06)
+    assert store.get(audio_id) is None
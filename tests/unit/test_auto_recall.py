@@ -0,0 +1,66 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import LucyConfig
+from lucy_c.core.cognitive import CognitiveEngine
+from lucy_c.interfaces.llm import LLMResponse
+from lucy_c.services.auto_recall import AutoRecall
+from lucy_c.tool_router import ToolRun
+
+
+class FakeMemory:
+    def __init__(self, hits, delay=0.0):
+        self.hits = hits
+        self.delay = delay
+        self.modes = []
+
+    def query(self, text, n_results=3, mode=None):
+        self.modes.append(mode)
+        time.sleep(self.delay)
+        return self.hits[:n_results]
+
+
+def _hit(text, similarity):
+    return {"text": text, "metadata": {"file_name": "notas.md"}, "distance": 2.0 - 2.0 * similarity}
+
+
+def test_threshold_and_short_utterances():
+    recall = AutoRecall(FakeMemory([_hit("cerca", 0.8), _hit("lejos", 0.2)]), min_similarity=0.5)
+    assert [h["text"] for h in recall.result(recall.start("¿qué puerto usa el servidor?"))] == ["cerca"]
+    assert recall.start("hola") is None
+    assert recall.memory.modes == ["dense"]
+
+
+def test_slow_query_times_out_without_blocking_turn():
+    recall = AutoRecall(FakeMemory([_hit("cerca", 0.9)], delay=0.5), timeout_ms=20)
+    t0 = time.time()
+    assert recall.result(recall.start("¿qué puerto usa el servidor?")) == []
+    assert time.time() - t0 < 0.3
+    assert recall.report()["timeouts"] == 1
+
+
+def test_orchestrator_injects_hits_and_counts_skipped_tool_path():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.orchestrator import LucyOrchestrator
+
+    llm = MagicMock()
+    llm.chat.return_value = LLMResponse(text="El servidor usa el puerto 5050.")
+    history, facts = MagicMock(), MagicMock()
+    history.read.return_value = []
+    facts.get_facts_summary.return_value = ""
+    brain = CognitiveEngine(llm, history, facts)
+    senses, body = MagicMock(), MagicMock()
+    senses.speak.return_value = (b"", 0)
+    body.run.side_effect = lambda text, **kw: ToolRun(text)
+
+    recall = AutoRecall(FakeMemory([_hit("PORT=5050 en el servidor", 0.9)]))
+    lucy = LucyOrchestrator(LucyConfig(), brain, senses, body, recall=recall)
+    result = lucy.process_text_input("¿qué puerto usa el servidor?", session_user="u1")
+
+    assert result.reply == "El servidor usa el puerto 5050."
+    system_prompt = llm.chat.call_args[0][0][0]["content"]
+    assert "[MEMORIA RELEVANTE]" in system_prompt and "PORT=5050" in system_prompt
+    report = recall.report()
+    assert report["injected"] == 1 and report["tool_path_skipped"] == 1 and report["tool_path_skip_rate"] == 1.0
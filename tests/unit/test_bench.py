@@ -0,0 +1,126 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+import requests
+
+from lucy_c.bench.driver import UTTERANCES, wav_bytes
+from lucy_c.bench.fakes import FakeASR, FakeTTS
+from lucy_c.bench.report import BenchReport, StageRecorder, percentile, summarize
+from lucy_c.bench.servers import FakeOllama, StubN8n
+from lucy_c.config import OllamaConfig
+from lucy_c.ollama_llm import OllamaChatError, OllamaLLM
+from lucy_c.services.cancellation import CancelToken
+
+
+def _llm(url: str) -> OllamaLLM:
+    return OllamaLLM(OllamaConfig(host=url, model="bench"))
+
+
+def test_fake_ollama_streams_the_same_reply_as_it_returns_whole():
+    with FakeOllama(models=["bench"], first_token_s=0, tokens_per_s=1000, reply_tokens=8) as ollama:
+        llm = _llm(ollama.url)
+        assert llm.list_models() == ["bench"]
+        messages = [{"role": "user", "content": "hola"}]
+        whole = llm.chat(messages)
+        streamed = llm.chat(messages, cancel=CancelToken())
+        assert whole.text == streamed.text and len(whole.text.split()) == 8
+        assert streamed.usage["eval_count"] == 8
+        assert llm.chat(messages, options={"num_predict": 3}).usage["done_reason"] == "length"
+        report = ollama.report()
+    assert report["chat"] == 3 and report["streamed"] == 1 and report["loads"] == 1
+    assert report["resident"] == ["bench"]
+
+
+def test_fake_ollama_tool_calls_and_failures_follow_the_rates():
+    with FakeOllama(models=["bench"], first_token_s=0, tokens_per_s=1000, tool_rate=1.0) as ollama:
+        reply = _llm(ollama.url).chat([{"role": "user", "content": "disparalo"}]).text
+        assert reply.endswith(")]]") and "[[trigger_workflow(" in reply
+        # Reflection prompts never get a tool call
+        reflect = _llm(ollama.url).chat([{"role": "user", "content": "ACTUALIZACIÓN: nada"}]).text
+        assert "[[" not in reflect
+    with FakeOllama(models=["bench"], first_token_s=0, error_rate=1.0) as ollama:
+        with pytest.raises(OllamaChatError):
+            _llm(ollama.url).chat([{"role": "user", "content": "hola"}])
+        assert ollama.report()["errors"] == 1
+
+
+def test_stub_n8n_counts_webhook_calls():
+    with StubN8n(latency_s=0) as n8n:
+        r = requests.post(f"{n8n.url}/webhook/bench-1", json={"x": 1}, timeout=5)
+        assert r.ok and r.json()["received"] == {"x": 1}
+        assert requests.get(f"{n8n.url}/webhook/bench-1", timeout=5).status_code == 404
+        assert n8n.report() == {"calls": 1, "by_workflow": {"bench-1": 1}, "errors": 0}
+
+
+def test_fake_asr_reads_the_utterance_back_from_a_pcm16_clip():
+    asr = FakeASR(UTTERANCES, delay_s=0, rtf=0)
+    for index in range(len(UTTERANCES)):
+        with wave.open(io.BytesIO(wav_bytes(FakeASR.clip(index), 16000))) as w:
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2").astype(np.float32) / 32768.0
+        assert asr.transcribe(pcm).text == UTTERANCES[index]
+    assert asr.transcribe(FakeASR.clip(None)).text == ""
+    assert asr.stats()["turns"] == len(UTTERANCES) + 1
+
+
+def test_fake_tts_caches_syntheses():
+    tts = FakeTTS(delay_s=0, per_char_s=0)
+    assert tts.pin("Listo.")
+    tts.synthesize("Listo.")
+    assert tts.syntheses == [6]
+
+
+def test_percentiles_and_report():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([], 99) == 0.0
+    s = summarize([0.1, 0.2, 0.3])
+    assert s["n"] == 3 and s["p50_ms"] == 200.0 and s["max_ms"] == 300.0
+
+    recorder = StageRecorder()
+    token = CancelToken()
+    token.timings.update({"think": 0.5, "tts": 0.1})
+    recorder.on_turn("u1", token)
+    report = BenchReport(wall_s=2.0, settings={"sessions": 1, "turns": 4},
+                         turns={"text": {"ok": 3, "busy": 1}}, latency={"text_reply": s},
+                         stages=recorder.summary())
+    assert report.throughput == 1.5
+    assert report.error_rates() == {"text": 0.25}
+    text = report.format()
+    assert "1.50 turns/s" in text and "think" in text and "busy=1" in text
+    assert report.to_dict()["completed"] == 3
+
+
+def test_a_failing_turn_is_counted_and_the_session_goes_on():
+    from lucy_c.bench.driver import BenchConfig, _report, _Session
+
+    class Client:
+        def __init__(self):
+            self.received = []
+
+        def emit(self, event, data):
+            if event == "voice_input":
+                raise RuntimeError("ffmpeg not found")
+            self.received = [{"name": "message", "args": [{"type": "assistant", "content": "Dale."}]},
+                             {"name": "status", "args": [{"message": "Ready"}]}]
+
+        def get_received(self):
+            received, self.received = self.received, []
+            return received
+
+        def disconnect(self):
+            pass
+
+    class SocketIO:
+        def test_client(self, app, auth=None):
+            return Client()
+
+    bench = BenchConfig(sessions=2, turns=6, voice_ratio=0.5)
+    sessions = [_Session(i, None, SocketIO(), bench, 16000) for i in range(bench.sessions)]
+    for s in sessions:
+        s.run()
+    report = _report(bench, sessions, StageRecorder(), 1.0, {}, {})
+    assert sum(sum(c.values()) for c in report.turns.values()) == 12
+    assert report.turns["voice"]["error"] == sum(report.turns["voice"].values()) > 0
+    assert report.turns["text"]["ok"] == sum(report.turns["text"].values())
+    assert report.errors == {"RuntimeError: ffmpeg not found": report.turns["voice"]["error"]}
@@ -0,0 +1,35 @@
+from lucy_c.bm25_index import BM25Index, tokenize
+from lucy_c.rag_engine import reciprocal_rank_fusion
+
+
+def test_tokenize_keeps_identifiers_and_their_parts():
+    terms = tokenize("Editá rag_engine.py y MemoryEngine en la configuración")
+    assert "rag_engine.py" in terms
+    assert {"rag", "engine", "py"} <= set(terms)
+    assert {"memoryengine", "memory", "engine"} <= set(terms)
+    assert "configuracion" in terms
+
+
+def test_exact_identifier_ranks_first_and_delete_removes(tmp_path):
+    index = BM25Index(tmp_path / "bm25.sqlite")
+    index.add([
+        ("a", "El puerto del servidor se configura en config.yaml"),
+        ("b", "La función hybrid_candidates controla cuántos candidatos se fusionan"),
+        ("c", "Lucy usa un modelo de voz y un servidor web"),
+    ])
+    assert index.search("hybrid_candidates", k=3)[0][0] == "b"
+    assert index.search("config.yaml puerto", k=1)[0][0] == "a"
+
+    index.delete(["b"])
+    assert index.count() == 2
+    assert all(doc_id != "b" for doc_id, _ in index.search("hybrid_candidates"))
+
+    # Persisted on disk
+    assert BM25Index(tmp_path / "bm25.sqlite").count() == 2
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["w", "y", "z"]], k=60)
+    ids = [doc_id for doc_id, _ in fused]
+    assert ids[0] == "y"  # rank 2 in both beats rank 1 in only one
+    assert set(ids) == {"x", "y", "z", "w"}
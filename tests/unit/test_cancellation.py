@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import LucyConfig, OllamaConfig
+from lucy_c.interfaces.llm import LLMResponse
+from lucy_c.ollama_llm import OllamaLLM
+from lucy_c.services.cancellation import Cancelled, CancelToken, TurnTracker
+
+
+def test_new_turn_supersedes_the_sessions_previous_one():
+    tracker = TurnTracker()
+    first = tracker.begin("u1")
+    other = tracker.begin("u2")
+    second = tracker.begin("u1")
+    assert first.cancelled and first.reason == "superseded"
+    assert not other.cancelled and not second.cancelled
+    # Anonymous clients share a session id; they never cancel each other
+    anon = tracker.begin("lucy-c:anonymous")
+    tracker.begin("lucy-c:anonymous")
+    assert not anon.cancelled
+    assert tracker.cancel("u2") and other.reason == "barge_in"
+    assert not tracker.cancel("nobody")
+    with pytest.raises(Cancelled):
+        with tracker.stage(first, "think"):
+            pass
+
+
+def test_saved_compute_is_estimated_from_completed_turns():
+    tracker = TurnTracker()
+    done = tracker.begin("u1")
+    done.timings = {"think": 2.0, "tools": 1.0, "reflect": 2.0, "tts": 1.0}
+    tracker.end("u1", done)
+
+    token = tracker.begin("u1")
+    with tracker.stage(token, "think"):
+        pass
+    tracker.cancel("u1")
+    tracker.end("u1", token)
+    report = tracker.report()
+    assert report["cancelled"] == 1 and report["barge_in"] == 1
+    assert report["cancelled_at"] == {"think": 1}
+    # rest of "think" (~2 s) + tools + reflect + tts of an average finished turn
+    assert report["saved_s_est"] == pytest.approx(6.0, abs=0.05)
+
+
+class _SlowOllama(BaseHTTPRequestHandler):
+    sent = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for i in range(50):
+                chunk = {"message": {"role": "assistant", "content": f"tok{i} "}, "done": i == 49}
+                self.wfile.write((json.dumps(chunk) + "\n").encode())
+                self.wfile.flush()
+                type(self).sent += 1
+                time.sleep(0.02)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client dropped the stream: Ollama stops generating here
+
+    def log_message(self, *args):
+        pass
+
+
+def test_streamed_chat_is_aborted_at_the_http_level():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        llm = OllamaLLM(OllamaConfig(host=f"http://127.0.0.1:{server.server_address[1]}", keep_alive=""))
+        # Until the token fires the whole reply streams in
+        assert llm.chat([{"role": "user", "content": "hola"}], cancel=CancelToken()).text.endswith("tok49")
+        _SlowOllama.sent = 0
+
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel, args=("superseded",)).start()
+        start = time.monotonic()
+        with pytest.raises(Cancelled):
+            llm.chat([{"role": "user", "content": "hola"}], cancel=token)
+        assert time.monotonic() - start < 0.5
+        time.sleep(0.1)
+        assert _SlowOllama.sent < 20
+    finally:
+        server.shutdown()
+
+
+def test_superseded_turn_skips_tools_and_tts():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.orchestrator import LucyOrchestrator
+    from lucy_c.tool_router import ToolRun
+
+    started = threading.Event()
+
+    def think(text, cancel=None, **kwargs):
+        if text == "primero":
+            started.set()
+            for _ in range(100):  # a long generation, polling like the streaming client does
+                cancel.check()
+                time.sleep(0.01)
+        return LLMResponse(text=f"respuesta a {text}")
+
+    brain = MagicMock()
+    brain.facts.get_facts.return_value = {}
+    brain.think.side_effect = think
+    body = MagicMock()
+    body.run.side_effect = lambda text, **kwargs: ToolRun(text)
+    senses = MagicMock()
+    senses.speak.return_value = (b"RIFF", 16000)
+    lucy = LucyOrchestrator(LucyConfig(), brain, senses, body)
+
+    results = {}
+    t = threading.Thread(target=lambda: results.update(first=lucy.process_text_input("primero", session_user="u1")))
+    t.start()
+    started.wait(2)
+    results["second"] = lucy.process_text_input("segundo", session_user="u1")
+    t.join(2)
+
+    assert results["first"].cancelled and results["first"].reply == ""
+    assert results["second"].reply == "respuesta a segundo"
+    assert body.run.call_count == 1 and senses.speak.call_count == 1
+    report = lucy.turns.report()
+    assert report["superseded"] == 1 and report["cancelled_at"] == {"think": 1}
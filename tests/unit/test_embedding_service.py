@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+
+from lucy_c.embedding_service import EmbeddingCache, EmbeddingService, normalize_query
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def encode(self, texts, show_progress_bar=False):
+        with self.lock:
+            self.calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_cache_key_is_normalized():
+    assert normalize_query("  ¿Qué  PUERTO\tusa?  ") == normalize_query("¿qué puerto usa?")
+
+
+def test_lru_evicts_oldest():
+    cache = EmbeddingCache(max_items=2)
+    cache.put("a", np.ones(2))
+    cache.put("b", np.ones(2))
+    cache.get("a")
+    cache.put("c", np.ones(2))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db = tmp_path / "q.sqlite"
+    EmbeddingCache(max_items=8, disk_path=db, namespace="m").put("hola", np.array([1.0, 2.0]))
+
+    fresh = EmbeddingCache(max_items=8, disk_path=db, namespace="m")
+    np.testing.assert_allclose(fresh.get("hola"), [1.0, 2.0])
+    assert fresh.stats()["disk_hits"] == 1
+    # a different embedding model must not see these vectors
+    assert EmbeddingCache(max_items=8, disk_path=db, namespace="other").get("hola") is None
+
+
+def test_repeated_query_hits_cache():
+    model = CountingModel()
+    service = EmbeddingService(lambda: model, EmbeddingCache(16), max_wait_ms=0)
+
+    service.encode_query("puerto de staging")
+    service.encode_query("Puerto de  staging")
+
+    assert len(model.calls) == 1
+    assert service.stats()["cache"]["hits"] == 1
+
+
+def test_model_sees_the_query_as_typed():
+    model = CountingModel()
+    service = EmbeddingService(lambda: model, EmbeddingCache(16), max_wait_ms=0)
+
+    service.encode_query("  Straße  nach München ")
+
+    # normalization only keys the cache ("ß" would casefold to "ss")
+    assert model.calls == [["  Straße  nach München "]]
+
+
+def test_concurrent_queries_are_micro_batched():
+    model = CountingModel()
+    service = EmbeddingService(lambda: model, cache=None, max_batch=32, max_wait_ms=50)
+    results = {}
+
+    def worker(i):
+        results[i] = service.encode_query(f"consulta {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 8
+    assert len(model.calls) < 8
+    assert sum(len(c) for c in model.calls) == 8
+    assert results[3][0] == len("consulta 3")
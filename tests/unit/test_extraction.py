@@ -0,0 +1,82 @@
+import zipfile
+
+from lucy_c.extraction import detect_format, extract_text, html_to_text, iter_text_blocks
+
+
+def _write_epub(path):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip")
+        zf.writestr("META-INF/container.xml", """<?xml version="1.0"?>
+<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>""")
+        zf.writestr("OEBPS/content.opf", """<?xml version="1.0"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0">
+  <manifest>
+    <item id="c2" href="text/cap2.xhtml" media-type="application/xhtml+xml"/>
+    <item id="c1" href="text/cap1.xhtml" media-type="application/xhtml+xml"/>
+  </manifest>
+  <spine><itemref idref="c1"/><itemref idref="c2"/></spine>
+</package>""")
+        zf.writestr("OEBPS/text/cap1.xhtml", "<html><head><style>p{}</style></head><body><p>Capítulo uno.</p></body></html>")
+        zf.writestr("OEBPS/text/cap2.xhtml", "<html><body><h1>Dos</h1><p>Fin &amp; epílogo.</p></body></html>")
+
+
+def _write_docx(path):
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", f"""<?xml version="1.0"?>
+<w:document xmlns:w="{w}"><w:body>
+  <w:p><w:r><w:t>Hola</w:t></w:r><w:r><w:t xml:space="preserve"> mundo</w:t></w:r></w:p>
+  <w:p><w:r><w:t>Segundo</w:t><w:tab/><w:t>párrafo</w:t></w:r></w:p>
+</w:body></w:document>""")
+
+
+def test_dispatch_by_format(tmp_path):
+    epub, docx, html = tmp_path / "libro.epub", tmp_path / "nota.docx", tmp_path / "page.html"
+    _write_epub(epub)
+    _write_docx(docx)
+    html.write_text("<html><script>x()</script><body><div>Uno</div><p>Dos</p></body></html>", encoding="utf-8")
+
+    assert extract_text(epub).text == "Capítulo uno.\n\nDos\nFin & epílogo."
+    assert extract_text(docx).text == "Hola mundo\nSegundo\tpárrafo"
+    assert extract_text(html).text == "Uno\nDos"
+    assert detect_format(tmp_path / "x.PDF") == "pdf"
+
+
+def test_cache_by_content_hash(tmp_path):
+    cache = tmp_path / "cache"
+    a = tmp_path / "a.epub"
+    _write_epub(a)
+    first = extract_text(a, cache_dir=cache)
+    assert not first.cached
+
+    # Same bytes under another name: served from cache
+    b = tmp_path / "renamed.epub"
+    b.write_bytes(a.read_bytes())
+    again = extract_text(b, cache_dir=cache)
+    assert again.cached and again.text == first.text
+
+
+def test_unsupported_and_broken_files_report_errors(tmp_path):
+    blob = tmp_path / "blob.bin"
+    blob.write_bytes(b"\x00\x01\x02")
+    assert extract_text(blob).error == "unsupported_format"
+
+    bad = tmp_path / "bad.epub"
+    bad.write_bytes(b"not a zip")
+    assert extract_text(bad).error.startswith("epub_extract_failed")
+
+
+def test_text_blocks_decode_multibyte_across_block_edges(tmp_path):
+    p = tmp_path / "doc.txt"
+    p.write_text("configuración ñandú " * 500, encoding="utf-8")
+    assert "".join(iter_text_blocks(p, block_bytes=7)) == p.read_text(encoding="utf-8")
+
+    latin = tmp_path / "latin.txt"
+    latin.write_bytes("canción".encode("latin-1"))
+    assert "".join(iter_text_blocks(latin)) == "canción"
+
+
+def test_html_to_text_skips_scripts_and_keeps_blocks():
+    assert html_to_text("<p>a</p><script>b</script><p>c  d</p>") == "a\nc d"
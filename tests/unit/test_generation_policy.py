@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock
+
+from lucy_c.config import GenerationConfig
+from lucy_c.core.cognitive import CognitiveEngine
+from lucy_c.core.generation import GenerationPolicy
+from lucy_c.interfaces.llm import LLMResponse
+
+
+def test_partial_override_keeps_defaults_and_shared_num_ctx():
+    policy = GenerationPolicy(GenerationConfig(num_ctx=4096, reflect={"num_predict": 300, "stop": ["\n\n\n"]}))
+    assert policy.for_call("reflect").to_options() == {
+        "num_ctx": 4096, "num_predict": 300, "temperature": 0.4, "stop": ["\n\n\n"]}
+    assert policy.for_call("voice").to_options()["num_ctx"] == 4096
+
+
+def test_engine_sends_options_per_call_type_and_records_usage():
+    llm = MagicMock()
+    llm.chat.return_value = LLMResponse(text="ok", usage={"prompt_eval_count": 900, "eval_count": 200,
+                                                          "eval_duration_ms": 4000.0, "done_reason": "length"})
+    history = MagicMock()
+    history.read.return_value = []
+    brain = CognitiveEngine(llm, history, None)
+
+    brain.think("hola", session_user="u", voice=True)
+    assert llm.chat.call_args.kwargs["options"]["num_predict"] == 200
+    brain.reflect("[⚙️]: ok", [{"role": "system", "content": ""}])
+    assert llm.chat.call_args.kwargs["options"]["num_predict"] == 256
+
+    calls = brain.policy.report()["calls"]
+    assert calls["voice"]["truncated"] == 1 and calls["reflect"]["avg_prompt_tokens"] == 900
@@ -0,0 +1,71 @@
+from lucy_c.intent_router import IntentRouter, normalize
+from lucy_c.tool_router import ToolResult, ToolRouter
+
+
+def _router(**kw):
+    tr = ToolRouter()
+    calls = []
+
+    def get_info(args, ctx):
+        calls.append(("get_info", args))
+        return ToolResult(True, {"time": "Hora: 14:05:09", "date": "Fecha: 03/02/2026"}[args[0]], "⚙️")
+
+    def open_url(args, ctx):
+        calls.append(("open_url", args))
+        return ToolResult(True, f"Abriendo https://{args[0]}", "🌐 RED")
+
+    tr.register_tool("get_info", get_info)
+    tr.register_tool("open_url", open_url)
+    tr.register_tool("os_run", lambda args, ctx: ToolResult(False, "Comando bloqueado", "🛡️ SEGURIDAD"))
+    return IntentRouter(tr, **kw), calls
+
+
+def test_normalize():
+    assert normalize("¿Qué HORA es?") == "que hora es"
+    assert normalize("Abrí google.com.") == "abri google.com"
+
+
+def test_templated_replies_and_hit_counts():
+    router, calls = _router()
+    assert router.handle("¿Qué hora es?") == "Son las 14:05."
+    assert router.handle("qué día es hoy") == "Hoy es 03/02/2026."
+    assert router.handle("Abrime google.com por favor") == "Abriendo google.com en el navegador."
+    assert calls[-1] == ("open_url", ["google.com"])
+    assert router.report()["hits"]["time"] == 1
+
+
+def test_url_is_taken_as_typed():
+    router, calls = _router()
+    router.handle("abrí github.com/LokoKanishka/Lucy-C")
+    assert calls[-1] == ("open_url", ["github.com/LokoKanishka/Lucy-C"])
+    router.handle("abrí google.com/search?q=Lucy&hl=es, porfa")
+    assert calls[-1] == ("open_url", ["google.com/search?q=Lucy&hl=es"])
+
+
+def test_falls_through_to_llm():
+    router, calls = _router()
+    assert router.handle("¿Qué hora es en Tokio?") is None
+    assert router.handle("abrí el archivo config.yaml y explicame qué hace") is None
+    # Tool failure: the LLM gets to handle (and explain) it
+    assert router.handle("abrí la calculadora") is None
+    report = router.report()
+    assert report["fallthrough"] == {"no_match": 2, "tool_failed": 1}
+
+
+def test_kill_switch_and_disabled_intents():
+    router, calls = _router(enabled=False)
+    assert router.handle("qué hora es") is None and calls == []
+    router, calls = _router(disabled=["time"])
+    assert router.handle("qué hora es") is None
+
+
+def test_embedding_classifier_for_paraphrases():
+    vocab = {"hora": [1.0, 0.0], "fecha": [0.0, 1.0]}
+
+    def encode(texts):
+        return [vocab["hora"] if "hora" in t else vocab["fecha"] if ("fecha" in t or "dia" in t or "día" in t)
+                else [0.6, 0.8] for t in texts]
+
+    router, _ = _router(encode=encode)
+    assert router.handle("me tirás la hora") == "Son las 14:05."
+    assert router.handle("contame un chiste") is None
@@ -0,0 +1,75 @@
+import os
+
+from lucy_c.services.memory_watcher import MemoryWatcher
+
+
+class FakeMemory:
+    def __init__(self):
+        self.synced = {}
+        self.upserts = []
+        self.forgotten = []
+
+    def is_file_current(self, path):
+        st = os.stat(path)
+        return self.synced.get(str(path)) == (st.st_size, st.st_mtime_ns)
+
+    def upsert_file(self, path, between_batches=None):
+        if between_batches:
+            between_batches()
+        st = os.stat(path)
+        self.synced[str(path)] = (st.st_size, st.st_mtime_ns)
+        self.upserts.append(os.path.basename(path))
+
+    def forget_source(self, path):
+        self.forgotten.append(os.path.basename(path))
+        return 1 if self.synced.pop(str(path), None) else 0
+
+    def file_sources(self):
+        return list(self.synced)
+
+
+def test_reconcile_indexes_new_files_and_forgets_deleted(tmp_path):
+    (tmp_path / "a.md").write_text("uno")
+    (tmp_path / ".hidden.md").write_text("no")
+    (tmp_path / "blob.bin").write_bytes(b"\0\1")
+    memory = FakeMemory()
+    memory.synced[str(tmp_path / "gone.txt")] = (1, 1)
+
+    watcher = MemoryWatcher(memory, [str(tmp_path)], debounce_s=0, pause_s=0)
+    watcher.reconcile()
+    watcher.process_due()
+
+    assert memory.upserts == ["a.md"]
+    assert memory.forgotten == ["gone.txt"]
+
+    # Unchanged files are not re-indexed on the next pass
+    watcher.reconcile()
+    watcher.process_due()
+    assert memory.upserts == ["a.md"]
+
+
+def test_debounce_coalesces_bursts(tmp_path):
+    p = tmp_path / "notes.txt"
+    p.write_text("v1")
+    memory = FakeMemory()
+    watcher = MemoryWatcher(memory, [str(tmp_path)], debounce_s=2.0, pause_s=0)
+
+    for t in (100.0, 100.5, 101.0):  # three saves in a burst
+        watcher.mark(p, now=t)
+    assert watcher.process_due(now=102.0) == 0
+    assert watcher.process_due(now=103.5) == 1
+    assert memory.upserts == ["notes.txt"]
+
+
+def test_waits_for_live_turns(tmp_path):
+    p = tmp_path / "notes.txt"
+    p.write_text("v1")
+    memory = FakeMemory()
+    busy = iter([True, True, False, False, False])
+    watcher = MemoryWatcher(memory, [str(tmp_path)], debounce_s=0, pause_s=0,
+                            is_busy=lambda: next(busy, False))
+    watcher.mark(p, now=0.0)
+    watcher.process_due()
+
+    assert memory.upserts == ["notes.txt"]
+    assert watcher.waited_s > 0
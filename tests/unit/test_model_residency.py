@@ -0,0 +1,54 @@
+import logging
+import threading
+
+from lucy_c.services.model_residency import ModelResidency
+
+
+class FakeOllama:
+    def __init__(self):
+        self.usage_listeners = []
+        self.running = []
+        self.warmed = []
+        self.release = threading.Event()
+
+    def keep_alive_for(self, model):
+        return "30m"
+
+    def warmup(self, model, num_ctx=None):
+        self.release.wait(2)
+        self.warmed.append((model, num_ctx))
+        self.running.append({"name": model, "size": 13e9, "size_vram": 13e9})
+
+    def list_running(self):
+        return list(self.running)
+
+
+def test_preload_runs_once_in_background_and_skips_resident_models():
+    llm = FakeOllama()
+    residency = ModelResidency(llm, num_ctx=8192, ps_ttl_s=0)
+    assert residency.preload("gpt-oss:20b")
+    assert not residency.preload("gpt-oss:20b")  # already loading
+    assert residency.report()["preloads"]["gpt-oss:20b"]["state"] == "loading"
+    llm.release.set()
+    residency.wait("gpt-oss:20b", timeout=2)
+    assert llm.warmed == [("gpt-oss:20b", 8192)]
+    assert residency.resident_models() == ["gpt-oss:20b"]
+    assert not residency.preload("gpt-oss:20b")  # resident
+
+
+def test_thrash_warnings(caplog):
+    llm = FakeOllama()
+    llm.release.set()
+    residency = ModelResidency(llm, max_loaded_models=1, thrash_reloads=2)
+    with caplog.at_level(logging.WARNING, logger="LucyC.Residency"):
+        residency.assign("ana", "a", preload=False)
+        residency.assign("beto", "b", preload=False)
+        assert "Active sessions use 2 models" in caplog.text
+
+        for listener in llm.usage_listeners:
+            listener("a", {"load_duration_ms": 9000})
+            listener("a", {"load_duration_ms": 20})  # already resident: not a reload
+            listener("a", {"load_duration_ms": 8000})
+        assert "a reloaded 2 times" in caplog.text
+    assert residency.report()["recent_reloads"] == {"a": 2}
+    assert residency.thrash_warnings == 2
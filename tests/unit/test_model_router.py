@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import OllamaConfig
+from lucy_c.core.cognitive import CognitiveEngine
+from lucy_c.core.model_router import ModelRouter
+from lucy_c.interfaces.llm import LLMResponse
+
+
+def _router(**kw):
+    return ModelRouter(OllamaConfig(model="big", draft_model="small", **kw))
+
+
+def test_pick_by_kind_length_and_keywords():
+    router = _router()
+    assert router.pick("reflect", input_chars=500) == "small"
+    assert router.pick("reflect", input_chars=50_000) is None
+    assert router.pick("think", user_text="poné música tranqui") == "small"
+    assert router.pick("think", user_text="explicame cómo funciona el scheduler") is None
+    assert router.pick("think", user_text=" ".join(["palabra"] * 30)) is None
+    assert ModelRouter(OllamaConfig(model="big")).pick("reflect") is None  # cascade off
+    assert router.models() == ["big", "small"]
+
+
+def test_draft_failure_escalates_to_main_model():
+    llm = MagicMock()
+    llm.chat.side_effect = [RuntimeError("model does not support tools"), LLMResponse(text="Listo.")]
+    router = _router()
+    brain = CognitiveEngine(llm, MagicMock(), None, router=router)
+
+    resp = brain.reflect("[🌐 RED]: ok", [{"role": "system", "content": ""}])
+    assert resp.text == "Listo."
+    assert [c.kwargs["model"] for c in llm.chat.call_args_list] == ["small", None]
+    assert router.report()["calls"]["reflect"] == {"draft": 1, "main": 0, "escalated": 1}
+
+
+def test_explicit_model_bypasses_cascade():
+    llm = MagicMock()
+    llm.chat.return_value = LLMResponse(text="Resumen.")
+    brain = CognitiveEngine(llm, MagicMock(), None, router=_router())
+    brain.summarize("texto largo", model_name="otro")
+    assert llm.chat.call_args.kwargs["model"] == "otro"
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# The web app monkey-patches eventlet on import, so it runs in a child process
+# against the bench's stand-in Ollama and speech providers.
+WEB_TURN_SCRIPT = textwrap.dedent("""
+    import json, sys, tempfile
+    from pathlib import Path
+    from lucy_c.web.app import create_app
+    from lucy_c.bench.fakes import FakeASR, FakeTTS
+    from lucy_c.bench.servers import FakeOllama
+    from lucy_c.config import LucyConfig
+    from lucy_c.facts_store import FactsStore
+    from lucy_c.history_store import HistoryStore
+
+    with FakeOllama(models=["big", "small", "other"], first_token_s=0, tokens_per_s=1000) as ollama, \\
+            tempfile.TemporaryDirectory() as tmp:
+        cfg = LucyConfig()
+        cfg.ollama.host, cfg.ollama.model, cfg.ollama.draft_model = ollama.url, "big", "small"
+        cfg.tts.phrase_bank = False
+        facts = FactsStore(Path(tmp) / "facts")
+        facts.set_fact("picky", "selected_model", "other")
+        app, socketio, orchestrator = create_app(cfg, asr=FakeASR([]), tts=FakeTTS(delay_s=0, per_char_s=0),
+                                                 history=HistoryStore(Path(tmp) / "history"), facts=facts,
+                                                 memory_enabled=False)
+        http = app.test_client()
+        calls = []
+        for user in ("default", "picky"):
+            http.post("/api/chat", json={"message": "hola", "session_user": user, "audio": False})
+            calls.append(http.get("/api/stats").get_json()["llm_routing"]["calls"].get("think", {}))
+        history = {user: [i["ollama_model"] for i in orchestrator.brain.history.read(session_user=user)]
+                   for user in ("default", "picky")}
+        print(json.dumps({"calls": calls, "history": history}))
+""")
+
+
+def test_default_model_web_turns_go_through_the_cascade():
+    for module in ("flask_socketio", "eventlet", "soundfile", "faster_whisper"):
+        pytest.importorskip(module)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in (str(ROOT), os.environ.get("PYTHONPATH")) if p)}
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", WEB_TURN_SCRIPT], cwd=ROOT, capture_output=True,
+                         text=True, timeout=120, env=env)
+    assert out.returncode == 0, out.stderr
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    # The default session's turn asked the router (a short turn: the draft model)...
+    assert result["calls"][0] == {"draft": 1, "main": 0, "escalated": 0}
+    # ...a session that picked its own model bypasses the cascade
+    assert result["calls"][1] == result["calls"][0]
+    assert result["history"] == {"default": ["big"], "picky": ["other"]}
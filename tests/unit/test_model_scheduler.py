@@ -0,0 +1,92 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import LucyConfig
+from lucy_c.interfaces.llm import LLMResponse
+from lucy_c.services.model_scheduler import ModelScheduler
+
+
+def _queue_behind_a_running_turn(scheduler, models):
+    """Hold a slot for model "a", queue `models` in order, release; return the order turns ran in."""
+    order, lock = [], threading.Lock()
+    release = threading.Event()
+    holding = threading.Event()
+
+    def holder():
+        with scheduler.slot("a"):
+            holding.set()
+            release.wait(2)
+
+    def turn(model):
+        with scheduler.slot(model):
+            with lock:
+                order.append(model)
+
+    threads = [threading.Thread(target=holder)]
+    threads[0].start()
+    holding.wait(2)
+    for model in models:
+        t = threading.Thread(target=turn, args=(model,))
+        t.start()
+        threads.append(t)
+        time.sleep(0.02)  # deterministic arrival order
+    release.set()
+    for t in threads:
+        t.join(2)
+    return order
+
+
+def test_running_model_drains_its_backlog_before_a_swap():
+    scheduler = ModelScheduler(max_concurrent=1, max_batch=8, max_wait_s=30)
+    assert _queue_behind_a_running_turn(scheduler, ["b", "a", "a"]) == ["a", "a", "b"]
+    report = scheduler.report()
+    assert report["swaps"] == 1 and report["granted"] == 4 and report["queue_depth"] == 0
+
+
+def test_max_batch_lets_other_models_in():
+    scheduler = ModelScheduler(max_concurrent=1, max_batch=1, max_wait_s=30)
+    assert _queue_behind_a_running_turn(scheduler, ["b", "a"]) == ["b", "a"]
+    assert scheduler.report()["fairness_switches"] == 2  # a -> b, then b -> a
+
+
+def test_starved_turn_goes_first():
+    scheduler = ModelScheduler(max_concurrent=1, max_batch=8, max_wait_s=0.01)
+    assert _queue_behind_a_running_turn(scheduler, ["b", "a"])[0] == "b"
+
+
+def test_resident_models_run_alongside():
+    scheduler = ModelScheduler(max_concurrent=2, resident=lambda: ["a", "b"])
+    with scheduler.slot("a"):
+        with scheduler.slot("b") as waited:
+            assert waited < 0.5
+            assert scheduler.report()["running"] == {"a": 1, "b": 1}
+
+
+def test_orchestrator_uses_the_session_model_without_touching_config():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.orchestrator import LucyOrchestrator
+    from lucy_c.tool_router import ToolRun
+
+    cfg = LucyConfig()
+    default = cfg.ollama.model
+    brain = MagicMock()
+    brain.facts.get_facts.side_effect = lambda user: (
+        {"selected_model": "mistral:7b", "selected_provider": "ollama"} if user == "u1" else {})
+    brain.build_context.return_value = []
+    brain.think.return_value = LLMResponse(text="Hola.")
+    body = MagicMock()
+    body.run.return_value = ToolRun("Hola.")
+    senses = MagicMock()
+    senses.speak.return_value = (b"", 0)
+    scheduler = ModelScheduler()
+    lucy = LucyOrchestrator(cfg, brain, senses, body, scheduler=scheduler)
+
+    lucy.process_text_input("hola", session_user="u1")
+    assert brain.think.call_args.kwargs["model_name"] == "mistral:7b"
+    lucy.process_text_input("hola", session_user="u2")
+    assert brain.think.call_args.kwargs["model_name"] is None
+    assert cfg.ollama.model == default
+    assert scheduler.report()["swaps"] == 1
@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from lucy_c.services.offload import WorkerPools
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Runs under a monkey-patched eventlet hub in a child process (patching pytest's own
+# interpreter would leak into every other test). A "transcription" holds the GIL-free
+# native thread for 0.6 s, like CTranslate2 does, while another session's greenlet
+# ticks every 20 ms; we report the longest gap between its ticks.
+HUB_SCRIPT = textwrap.dedent("""
+    import eventlet
+    eventlet.monkey_patch()
+    import json, sys, time
+    from eventlet import patcher
+    from lucy_c.services.offload import WorkerPools
+
+    blocking_sleep = patcher.original("time").sleep
+    pools = WorkerPools({"asr": 1})
+
+    def transcribe(audio):
+        blocking_sleep(0.6)
+        return "hola"
+
+    def other_session(gaps):
+        last = time.monotonic()
+        for _ in range(25):
+            eventlet.sleep(0.02)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+
+    def run(offload):
+        gaps = []
+        ticker = eventlet.spawn(other_session, gaps)
+        eventlet.sleep(0)
+        job = eventlet.spawn(pools.run, "asr", transcribe, b"") if offload else eventlet.spawn(transcribe, b"")
+        text = job.wait()
+        ticker.wait()
+        return text, max(gaps)
+
+    inline_text, inline_gap = run(False)
+    text, gap = run(True)
+    print(json.dumps({"text": text, "gap": gap, "inline_gap": inline_gap, "report": pools.report()}))
+""")
+
+
+def test_long_transcription_does_not_stall_other_sessions():
+    pytest.importorskip("eventlet")
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", HUB_SCRIPT], cwd=ROOT, capture_output=True,
+                         text=True, timeout=60, env={**os.environ, "PYTHONPATH": str(ROOT)})
+    assert out.returncode == 0, out.stderr
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["inline_gap"] > 0.5  # on the hub, the other session freezes for the whole transcription
+    assert result["gap"] < 0.3
+    assert result["text"] == "hola"
+    assert result["report"]["offloaded"] and result["report"]["pools"]["asr"]["jobs"] == 1
+
+
+def test_runs_inline_without_eventlet_and_bounds_each_pool():
+    pools = WorkerPools({"tts": 1})
+    assert pools.run("tts", lambda a, b=0: a + b, 1, b=2) == 3
+    assert pools.run("unknown", lambda: "ok") == "ok"
+    with pytest.raises(ValueError):
+        pools.run("tts", int, "x")
+    report = pools.report()
+    assert not report["offloaded"]
+    assert report["pools"]["tts"]["jobs"] == 2 and report["pools"]["tts"]["size"] == 1
+    assert pools._slots["tts"].acquire(blocking=False)  # released even after an exception
+
+
+# A blocking tool reports progress from its tpool thread; the status callback (a
+# Socket.IO emit in the app) must still run on the hub's own OS thread.
+RELAY_SCRIPT = textwrap.dedent("""
+    import eventlet
+    eventlet.monkey_patch()
+    import json
+    from eventlet import patcher
+    from lucy_c.services.offload import WorkerPools
+    from lucy_c.tool_router import ToolResult, ToolRouter
+
+    os_thread = patcher.original("threading").get_ident
+    blocking_sleep = patcher.original("time").sleep
+    hub = os_thread()
+    seen = []
+
+    def memorize_dir(args, ctx):
+        for i in range(3):
+            blocking_sleep(0.05)
+            ctx["status_callback"](f"Memorizando {i + 1}/3", "info")
+        return ToolResult(True, f"ok on {'hub' if os_thread() == hub else 'worker'}")
+
+    tr = ToolRouter(pools=WorkerPools({"tools": 1}))
+    tr.register_tool("memorize_dir", memorize_dir, blocking=True)
+    result = tr.call("memorize_dir", [], {"status_callback": lambda m, t: seen.append((m, os_thread() == hub))})
+    print(json.dumps({"output": result.output, "seen": seen}))
+""")
+
+
+def test_blocking_tool_progress_is_relayed_to_the_hub():
+    pytest.importorskip("eventlet")
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", RELAY_SCRIPT], cwd=ROOT, capture_output=True,
+                         text=True, timeout=60, env={**os.environ, "PYTHONPATH": str(ROOT)})
+    assert out.returncode == 0, out.stderr
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["output"] == "ok on worker"
+    assert result["seen"] == [["Memorizando 1/3", True], ["Memorizando 2/3", True], ["Memorizando 3/3", True]]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from lucy_c.interfaces.audio import TTSProvider, TTSResult
+from lucy_c.services.phrase_bank import PhraseBank, register_phrases, registered_phrases
+from lucy_c.tool_router import ToolRouter
+from lucy_c.tts_cache import TTSCache
+
+
+class CachedTTS(TTSProvider):
+    def __init__(self, max_items=3):
+        self.cache = TTSCache(max_items=max_items)
+        self.calls = []
+
+    def synthesize(self, text):
+        cached = self.cache.get(text)
+        if cached is not None:
+            return cached
+        self.calls.append(text)
+        res = TTSResult(audio_f32=np.zeros(160, dtype=np.float32), sample_rate=16000)
+        self.cache.put(text, res)
+        return res
+
+    def pin(self, text):
+        self.synthesize(text)
+        return self.cache.pin(text)
+
+
+def test_pinned_phrases_survive_eviction():
+    tts = CachedTTS(max_items=3)
+    assert tts.pin("Decime algo.")
+    for i in range(10):
+        tts.synthesize(f"respuesta {i}")
+    tts.synthesize("Decime algo.")
+    assert tts.calls.count("Decime algo.") == 1
+    stats = tts.cache.stats()
+    assert stats["pinned"] == 1 and stats["items"] <= 4
+    tts.cache.clear()
+    assert tts.cache.get("Decime algo.") is not None
+
+
+def test_tools_register_phrases_and_bank_reports_failures():
+    ToolRouter().register_tool("remember_test", lambda args, ctx: None, phrases=("Listo, anotado.",))
+    assert registered_phrases()["Listo, anotado."] == "remember_test"
+    register_phrases("Listo, anotado.", source="other")  # first registration wins
+    assert registered_phrases()["Listo, anotado."] == "remember_test"
+
+    pinned = []
+    def pin(text):
+        if text == "rota":
+            raise RuntimeError("tts down")
+        pinned.append(text)
+        return True
+
+    report = PhraseBank(pin, extra=["rota", "Listo, anotado."]).build()
+    assert "Listo, anotado." in pinned and pinned.count("Listo, anotado.") == 1
+    assert report["failed"] == {"rota": "tts down"}
+    assert report["pinned"] == report["registered"] - 1
+
+
+def test_senses_serve_pinned_phrases_without_synthesis():
+    pytest.importorskip("soundfile")  # senses -> audio_codec
+    from lucy_c.core.senses import SensorySystem
+
+    tts = CachedTTS()
+    senses = SensorySystem(asr=None, tts=tts)
+    assert senses.pin("**No escuché nada.**")
+    tts.synthesize = None  # any synthesis now would fail
+    wav, sr = senses.speak("No escuché nada.")
+    assert wav.startswith(b"RIFF") and sr == 16000
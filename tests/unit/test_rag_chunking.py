@@ -0,0 +1,58 @@
+import random
+
+from lucy_c.rag_engine import chunk_ids, chunk_text, iter_chunks
+
+
+def _document(n_sentences=3000, seed=7):
+    rnd = random.Random(seed)
+    words = "lucy memoria archivo modelo voz texto busca agente red puerto config ollama".split()
+    sentences = [
+        " ".join(rnd.choice(words) for _ in range(rnd.randint(4, 20))).capitalize() + "."
+        for _ in range(n_sentences)
+    ]
+    return "\n".join(" ".join(sentences[i:i + 5]) for i in range(0, len(sentences), 5))
+
+
+def test_chunks_respect_size_bound():
+    chunks = chunk_text(_document(), chunk_size=500, overlap=50)
+    assert chunks
+    # body <= chunk_size, plus the overlap prefix and a joining space
+    assert max(len(c) for c in chunks) <= 500 + 50 + 1
+
+
+def test_edit_only_changes_nearby_chunks():
+    text = _document()
+    before = chunk_ids("src", chunk_text(text))
+
+    mid = len(text) // 2
+    edited = text[:mid] + " Una frase nueva insertada en el medio." + text[mid:]
+    after = chunk_ids("src", chunk_text(edited))
+
+    assert len(before) > 100
+    assert len(set(after) - set(before)) <= 4
+    assert len(set(before) - set(after)) <= 4
+
+
+def test_same_text_gives_same_ids_and_repeated_chunks_stay_unique():
+    text = _document(200)
+    assert chunk_ids("src", chunk_text(text)) == chunk_ids("src", chunk_text(text))
+
+    ids = chunk_ids("src", ["igual", "igual", "otro"])
+    assert len(set(ids)) == 3
+    assert chunk_ids("other", ["igual"])[0] != ids[0]
+
+
+def test_long_unpunctuated_text_is_hard_split():
+    chunks = chunk_text("x" * 2000, chunk_size=500, overlap=0)
+    assert len(chunks) == 4
+
+
+def test_streaming_chunks_match_whole_text_for_any_block_split():
+    text = _document(n_sentences=400)
+    # Minified stretch without boundaries and a '.' right at a block edge
+    text = text[:3000] + "x" * 2300 + "." + " y" * 40 + text[3000:]
+    expected = chunk_text(text, chunk_size=500, overlap=50)
+    for block in (1, 7, 333, 500, 4096):
+        blocks = [text[i:i + block] for i in range(0, len(text), block)]
+        assert list(iter_chunks(blocks, chunk_size=500, overlap=50)) == expected
+
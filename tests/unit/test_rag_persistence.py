@@ -0,0 +1,68 @@
+import hashlib
+import shutil
+
+import numpy as np
+import pytest
+
+from lucy_c import rag_engine
+from lucy_c.config import MemoryConfig
+from lucy_c.interfaces.embeddings import EmbeddingBackend
+from lucy_c.rag_engine import MemoryEngine
+
+
+class HashBackend(EmbeddingBackend):
+    """Deterministic stand-in for the embedding model."""
+
+    name = "hash"
+    space = "hash"
+
+    def encode(self, texts, show_progress_bar=False):
+        rows = [np.frombuffer(hashlib.sha256(t.encode()).digest(), dtype=np.uint8)[:16] for t in texts]
+        v = np.asarray(rows, dtype=np.float32) + 1.0
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "create_embedding_backend", lambda cfg: HashBackend())
+
+    def open_engine(**kw):
+        return MemoryEngine(cfg=MemoryConfig(persist_directory=str(tmp_path / "mem"), query_cache_size=0, **kw))
+    return open_engine
+
+
+def _notes(tmp_path):
+    path = tmp_path / "notas.txt"
+    path.write_text("El servidor escucha en el puerto 5050. " * 40 + "La clave del wifi es naranja.",
+                    encoding="utf-8")
+    return path
+
+
+def test_lost_vectors_are_reingested_after_restart(tmp_path, engine):
+    path = _notes(tmp_path)
+    memory = engine(vector_store="hnsw", ann_engine="exact")
+    total = memory.upsert_file(str(path)).total
+    assert total > 1 and memory.is_file_current(path)
+    del memory
+
+    shutil.rmtree(tmp_path / "mem" / "ann")  # the vectors are gone; manifests and BM25 are not
+    memory = engine(vector_store="hnsw", ann_engine="exact")
+    assert not memory.is_file_current(path)
+    assert memory.keywords.count() == 0
+    assert memory.upsert_file(str(path)).added == total
+    assert memory.query("wifi", mode="hybrid")
+
+
+def test_chroma_memory_survives_a_restart(tmp_path, engine):
+    chromadb = pytest.importorskip("chromadb")
+    path = _notes(tmp_path)
+    memory = engine(vector_store="chroma")
+    total = memory.upsert_file(str(path)).total
+    del memory
+    chromadb.api.client.SharedSystemClient.clear_system_cache()  # what a new process would see
+
+    memory = engine(vector_store="chroma")
+    assert memory.stats()["total_documents"] == total
+    assert memory.is_file_current(path)
+    assert memory.upsert_file(str(path)).added == 0
+    assert memory.query("wifi", mode="hybrid")
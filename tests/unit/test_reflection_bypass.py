@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from lucy_c.config import LucyConfig
+from lucy_c.interfaces.llm import LLMResponse
+from lucy_c.tool_router import ToolResult, ToolRouter
+
+
+def _router():
+    tr = ToolRouter()
+    tr.register_tool("close", lambda args, ctx: ToolResult.done(f"Ventana '{args[0]}' cerrada.", "🪟 VENTANAS"))
+    tr.register_tool("search", lambda args, ctx: ToolResult(True, "resultados crudos", "🌐 RED"))
+    return tr
+
+
+def test_run_collects_structured_results():
+    run = _router().run('Dale. [[close("firefox")]]', {})
+    assert not run.needs_reflection
+    assert run.reply_from_hints() == "Ventana 'firefox' cerrada."
+    assert "[🪟 VENTANAS]: Ventana 'firefox' cerrada." in run.text
+
+
+def test_any_plain_or_failed_result_needs_reflection():
+    tr = _router()
+    assert tr.run('[[close("a")]] [[search("b")]]', {}).needs_reflection
+    assert tr.run('[[close("a")]] [[missing()]]', {}).needs_reflection
+    assert tr.run('[[close("a; rm")]]', {}).needs_reflection  # blocked by security rules
+    assert tr.run("sin herramientas", {}).needs_reflection
+
+
+def test_orchestrator_skips_reflection_for_self_describing_turns():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.actions import ActionController
+    from lucy_c.core.orchestrator import LucyOrchestrator
+
+    brain = MagicMock()
+    brain.build_context.return_value = [{"role": "system", "content": ""}]
+    brain.think.side_effect = [LLMResponse(text='Cierro Firefox. [[close("firefox")]]'),
+                               LLMResponse(text='[[search("clima")]]')]
+    brain.reflect.return_value = LLMResponse(text="Hace 20 grados.")
+    senses = MagicMock()
+    senses.speak.return_value = (b"", 0)
+    body = MagicMock(spec=ActionController)
+    router = _router()
+    body.run.side_effect = lambda text, **kw: router.run(text, {})
+
+    lucy = LucyOrchestrator(LucyConfig(), brain, senses, body)
+    assert lucy.process_text_input("cerrá firefox").reply == "Cierro Firefox. Ventana 'firefox' cerrada."
+    assert brain.reflect.call_count == 0
+    assert lucy.process_text_input("¿qué clima hace?").reply == "Hace 20 grados."
+    assert lucy.reflection_report() == {"tool_turns": 2, "skipped": 1, "summarized": 0, "skip_rate": 0.5}
+
+
+def test_long_tool_output_is_summarized_before_reflection():
+    pytest.importorskip("soundfile")
+    from lucy_c.core.actions import ActionController
+    from lucy_c.core.orchestrator import LucyOrchestrator
+
+    page = "Contenido de la página. " * 400
+    tr = ToolRouter()
+    tr.register_tool("read_url", lambda args, ctx: ToolResult(True, page, "🌐 RED"))
+    brain = MagicMock()
+    brain.build_context.return_value = [{"role": "system", "content": ""}]
+    brain.think.return_value = LLMResponse(text='[[read_url("https://example.com")]]')
+    brain.summarize.return_value = LLMResponse(text="La página habla de contenido.")
+    brain.reflect.return_value = LLMResponse(text="Es una página de ejemplo.")
+    senses = MagicMock()
+    senses.speak.return_value = (b"", 0)
+    body = MagicMock(spec=ActionController)
+    body.run.side_effect = lambda text, **kw: tr.run(text, {})
+
+    cfg = LucyConfig()
+    cfg.generation.summarize_over_chars = 1000
+    lucy = LucyOrchestrator(cfg, brain, senses, body)
+    assert lucy.process_text_input("leé example.com").reply == "Es una página de ejemplo."
+    assert brain.summarize.call_args.args[0] == page
+    reflected = brain.reflect.call_args.args[0]
+    assert "La página habla de contenido." in reflected and page not in reflected
+    assert lucy.reflection_report()["summarized"] == 1
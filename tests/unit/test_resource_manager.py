@@ -0,0 +1,69 @@
+import time
+
+from lucy_c.services.resource_manager import ResourceManager
+
+
+class FakeModel:
+    def __init__(self):
+        self.model = None
+        self.last_used = 0.0
+        self.loads = 0
+
+    def use(self):
+        self.last_used = time.time()
+        if self.model is None:
+            self.model = object()
+            self.loads += 1
+        return self.model
+
+    def is_loaded(self):
+        return self.model is not None
+
+    def unload(self):
+        self.model = None
+
+    def resident_bytes(self):
+        return 50 * 1024 * 1024 if self.model is not None else 0
+
+
+def test_sweep_unloads_only_idle_components():
+    asr, embeddings = FakeModel(), FakeModel()
+    asr.use()
+    embeddings.use()
+    asr.last_used -= 120
+
+    manager = ResourceManager(idle_unload_s=60)
+    manager.register("asr", asr)
+    manager.register("embeddings", embeddings)
+
+    assert manager.sweep() == ["asr"]
+    assert not asr.is_loaded()
+    assert embeddings.is_loaded()
+
+    report = manager.report()
+    assert report["asr"]["unloads"] == 1
+    assert report["asr"]["resident_mb"] == 0.0
+    assert report["embeddings"]["resident_mb"] == 50.0
+
+
+def test_component_reloads_after_unload():
+    asr = FakeModel()
+    asr.use()
+    manager = ResourceManager(idle_unload_s=60)
+    manager.register("asr", asr)
+
+    manager.sweep(now=time.time() + 120)
+    asr.use()
+
+    assert asr.is_loaded()
+    assert asr.loads == 2
+
+
+def test_disabled_when_idle_period_is_zero():
+    asr = FakeModel()
+    asr.use()
+    manager = ResourceManager(idle_unload_s=0)
+    manager.register("asr", asr)
+
+    assert manager.sweep(now=time.time() + 10_000) == []
+    assert asr.is_loaded()
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+flask = pytest.importorskip("flask")
+flask_socketio = pytest.importorskip("flask_socketio")
+
+from lucy_c.config import LucyConfig
+from lucy_c.interfaces.llm import LLMResponse
+from lucy_c.web.events import SessionEvents, room_for
+
+
+def _server():
+    app = flask.Flask(__name__)
+    socketio = flask_socketio.SocketIO(app, async_mode="threading")
+    events = SessionEvents(socketio)
+
+    @socketio.on("connect")
+    def on_connect(auth=None):
+        events.join((auth or {})["session_user"])
+
+    return app, socketio, events
+
+
+def _turn(events, session_user):
+    # What one tool-using turn emits: status lines plus the badge for the tool
+    room = room_for(session_user)
+    events.status("Pensando...", "info", room=room)
+    events.status("Buscando en internet...", "info", room=room)
+    events.status("Sintetizando voz...", "info", room=room)
+
+
+@pytest.mark.parametrize("scoped", [True, False])
+def test_emit_fan_out_stays_flat_as_clients_grow(scoped):
+    """Per-turn deliveries are constant with session rooms; a broadcast grows with every client."""
+    deliveries = {}
+    for n_clients in (5, 20, 50):
+        app, socketio, events = _server()
+        clients = [socketio.test_client(app, auth={"session_user": f"u{i}"}) for i in range(n_clients)]
+        for c in clients:
+            c.get_received()  # drop connect traffic
+        turns = 10
+        for t in range(turns):
+            if scoped:
+                _turn(events, f"u{t % n_clients}")
+            else:
+                for message in ("Pensando...", "Buscando en internet...", "Sintetizando voz..."):
+                    events.status(message, "info")
+        received = [c.get_received() for c in clients]
+        deliveries[n_clients] = sum(len(r) for r in received) / turns
+        if scoped:
+            # and only the session that produced the turn sees it
+            own_turns = [sum(1 for t in range(turns) if t % n_clients == i) for i in range(n_clients)]
+            assert [len(r) for r in received] == [4 * k for k in own_turns]
+        for c in clients:
+            c.disconnect()
+
+    if scoped:
+        assert deliveries[5] == deliveries[20] == deliveries[50] == 4  # 3 status + 1 tool badge
+    else:
+        assert deliveries[50] == 10 * deliveries[5]
+
+
+def test_orchestrator_carries_the_room_to_status_and_tools():
+    pytest.importorskip("soundfile")  # orchestrator -> senses -> audio stack
+    from lucy_c.core.orchestrator import LucyOrchestrator
+    from lucy_c.tool_router import ToolRun
+
+    status = MagicMock()
+    brain = MagicMock()
+    brain.facts.get_facts.return_value = {}
+    brain.build_context.return_value = []
+    brain.think.return_value = LLMResponse(text="Hola.")
+    body = MagicMock()
+    body.run.return_value = ToolRun("Hola.")
+    senses = MagicMock()
+    senses.speak.return_value = (b"", 0)
+    lucy = LucyOrchestrator(LucyConfig(), brain, senses, body, status_callback=status)
+
+    lucy.process_text_input("hola", session_user="u1", room=room_for("u1"))
+    assert status.call_args_list[0].args == ("Pensando...", "info")
+    assert all(c.kwargs == {"room": "session:u1"} for c in status.call_args_list)
+    kwargs = body.run.call_args.kwargs
+    assert kwargs["context"]["room"] == "session:u1"
+    kwargs["status_callback"]("Leyendo archivo...", "info")
+    assert status.call_args.kwargs == {"room": "session:u1"}
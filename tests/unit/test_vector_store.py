@@ -0,0 +1,64 @@
+import numpy as np
+
+from lucy_c.rag_engine import HnswVectorStore
+
+
+def _unit(rows):
+    v = np.asarray(rows, dtype=np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _store(path, **kw):
+    return HnswVectorStore(path, "test-space", engine="exact", **kw)
+
+
+def test_upsert_query_get_delete(tmp_path):
+    store = _store(tmp_path)
+    vecs = _unit([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    store.upsert(["a", "b", "c"], vecs, ["uno", "dos", "tres"],
+                 [{"src": "x"}, {"src": "y"}, {"src": "x"}])
+    assert store.count() == 3
+
+    hits = store.query(vecs[1], 2)
+    assert hits[0]["id"] == "b" and hits[0]["text"] == "dos"
+    assert abs(hits[0]["distance"]) < 1e-5
+
+    assert sorted(store.get(where={"src": "x"})["ids"]) == ["a", "c"]
+    assert store.get(ids=["c"])["documents"] == ["tres"]
+
+    # Overwrite and delete tombstone old rows; queries skip them
+    store.upsert(["b"], _unit([[0, 0, 1]]), ["dos bis"], [{"src": "y"}])
+    store.delete(["c"])
+    assert store.count() == 2
+    hits = store.query(vecs[2], 3)
+    assert [h["id"] for h in hits][0] == "b" and "c" not in {h["id"] for h in hits}
+    assert len(hits) == 2
+
+
+def test_read_only_instance_sees_flushed_data(tmp_path):
+    writer = _store(tmp_path)
+    writer.upsert(["a"], _unit([[1, 0]]), ["hola"], [{}])
+    writer.flush()
+
+    reader = _store(tmp_path, read_only=True)
+    assert reader.query(_unit([[1, 0]])[0], 1)[0]["id"] == "a"
+
+    writer.upsert(["b"], _unit([[0, 1]]), ["chau"], [{}])
+    writer.flush()
+    assert reader.query(_unit([[0, 1]])[0], 1)[0]["id"] == "b"
+    assert reader.stored_space == "test-space"
+
+
+def test_reset_and_migrate(tmp_path):
+    store = _store(tmp_path)
+    store.upsert(["a", "b"], _unit([[1, 0], [0, 1]]), ["alfa", "beta"], [{"n": 1}, {"n": 2}])
+
+    encode = lambda texts: _unit([[1, 1, 0] if t == "alfa" else [0, 1, 1] for t in texts])
+    assert store.migrate("new-space", encode, page_size=1) == 2
+    assert store.stored_space == "new-space"
+    assert store.query(encode(["beta"])[0], 1)[0]["id"] == "b"
+    assert store.get(ids=["a"])["metadatas"] == [{"n": 1}]
+
+    store.reset("other")
+    assert store.count() == 0 and store.stored_space == "other"
+    assert store.query(encode(["alfa"])[0], 1) == []
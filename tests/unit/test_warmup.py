@@ -0,0 +1,43 @@
+import time
+
+from lucy_c.services.warmup import WarmupOrchestrator
+
+
+def test_components_load_in_parallel_and_report_ready():
+    warmup = WarmupOrchestrator()
+    warmup.register("asr", lambda: time.sleep(0.2))
+    warmup.register("embeddings", lambda: time.sleep(0.2))
+
+    start = time.time()
+    warmup.start()
+    assert warmup.wait(timeout=5)
+    assert time.time() - start < 0.39  # parallel, not 0.4s sequential
+
+    report = warmup.report()
+    assert report["ready"] is True
+    assert report["components"]["asr"]["state"] == "ready"
+    assert report["components"]["asr"]["load_time_s"] >= 0.2
+
+
+def test_optional_failure_does_not_block_readiness():
+    def broken():
+        raise RuntimeError("mimic3 not found")
+
+    warmup = WarmupOrchestrator()
+    warmup.register("llm", lambda: None)
+    warmup.register("tts", broken, required=False)
+    warmup.start()
+
+    assert warmup.wait(timeout=5)
+    tts = warmup.report()["components"]["tts"]
+    assert tts["state"] == "failed"
+    assert "mimic3" in tts["error"]
+
+
+def test_not_ready_until_required_component_finishes():
+    warmup = WarmupOrchestrator()
+    warmup.register("asr", lambda: time.sleep(0.3))
+    warmup.start()
+
+    assert warmup.is_ready() is False
+    assert warmup.wait(timeout=5) is True
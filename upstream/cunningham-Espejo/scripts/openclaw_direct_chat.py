@@ -34,6 +34,12 @@ from molbot_direct_chat.util import extract_url as _extract_url
 from molbot_direct_chat.util import normalize_text as _normalize_text
 from molbot_direct_chat.util import safe_session_id as _safe_session_id
 
+try:
+    # Shared extraction stage from Lucy-C (page-parallel PDF, DOCX/HTML/EPUB, cache by file hash)
+    from lucy_c.extraction import extract_text as _shared_extract_text
+except Exception:
+    _shared_extract_text = None
+
 _VRAM_CACHE = {"ts": 0.0, "data": None}
 _MODEL_CATALOG_CACHE = {"ts": 0.0, "data": None}
 
@@ -6931,8 +6937,18 @@ class ReaderLibraryIndex:
             return "pdf"
         if ext == ".epub":
             return "epub"
+        if ext == ".docx":
+            return "docx"
+        if ext in (".html", ".htm", ".xhtml"):
+            return "html"
         return "unknown"
 
+    @staticmethod
+    def _supported_formats() -> tuple[str, ...]:
+        if _shared_extract_text is not None:
+            return ("txt", "pdf", "epub", "docx", "html")
+        return ("txt", "pdf", "epub")
+
     @staticmethod
     def _book_id(path: Path, size: int, mtime_ns: int) -> str:
         digest = hashlib.sha256(f"{path.resolve()}:{int(size)}:{int(mtime_ns)}".encode("utf-8")).hexdigest()
@@ -6971,6 +6987,11 @@ class ReaderLibraryIndex:
                 return self._normalize_text(path.read_text(encoding="utf-8", errors="replace")), ""
             except Exception as e:
                 return "", f"txt_read_failed:{e}"
+        if _shared_extract_text is not None and fmt in ("pdf", "epub", "docx", "html"):
+            res = _shared_extract_text(path, cache_dir=self.cache_dir / "by_hash")
+            if res.error:
+                return "", res.error
+            return self._normalize_text(res.text), ""
         if fmt == "pdf":
             txt, err = self._extract_pdf_text(path)
             if err:
@@ -7052,7 +7073,7 @@ class ReaderLibraryIndex:
                 if not path.is_file():
                     continue
                 fmt = self._format_for_path(path)
-                if fmt not in ("txt", "pdf", "epub"):
+                if fmt not in self._supported_formats():
                     continue
                 scanned += 1
                 try: